@@ -15,6 +15,12 @@ if not SECRET_KEY:
         "Generate one with: python -c 'import secrets; print(secrets.token_urlsafe(64))'"
     )
 RAPIDAPI_KEY = os.environ.get("RAPIDAPI_KEY", "").strip()
+# Comma-separated; users with these emails can manage features and view ops metrics
+ADMIN_EMAILS = {
+    e.strip().lower()
+    for e in os.environ.get("ADMIN_EMAILS", "admin@hireflow.com").split(",")
+    if e.strip()
+}
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
@@ -64,3 +70,9 @@ async def require_user(user: Optional[dict] = Depends(get_current_user)) -> dict
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     return user
+
+
+async def require_admin(user: dict = Depends(require_user)) -> dict:
+    if (user.get("email") or "").lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required.")
+    return user
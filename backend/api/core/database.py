@@ -8,6 +8,7 @@ All DB access goes through this module — routes never call Supabase directly.
 from __future__ import annotations
 
 import os
+from datetime import datetime, timezone
 from typing import Optional
 
 from supabase import create_client, Client
@@ -62,10 +63,20 @@ def update_user(user_id: str, data: dict) -> dict:
     data = _prep_jsonb_fields_user(data)
     # Remove 'id' from update payload if present
     data.pop("id", None)
+    data.setdefault("updated_at", datetime.now(timezone.utc).isoformat())
     res = supabase.table("users").update(data).eq("id", user_id).execute()
     return _parse_jsonb_fields_user(res.data[0]) if res.data else {}
 
 
+def get_user_names(user_ids) -> dict[str, str]:
+    """id → name for many users in one query."""
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+    res = supabase.table("users").select("id, name").in_("id", ids).execute()
+    return {u["id"]: u.get("name") or "" for u in (res.data or [])}
+
+
 def get_users_by_role(role: str) -> list[dict]:
     res = supabase.table("users").select("*").eq("role", role).execute()
     return [_parse_jsonb_fields_user(u) for u in (res.data or [])]
@@ -91,6 +102,14 @@ def get_job_by_id(job_id: str) -> Optional[dict]:
     return _parse_jsonb_fields_job(res.data[0]) if res.data else None
 
 
+def get_jobs_by_ids(job_ids: list[str]) -> dict[str, dict]:
+    """Fetch several jobs in one query, keyed by id. Missing ids are absent."""
+    if not job_ids:
+        return {}
+    res = supabase.table("jobs").select("*").in_("id", list(set(job_ids))).execute()
+    return {j["id"]: _parse_jsonb_fields_job(j) for j in (res.data or [])}
+
+
 def get_active_jobs() -> list[dict]:
     res = supabase.table("jobs").select("*").eq("status", "active").order("created_at", desc=True).execute()
     return [_parse_jsonb_fields_job(j) for j in (res.data or [])]
@@ -101,13 +120,21 @@ def get_jobs_by_company(company_id: str) -> list[dict]:
     return [_parse_jsonb_fields_job(j) for j in (res.data or [])]
 
 
-def search_jobs(search: Optional[str] = None, remote_only: bool = False, job_type: Optional[str] = None, limit: int = 50) -> list[dict]:
+def search_jobs(
+    search: Optional[str] = None,
+    remote_only: bool = False,
+    job_type: Optional[str] = None,
+    limit: int = 50,
+    source: Optional[str] = None,
+) -> list[dict]:
     q = supabase.table("jobs").select("*").eq("status", "active")
 
     if remote_only:
         q = q.eq("remote", True)
     if job_type:
         q = q.eq("type", job_type)
+    if source:
+        q = q.eq("source", source)
 
     q = q.order("created_at", desc=True).limit(limit)
     res = q.execute()
@@ -135,12 +162,73 @@ def create_job(job: dict) -> dict:
 def update_job(job_id: str, data: dict) -> dict:
     data = _prep_jsonb_fields_job(data)
     data.pop("id", None)
+    data.setdefault("updated_at", datetime.now(timezone.utc).isoformat())
     res = supabase.table("jobs").update(data).eq("id", job_id).execute()
     return _parse_jsonb_fields_job(res.data[0]) if res.data else {}
 
 
+def get_job_company_name(job: dict) -> str:
+    """Employer name: stored on external jobs, looked up for native ones."""
+    if job.get("company_name"):
+        return job["company_name"]
+    company = get_user_by_id(job["company_id"]) if job.get("company_id") else None
+    return (company or {}).get("company_name", "Unknown")
+
+
+def get_job_company_names(jobs: list[dict]) -> dict[str, str]:
+    """job id → employer name for many jobs, with one users query for the native ones."""
+    company_ids = list({j["company_id"] for j in jobs if not j.get("company_name") and j.get("company_id")})
+    companies: dict[str, str] = {}
+    if company_ids:
+        res = supabase.table("users").select("id, company_name").in_("id", company_ids).execute()
+        companies = {u["id"]: u.get("company_name") for u in (res.data or [])}
+    return {j["id"]: j.get("company_name") or companies.get(j.get("company_id")) or "Unknown" for j in jobs}
+
+
 def close_job(job_id: str):
-    supabase.table("jobs").update({"status": "closed"}).eq("id", job_id).execute()
+    supabase.table("jobs").update({
+        "status": "closed",
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }).eq("id", job_id).execute()
+
+
+def get_job_hashes(job_ids: list[str], batch_size: int = 200) -> dict[str, Optional[str]]:
+    """content_hash of each existing job among ``job_ids`` (batched ``in`` queries)."""
+    hashes: dict[str, Optional[str]] = {}
+    ids = list(dict.fromkeys(job_ids))
+    for i in range(0, len(ids), batch_size):
+        res = supabase.table("jobs").select("id, content_hash").in_("id", ids[i:i + batch_size]).execute()
+        hashes.update({j["id"]: j.get("content_hash") for j in (res.data or [])})
+    return hashes
+
+
+def upsert_jobs(jobs: list[dict], batch_size: int = 100) -> int:
+    """Insert or replace jobs by id in batches. Returns rows written."""
+    written = 0
+    for i in range(0, len(jobs), batch_size):
+        batch = [_prep_jsonb_fields_job(dict(j)) for j in jobs[i:i + batch_size]]
+        res = supabase.table("jobs").upsert(batch, on_conflict="id").execute()
+        written += len(res.data or [])
+    return written
+
+
+def touch_jobs(job_ids: list[str], data: dict, batch_size: int = 200) -> None:
+    """Apply the same small update (e.g. last_seen_at) to many jobs."""
+    for i in range(0, len(job_ids), batch_size):
+        supabase.table("jobs").update(data).in_("id", job_ids[i:i + batch_size]).execute()
+
+
+def expire_jobs(source: str, now_iso: str) -> int:
+    """Close active jobs from ``source`` whose expires_at has passed."""
+    res = (
+        supabase.table("jobs")
+        .update({"status": "closed"})
+        .eq("source", source)
+        .eq("status", "active")
+        .lt("expires_at", now_iso)
+        .execute()
+    )
+    return len(res.data or [])
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -191,47 +279,81 @@ def get_all_applications() -> list[dict]:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  CONVERSATIONS & MESSAGES
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def get_conversation_between(user_a: str, user_b: str) -> Optional[str]:
-    """Find a conversation that contains both users. Returns conversation id or None."""
-    # Get all conversation IDs for user_a
-    res_a = supabase.table("conversation_participants").select("conversation_id").eq("user_id", user_a).execute()
-    conv_ids_a = {r["conversation_id"] for r in (res_a.data or [])}
+def direct_pair_key(user_a: str, user_b: str) -> str:
+    """Canonical key for the one direct conversation between two users."""
+    return ":".join(sorted((user_a, user_b)))
 
-    if not conv_ids_a:
-        return None
 
-    # Check if user_b is in any of those conversations
-    res_b = (
-        supabase.table("conversation_participants")
-        .select("conversation_id")
-        .eq("user_id", user_b)
-        .in_("conversation_id", list(conv_ids_a))
+def get_conversation_between(user_a: str, user_b: str) -> Optional[str]:
+    """Find the direct conversation between two users. Returns conversation id or None."""
+    res = (
+        supabase.table("conversations")
+        .select("id")
+        .eq("pair_key", direct_pair_key(user_a, user_b))
+        .limit(1)
         .execute()
     )
+    return res.data[0]["id"] if res.data else None
+
+
+def get_or_create_direct_conversation(user_a: str, user_b: str, new_id: str) -> str:
+    """Find-or-create the direct conversation between two users.
+
+    Safe under concurrency: the unique pair_key makes a racing insert a
+    no-op, and both callers then read back the same conversation.
+    """
+    conv_id = get_conversation_between(user_a, user_b)
+    if conv_id:
+        return conv_id
+    supabase.table("conversations").upsert(
+        {"id": new_id, "pair_key": direct_pair_key(user_a, user_b)},
+        on_conflict="pair_key",
+        ignore_duplicates=True,
+    ).execute()
+    conv_id = get_conversation_between(user_a, user_b) or new_id
+    # Idempotent, so a caller that lost the race still leaves both rows in place
+    _add_participants(conv_id, [user_a, user_b])
+    return conv_id
+
 
-    if res_b.data:
-        return res_b.data[0]["conversation_id"]
-    return None
+def get_conversation_ids_for_user(user_id: str) -> set[str]:
+    res = supabase.table("conversation_participants").select("conversation_id").eq("user_id", user_id).execute()
+    return {r["conversation_id"] for r in (res.data or [])}
 
 
 def create_conversation(conv_id: str, participants: list[str]) -> str:
-    supabase.table("conversations").insert({"id": conv_id}).execute()
-    rows = [{"conversation_id": conv_id, "user_id": uid} for uid in participants]
-    supabase.table("conversation_participants").insert(rows).execute()
+    row = {"id": conv_id}
+    if len(participants) == 2:
+        row["pair_key"] = direct_pair_key(*participants)
+    supabase.table("conversations").insert(row).execute()
+    _add_participants(conv_id, participants)
     return conv_id
 
 
+def _add_participants(conv_id: str, participants: list[str]) -> None:
+    rows = [{"conversation_id": conv_id, "user_id": uid} for uid in dict.fromkeys(participants)]
+    supabase.table("conversation_participants").upsert(
+        rows, on_conflict="conversation_id,user_id", ignore_duplicates=True,
+    ).execute()
+
+
 def get_conversations_for_user(user_id: str) -> list[dict]:
     """Get all conversations for a user with participant details."""
-    # Get conversation IDs
-    res = supabase.table("conversation_participants").select("conversation_id").eq("user_id", user_id).execute()
-    conv_ids = [r["conversation_id"] for r in (res.data or [])]
+    # Get conversation IDs with this user's read watermark
+    res = (
+        supabase.table("conversation_participants")
+        .select("conversation_id, last_read_at, last_read_message_id")
+        .eq("user_id", user_id)
+        .execute()
+    )
+    memberships = res.data or []
 
-    if not conv_ids:
+    if not memberships:
         return []
 
     results = []
-    for conv_id in conv_ids:
+    for row in memberships:
+        conv_id = row["conversation_id"]
         # Get all participants
         p_res = supabase.table("conversation_participants").select("user_id").eq("conversation_id", conv_id).execute()
         participant_ids = [r["user_id"] for r in (p_res.data or [])]
@@ -246,40 +368,117 @@ def get_conversations_for_user(user_id: str) -> list[dict]:
         # Get last message
         m_res = (
             supabase.table("messages")
-            .select("content, created_at, sender_id, read")
+            .select("content, created_at")
             .eq("conversation_id", conv_id)
             .order("created_at", desc=True)
-            .limit(20)
+            .limit(1)
             .execute()
         )
         msgs = m_res.data or []
 
-        last_msg = msgs[0]["content"] if msgs else None
-        last_msg_at = msgs[0]["created_at"] if msgs else None
-        unread = len([m for m in msgs if m["sender_id"] != user_id and not m.get("read")])
-
         results.append({
             "id": conv_id,
             "participants": participant_ids,
             "participant_names": names,
-            "last_message": last_msg,
-            "last_message_at": last_msg_at,
-            "unread_count": unread,
+            "last_message": msgs[0]["content"] if msgs else None,
+            "last_message_at": msgs[0]["created_at"] if msgs else None,
+            "unread_count": count_unread(conv_id, user_id, _watermark(row)) if msgs else 0,
         })
 
     results.sort(key=lambda x: x.get("last_message_at") or "", reverse=True)
     return results
 
 
-def get_messages(conversation_id: str) -> list[dict]:
+def count_unread(conversation_id: str, user_id: str, watermark: Optional[tuple[str, str]]) -> int:
+    """Messages from others after the user's (last_read_at, last_read_message_id) watermark."""
+    def query():
+        return (
+            supabase.table("messages")
+            .select("id", count="exact")
+            .eq("conversation_id", conversation_id)
+            .neq("sender_id", user_id)
+        )
+
+    if not watermark:
+        return query().execute().count or 0
+    ts, msg_id = watermark
+    # Same keyset comparison as get_messages: same-timestamp tail, then strictly later
+    tail = query().eq("created_at", ts).gt("id", msg_id).execute().count or 0
+    return tail + (query().gt("created_at", ts).execute().count or 0)
+
+
+def get_messages(
+    conversation_id: str,
+    since: Optional[tuple[str, str]] = None,
+    before: Optional[tuple[str, str]] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Messages in (created_at, id) order.
+
+    ``since``/``before`` are (created_at, id) keyset cursors: return the
+    first ``limit`` messages after ``since``, or the last ``limit`` before
+    ``before``. With neither, the newest ``limit`` (all when limit is None).
+    """
+    def query(desc: bool):
+        q = supabase.table("messages").select("*").eq("conversation_id", conversation_id)
+        return q.order("created_at", desc=desc).order("id", desc=desc)
+
+    def page(q):
+        return (q.limit(limit) if limit else q).execute().data or []
+
+    if since:
+        ts, msg_id = since
+        # Same-timestamp tail first, then everything strictly later
+        rows = page(query(False).eq("created_at", ts).gt("id", msg_id))
+        if not limit or len(rows) < limit:
+            rows += page(query(False).gt("created_at", ts))
+        return rows[:limit] if limit else rows
+
+    if before:
+        ts, msg_id = before
+        rows = page(query(True).eq("created_at", ts).lt("id", msg_id))
+        if not limit or len(rows) < limit:
+            rows += page(query(True).lt("created_at", ts))
+    else:
+        rows = page(query(True))
+    rows = rows[:limit] if limit else rows
+    return rows[::-1]
+
+
+def get_messages_for_conversations(
+    conversation_ids: list[str],
+    since: tuple[str, str],
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Messages across several conversations after a (created_at, id) cursor, oldest first.
+
+    Served by the (created_at, id) index from migration 014: the scan walks
+    the time range and stops after ``limit`` matching rows, however many
+    conversations are listed.
+    """
+    if not conversation_ids:
+        return []
+
+    def page(q):
+        q = q.in_("conversation_id", list(conversation_ids)).order("created_at").order("id")
+        return (q.limit(limit) if limit else q).execute().data or []
+
+    ts, msg_id = since
+    rows = page(supabase.table("messages").select("*").eq("created_at", ts).gt("id", msg_id))
+    if not limit or len(rows) < limit:
+        rows += page(supabase.table("messages").select("*").gt("created_at", ts))
+    return rows[:limit] if limit else rows
+
+
+def get_read_positions(user_id: str) -> dict[str, Optional[tuple[str, str]]]:
+    """conversation_id → the user's read watermark (None if never read), in one query."""
     res = (
-        supabase.table("messages")
-        .select("*")
-        .eq("conversation_id", conversation_id)
-        .order("created_at")
+        supabase.table("conversation_participants")
+        .select("conversation_id, last_read_at, last_read_message_id")
+        .eq("user_id", user_id)
         .execute()
     )
-    return res.data or []
+    return {r["conversation_id"]: _watermark(r) for r in (res.data or [])}
 
 
 def get_conversation_participants(conversation_id: str) -> list[str]:
@@ -297,11 +496,67 @@ def create_message(msg: dict) -> dict:
     return res.data[0]
 
 
-def mark_messages_read(conversation_id: str, reader_id: str):
-    """Mark all messages in a conversation as read for a specific user."""
-    supabase.table("messages").update({"read": True}).eq(
-        "conversation_id", conversation_id
-    ).neq("sender_id", reader_id).eq("read", False).execute()
+def get_read_watermarks(conversation_id: str) -> dict[str, Optional[tuple[str, str]]]:
+    """user_id → (last_read_at, last_read_message_id), or None if never read."""
+    res = (
+        supabase.table("conversation_participants")
+        .select("user_id, last_read_at, last_read_message_id")
+        .eq("conversation_id", conversation_id)
+        .execute()
+    )
+    return {r["user_id"]: _watermark(r) for r in (res.data or [])}
+
+
+def _watermark(row: dict) -> Optional[tuple[str, str]]:
+    """(last_read_at, last_read_message_id) from a participant row, or None if never read."""
+    if not row.get("last_read_at"):
+        return None
+    return row["last_read_at"], row.get("last_read_message_id") or ""
+
+
+def mark_conversation_read(
+    conversation_id: str,
+    reader_id: str,
+    current: Optional[tuple[str, str]] = None,
+    upto: Optional[tuple[str, str]] = None,
+) -> Optional[tuple[str, str]]:
+    """Move the reader's watermark to ``upto`` (default: the newest message).
+
+    ``current`` is the reader's watermark if the caller already has it;
+    the watermark never moves backwards. Returns the new
+    (last_read_at, last_read_message_id), or None when there was nothing
+    new to read (and nothing was written).
+    """
+    if upto is None:
+        res = (
+            supabase.table("messages")
+            .select("id, created_at")
+            .eq("conversation_id", conversation_id)
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if not res.data:
+            return None
+        upto = (res.data[0]["created_at"], res.data[0]["id"])
+    latest = upto
+    if current is not None and message_key(*current) >= message_key(*latest):
+        return None
+    supabase.table("conversation_participants").update({
+        "last_read_at": latest[0],
+        "last_read_message_id": latest[1],
+    }).eq("conversation_id", conversation_id).eq("user_id", reader_id).execute()
+    return latest
+
+
+def message_key(created_at: str, message_id: str) -> tuple:
+    """Sort key for a message position; timestamps compare as instants."""
+    try:
+        when = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return (datetime.min.replace(tzinfo=timezone.utc), message_id)
+    return (when if when.tzinfo else when.replace(tzinfo=timezone.utc), message_id)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -317,16 +572,19 @@ def get_feature_requests(
     status: Optional[str] = None,
     sort_by: str = "votes",
     limit: int = 50,
+    author_role: Optional[str] = None,
 ) -> list[dict]:
     q = supabase.table("feature_requests").select("*")
     if category:
         q = q.eq("category", category)
     if status:
         q = q.eq("status", status)
-    if sort_by == "newest":
-        q = q.order("created_at", desc=True)
-    else:
+    if author_role:
+        q = q.eq("author_role", author_role)
+    if sort_by != "newest":
         q = q.order("vote_count", desc=True)
+    # Deterministic ties, so cached boards rank exactly like this query
+    q = q.order("created_at", desc=True).order("id", desc=True)
     res = q.limit(limit).execute()
     return res.data or []
 
@@ -408,6 +666,14 @@ def create_matcher_analysis(row: dict) -> dict:
     return _parse_jsonb_fields_matcher(res.data[0])
 
 
+def update_matcher_analysis(analysis_id: str, data: dict) -> dict:
+    import json as _json
+    if isinstance(data.get("result"), dict):
+        data = {**data, "result": _json.dumps(data["result"])}
+    res = supabase.table("matcher_analyses").update(data).eq("id", analysis_id).execute()
+    return _parse_jsonb_fields_matcher(res.data[0]) if res.data else {}
+
+
 def get_matcher_analyses_by_seeker(seeker_id: str, limit: int = 10) -> list[dict]:
     res = (
         supabase.table("matcher_analyses")
@@ -444,6 +710,73 @@ def _parse_jsonb_fields_matcher(data: dict) -> dict:
     return data
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  LLM RESPONSE CACHE
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def get_llm_cache_entry(key: str) -> Optional[dict]:
+    res = supabase.table("llm_cache").select("response, expires_at").eq("id", key).limit(1).execute()
+    return res.data[0] if res.data else None
+
+
+def upsert_llm_cache_entry(row: dict) -> None:
+    supabase.table("llm_cache").upsert(row, on_conflict="id").execute()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  BACKGROUND TASKS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_TASK_JSONB_FIELDS = ["payload", "result"]
+
+
+def create_task(row: dict) -> dict:
+    res = supabase.table("tasks").insert(_prep_task_jsonb(row)).execute()
+    return _parse_task_jsonb(res.data[0])
+
+
+def get_task_by_id(task_id: str) -> Optional[dict]:
+    res = supabase.table("tasks").select("*").eq("id", task_id).limit(1).execute()
+    return _parse_task_jsonb(res.data[0]) if res.data else None
+
+
+def update_task(task_id: str, data: dict, locked_by: Optional[str] = None) -> dict:
+    """Update a task; with ``locked_by``, only while that worker still holds the lease."""
+    query = supabase.table("tasks").update(_prep_task_jsonb(data)).eq("id", task_id)
+    if locked_by is not None:
+        query = query.eq("locked_by", locked_by)
+    res = query.execute()
+    return _parse_task_jsonb(res.data[0]) if res.data else {}
+
+
+def claim_tasks(worker_id: str, limit: int, visibility_seconds: int) -> list[dict]:
+    """Atomically lease up to ``limit`` runnable tasks (see claim_tasks() in 007_tasks.sql)."""
+    res = supabase.rpc("claim_tasks", {
+        "p_worker": worker_id,
+        "p_limit": limit,
+        "p_visibility_seconds": visibility_seconds,
+    }).execute()
+    return [_parse_task_jsonb(t) for t in (res.data or [])]
+
+
+def _prep_task_jsonb(data: dict) -> dict:
+    import json as _json
+    data = dict(data)
+    for field in _TASK_JSONB_FIELDS:
+        if isinstance(data.get(field), (dict, list)):
+            data[field] = _json.dumps(data[field])
+    return data
+
+
+def _parse_task_jsonb(data: dict) -> dict:
+    import json as _json
+    for field in _TASK_JSONB_FIELDS:
+        if isinstance(data.get(field), str):
+            try:
+                data[field] = _json.loads(data[field])
+            except (ValueError, TypeError):
+                data[field] = {}
+    return data
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  BLOG POSTS (Pressroom CMS)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -556,6 +889,20 @@ def get_related_jobs_for_skills(skills: list[str], limit: int = 5) -> list[dict]
     return [j for _, j in scored[:limit]]
 
 
+def get_table_version(table: str, **filters) -> tuple[Optional[str], int]:
+    """(newest updated_at, row count) of the matching rows, in one query.
+
+    A cheap change stamp for HTTP validators on listings: an edit moves
+    updated_at, and rows entering or leaving the filter change the count.
+    """
+    q = supabase.table(table).select("updated_at", count="exact")
+    for col, val in filters.items():
+        q = q.eq(col, val)
+    res = q.order("updated_at", desc=True).limit(1).execute()
+    newest = res.data[0].get("updated_at") if res.data else None
+    return newest, res.count or 0
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  HELPERS — JSONB field serialization
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
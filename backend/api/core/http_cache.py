@@ -0,0 +1,92 @@
+"""
+HTTP caching helpers for public read endpoints.
+
+Routes compute an ETag from a cheap version stamp (updated_at, counts,
+counters) before building the response body, then call ``conditional``:
+a client or CDN holding the current version gets an empty 304, everyone
+else gets the full body with ETag, Last-Modified and Cache-Control set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Browsers and the CDN may reuse a copy this long, then serve it stale
+# while they revalidate in the background.
+LIST_CACHE = "public, max-age=30, stale-while-revalidate=300"
+ITEM_CACHE = "public, max-age=120, stale-while-revalidate=3600"
+# Responses that vary by user must not be stored by shared caches
+PRIVATE_CACHE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over a version stamp; equal stamps give equal tags."""
+    raw = json.dumps(parts, default=str, separators=(",", ":"), sort_keys=True)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    ts = ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return ts.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison (RFC 9110 §13.1.2)
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _not_modified_since(header: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return since is not None and last_modified <= since
+
+
+def conditional(
+    request: Request,
+    response: Response,
+    etag: str,
+    *,
+    last_modified: Optional[str] = None,
+    cache_control: str = LIST_CACHE,
+    vary: Optional[str] = None,
+) -> Optional[Response]:
+    """Set validators on ``response``, or return the 304 to send instead.
+
+    ``last_modified`` is an ISO timestamp. If-None-Match takes precedence
+    over If-Modified-Since, as clients send both.
+    """
+    modified = _parse_time(last_modified)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    if vary:
+        headers["Vary"] = vary
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = _not_modified_since(request.headers.get("if-modified-since"), modified)
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,24 @@
+"""
+Server-Sent Events helpers shared by streaming endpoints.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # stop proxies from buffering the stream
+}
+
+
+def format_event(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """Serialize one SSE frame. ``data`` is JSON-encoded."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
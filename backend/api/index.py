@@ -12,23 +12,38 @@ Database: Supabase (PostgreSQL)
 """
 
 import os
+from contextlib import asynccontextmanager
 
 # Load .env for local development (no-op on Vercel)
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from api.routes import auth, seeker, jobs, recruiter, company, chat, matcher, features, blog
+from api.routes import auth, seeker, jobs, recruiter, company, chat, matcher, features, blog, tasks, admin
+from api.services.rate_limit import RateLimited
 
 # ─── App Setup ────────────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    from api.services.llm import close_clients
+    from api.services.jobs_api import close_client as close_jsearch_client
+    from api.services.pubsub import pubsub
+    await close_clients()
+    await close_jsearch_client()
+    await pubsub.close()
+
+
 app = FastAPI(
     title="HireFlow API",
     description="AI-powered job matching platform connecting seekers, recruiters, and companies.",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # ─── CORS (allow frontend origins) ───────────────────────
@@ -42,9 +57,20 @@ app.add_middleware(
     allow_origins=[o.strip() for o in ALLOWED_ORIGINS if o.strip()],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match", "If-Modified-Since"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 
+# ─── LLM load shedding → 429 ─────────────────────────────
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # ─── Register Routers ────────────────────────────────────
 app.include_router(auth.router)
 app.include_router(seeker.router)
@@ -55,6 +81,8 @@ app.include_router(chat.router)
 app.include_router(matcher.router)
 app.include_router(features.router)
 app.include_router(blog.router)
+app.include_router(tasks.router)
+app.include_router(admin.router)
 
 
 # ─── Health Check ─────────────────────────────────────────
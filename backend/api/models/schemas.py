@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
+from api.services.fanout import MAX_BATCH_SIZE
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  ENUMS
@@ -148,6 +150,8 @@ class JobResponse(BaseModel):
     experience_level: Optional[str] = None
     status: str
     applicant_count: int = 0
+    source: str = "hireflow"  # "jsearch" for ingested external postings
+    apply_link: Optional[str] = None
     created_at: str
 
 
@@ -222,6 +226,7 @@ class MessageResponse(BaseModel):
     content: str
     read: bool = False
     created_at: str
+    cursor: str = ""  # pass as ?since= / ?before= to page from this message
 
 
 class ConversationResponse(BaseModel):
@@ -314,14 +319,36 @@ class JDSource(str, Enum):
     EXTERNAL = "external"
 
 
+class AnalysisStatus(str, Enum):
+    PENDING = "pending"    # local estimate returned, LLM analysis running
+    COMPLETE = "complete"
+    FAILED = "failed"      # LLM analysis failed; the local estimate stands
+
+
+JD_MAX_LENGTH = 8000
+
+
 class MatcherRequest(BaseModel):
     mode: MatcherMode
     resume_source: ResumeSource
     resume_text: Optional[str] = Field(None, max_length=8000)
     jd_source: JDSource
     job_id: Optional[str] = None
-    jd_text: Optional[str] = Field(None, max_length=8000)
+    jd_text: Optional[str] = Field(None, max_length=JD_MAX_LENGTH)
+    cover_letter: Optional[str] = Field(None, max_length=5000)
+    refresh: bool = False  # bypass the LLM response cache
+
+
+class MatcherBatchRequest(BaseModel):
+    """One resume against many jobs: internal job ids and/or pasted JDs."""
+    resume_source: ResumeSource
+    resume_text: Optional[str] = Field(None, max_length=8000)
+    job_ids: list[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    jd_texts: list[Annotated[str, Field(max_length=JD_MAX_LENGTH)]] = Field(
+        default_factory=list, max_length=MAX_BATCH_SIZE,
+    )
     cover_letter: Optional[str] = Field(None, max_length=5000)
+    refresh: bool = False
 
 
 class MatcherAnalysis(BaseModel):
@@ -333,6 +360,7 @@ class MatcherAnalysis(BaseModel):
     keyword_misses: list[str] = []
     cover_letter_score: Optional[int] = None
     cover_letter_feedback: Optional[str] = None
+    source: str = "llm"  # "local" for the instant keyword-based estimate
 
 
 class MatcherResponse(BaseModel):
@@ -340,6 +368,7 @@ class MatcherResponse(BaseModel):
     mode: MatcherMode
     analysis: Optional[MatcherAnalysis] = None
     generated_cover_letter: Optional[str] = None
+    status: AnalysisStatus = AnalysisStatus.COMPLETE
     created_at: str
 
 
@@ -348,6 +377,7 @@ class MatcherHistoryItem(BaseModel):
     mode: MatcherMode
     job_title: Optional[str] = None
     overall_score: Optional[int] = None
+    status: AnalysisStatus = AnalysisStatus.COMPLETE
     created_at: str
 
 
@@ -546,3 +576,30 @@ class BlogEnrichResponse(BaseModel):
     suggested_tags: list[str] = []
     related_skills: list[str] = []
     reading_time_min: int
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  BACKGROUND TASKS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class TaskStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"  # failed permanently or ran out of attempts
+
+
+class TaskAccepted(BaseModel):
+    task_id: str
+    status: TaskStatus
+    status_url: str
+
+
+class TaskResponse(BaseModel):
+    id: str
+    kind: str
+    status: TaskStatus
+    attempts: int = 0
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: str = ""
+    updated_at: str = ""
@@ -0,0 +1,49 @@
+"""
+HireFlow Admin Routes
+=====================
+Operational metrics for admins (see ADMIN_EMAILS in api/core/config.py).
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from api.core.config import require_admin
+from api.services.jobs_api import latency as jsearch_latency, search_cache
+from api.services.llm import cache_stats
+from api.services.llm_telemetry import telemetry
+from api.services.prompt_compaction import compaction_stats
+from api.services.pubsub import pubsub
+from api.services import rate_limit
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+@router.get("/llm/telemetry")
+async def llm_telemetry(
+    recent: int = Query(0, ge=0, le=500, description="Also return the N most recent calls"),
+    _: dict = Depends(require_admin),
+):
+    """Per-prompt-type latency percentiles, tokens and cost for LLM calls."""
+    body = {
+        "by_prompt_type": telemetry.summary(),
+        "cache": cache_stats(),
+        "admission": rate_limit.admission.stats(),
+        "prompt_compaction": compaction_stats(),
+    }
+    if recent:
+        body["recent"] = telemetry.recent(recent)
+    return body
+
+
+@router.get("/metrics")
+async def metrics(_: dict = Depends(require_admin)):
+    """In-process cache, admission, hedging and pub/sub counters for this instance."""
+    return {
+        "llm_cache": cache_stats(),
+        "llm_admission": rate_limit.admission.stats(),
+        "llm_prompt_compaction": compaction_stats(),
+        "jsearch_cache": search_cache.stats(),
+        "jsearch_hedging": jsearch_latency.stats(),
+        "chat_pubsub": pubsub.stats(),
+    }
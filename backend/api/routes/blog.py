@@ -2,16 +2,21 @@
 Pressroom Blog Routes
 =====================
 Public blog endpoints + admin CUD endpoints for the CLI.
+Public reads send ETag/Cache-Control and answer conditional GETs with 304
+(see api/core/http_cache.py).
 """
 
 from __future__ import annotations
 
 from uuid import uuid4
 from datetime import datetime, timezone
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 
 from api.core.config import require_user, get_current_user
+from api.core.http_cache import ITEM_CACHE, LIST_CACHE, conditional, make_etag
+from api.services.rate_limit import llm_user
 from api.core.database import (
     create_blog_post,
     get_blog_post_by_slug,
@@ -23,6 +28,7 @@ from api.core.database import (
     increment_blog_view,
     get_blog_categories_with_counts,
     get_related_jobs_for_skills,
+    get_table_version,
 )
 from api.models.schemas import (
     BlogPostCreate,
@@ -32,7 +38,9 @@ from api.models.schemas import (
     BlogEnrichRequest,
     BlogEnrichResponse,
     SuccessResponse,
+    TaskAccepted,
 )
+from api.routes.tasks import accept_task
 
 router = APIRouter(prefix="/api/blog", tags=["Blog"])
 
@@ -96,8 +104,17 @@ def _to_response(p: dict) -> BlogPostResponse:
 
 # ── Public Endpoints ─────────────────────────────────────
 
+def _conditional_on_published(request: Request, response: Response, view: str) -> Optional[Response]:
+    """Validators for views derived from the published set, checked before querying it."""
+    newest, count = get_table_version("blog_posts", status="published")
+    etag = make_etag(view, newest, count, sorted(request.query_params.multi_items()))
+    return conditional(request, response, etag, last_modified=newest, cache_control=LIST_CACHE)
+
+
 @router.get("", response_model=list[BlogPostListItem])
 async def list_posts(
+    request: Request,
+    response: Response,
     category: str = Query(None),
     tag: str = Query(None),
     featured: bool = Query(None),
@@ -105,6 +122,10 @@ async def list_posts(
     per_page: int = Query(12, ge=1, le=50),
 ):
     """List published blog posts with optional filters."""
+    not_modified = _conditional_on_published(request, response, "posts")
+    if not_modified:
+        return not_modified
+
     offset = (page - 1) * per_page
     posts = list_blog_posts(
         category=category, tag=tag, featured=featured,
@@ -114,8 +135,12 @@ async def list_posts(
 
 
 @router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request, response: Response):
     """List all categories with post counts."""
+    not_modified = _conditional_on_published(request, response, "categories")
+    if not_modified:
+        return not_modified
+
     cats = get_blog_categories_with_counts()
     return [
         {**c, "label": BLOG_CATEGORY_LABELS.get(c["category"], c["category"])}
@@ -124,13 +149,23 @@ async def get_categories():
 
 
 @router.get("/{slug}", response_model=BlogPostResponse)
-async def get_post(slug: str):
-    """Get a single published blog post by slug. Increments view count."""
+async def get_post(slug: str, request: Request, response: Response):
+    """Get a single published blog post by slug. Increments view count.
+
+    Revalidations count as views too; the view count itself is not part of
+    the ETag, so cached copies show it as of their last change.
+    """
     post = get_blog_post_by_slug(slug)
     if not post or post.get("status") != "published":
         raise HTTPException(404, "Post not found.")
     increment_blog_view(post["id"])
-    return _to_response(post)
+    etag = make_etag("post", {k: v for k, v in post.items() if k != "view_count"})
+    not_modified = conditional(
+        request, response, etag,
+        last_modified=post.get("updated_at") or post.get("published_at"),
+        cache_control=ITEM_CACHE,
+    )
+    return not_modified or _to_response(post)
 
 
 @router.get("/{slug}/related-jobs")
@@ -236,7 +271,7 @@ async def archive_post(slug: str, user: dict = Depends(require_user)):
     post = get_blog_post_by_slug(slug)
     if not post:
         raise HTTPException(404, "Post not found.")
-    update_blog_post(post["id"], {"status": "archived"})
+    update_blog_post(post["id"], {"status": "archived", "updated_at": datetime.now(timezone.utc).isoformat()})
     return SuccessResponse(message="Post archived", id=post["id"])
 
 
@@ -244,5 +279,21 @@ async def archive_post(slug: str, user: dict = Depends(require_user)):
 async def enrich_post_content(req: BlogEnrichRequest, user: dict = Depends(require_user)):
     """AI-enrich a blog post with SEO metadata and related skills."""
     from api.services.blog_ai import enrich_post
-    result = enrich_post(req.title, req.body_markdown, req.category)
+    llm_user.set(user["id"])
+    result = await enrich_post(req.title, req.body_markdown, req.category)
     return BlogEnrichResponse(**result)
+
+
+@router.post("/admin/enrich/async", response_model=TaskAccepted, status_code=202)
+async def enrich_post_content_async(
+    req: BlogEnrichRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(require_user),
+):
+    """Queue blog enrichment and return 202. Poll ``status_url`` for the BlogEnrichResponse."""
+    return accept_task("blog.enrich", {
+        "title": req.title,
+        "body_markdown": req.body_markdown,
+        "category": req.category.value,
+    }, user, response, background_tasks)
@@ -1,26 +1,65 @@
+"""
+HireFlow Chat Routes
+====================
+REST for history and sending; ``/api/chat/ws`` pushes new messages, read
+receipts and typing indicators as they happen, so clients no longer poll.
+``/api/chat/inbox/stream`` is the lighter Server-Sent Events feed for
+inbox badges: new conversations, new messages and unread counts, with
+Last-Event-ID resume. Events fan out through api/services/pubsub.py on
+one channel per user.
+  CHAT_PAGE_SIZE       = <messages per cursor page when no limit is given, default 50>
+  CHAT_WS_PING_SECONDS = <idle seconds before the server sends a ping, default 25>
+  CHAT_TYPING_INTERVAL = <seconds between relayed typing events per conversation, default 2>
+  CHAT_INBOX_RESUME_LIMIT = <missed messages replayed on resume before asking for a resync, default 200>
+  CHAT_INBOX_RESUME_MAX_AGE = <seconds since the Last-Event-ID message beyond which resume resyncs, default 3600>
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 
-from api.core.config import require_user
+from api.core.config import decode_token, require_user
+from api.core.sse import SSE_HEADERS, format_event
 from api.core.database import (
     get_user_by_id,
-    get_conversation_between,
-    create_conversation,
+    get_user_names,
+    get_or_create_direct_conversation,
     get_conversations_for_user,
+    get_conversation_ids_for_user,
     get_messages,
+    get_messages_for_conversations,
     get_conversation_participants,
+    get_read_positions,
+    count_unread,
+    get_read_watermarks,
     create_message,
-    mark_messages_read,
+    mark_conversation_read,
+    message_key,
 )
 from api.models.schemas import (
     MessageSend,
     MessageResponse,
     ConversationResponse,
 )
+from api.services.pubsub import pubsub, user_channel
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
+_PAGE_SIZE = int(os.environ.get("CHAT_PAGE_SIZE", "50"))
+_MAX_PAGE_SIZE = 200
+_PING_SECONDS = float(os.environ.get("CHAT_WS_PING_SECONDS", "25"))
+_TYPING_INTERVAL = float(os.environ.get("CHAT_TYPING_INTERVAL", "2"))
+_RESUME_LIMIT = int(os.environ.get("CHAT_INBOX_RESUME_LIMIT", "200"))
+_RESUME_MAX_AGE = float(os.environ.get("CHAT_INBOX_RESUME_MAX_AGE", "3600"))
+
 
 @router.get("/conversations", response_model=list[ConversationResponse])
 async def list_conversations(user: dict = Depends(require_user)):
@@ -29,31 +68,88 @@ async def list_conversations(user: dict = Depends(require_user)):
     return [ConversationResponse(**c) for c in convs]
 
 
+def encode_cursor(msg: dict) -> str:
+    """Opaque keyset cursor for a message: its (created_at, id)."""
+    raw = f"{msg.get('created_at', '')}|{msg['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, msg_id = raw.rsplit("|", 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, msg_id
+
+
+def _message_response(m: dict, names: dict[str, str], watermarks: Optional[dict] = None) -> MessageResponse:
+    # Read once any other participant's watermark has reached it
+    key = message_key(m.get("created_at", ""), m["id"])
+    read = any(
+        mark is not None and message_key(*mark) >= key
+        for uid, mark in (watermarks or {}).items()
+        if uid != m["sender_id"]
+    )
+    return MessageResponse(
+        id=m["id"],
+        conversation_id=m["conversation_id"],
+        sender_id=m["sender_id"],
+        sender_name=names.get(m["sender_id"]) or "Unknown",
+        content=m["content"],
+        read=read,
+        created_at=m.get("created_at", ""),
+        cursor=encode_cursor(m),
+    )
+
+
 @router.get("/conversations/{conv_id}/messages", response_model=list[MessageResponse])
-async def get_conv_messages(conv_id: str, user: dict = Depends(require_user)):
-    """Get all messages in a conversation."""
-    participants = get_conversation_participants(conv_id)
-    if not participants:
+async def get_conv_messages(
+    conv_id: str,
+    since: Optional[str] = Query(None, description="Cursor of the last message the client has; returns newer ones"),
+    before: Optional[str] = Query(None, description="Cursor of the oldest message the client has; returns older ones"),
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    user: dict = Depends(require_user),
+):
+    """Messages in a conversation, oldest first.
+
+    Without a cursor or ``limit`` this is the whole history; with only a
+    ``limit``, the newest ``limit`` messages. Pass the last message's
+    ``cursor`` as ``since`` to fetch only what arrived after it, or the
+    first one's as ``before`` to scroll back; cursor reads are paged
+    (``limit`` defaults to CHAT_PAGE_SIZE, and a full page means there may
+    be more).
+    """
+    if since and before:
+        raise HTTPException(status_code=400, detail="Use either since or before, not both")
+    watermarks = get_read_watermarks(conv_id)
+    if not watermarks:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    if user["id"] not in participants:
+    if user["id"] not in watermarks:
         raise HTTPException(status_code=403, detail="Not a participant")
+    participants = list(watermarks)
 
-    # Mark as read
-    mark_messages_read(conv_id, user["id"])
+    since_key = _decode_cursor(since) if since else None
+    before_key = _decode_cursor(before) if before else None
 
-    msgs = get_messages(conv_id)
-    return [
-        MessageResponse(
-            id=m["id"],
-            conversation_id=conv_id,
-            sender_id=m["sender_id"],
-            sender_name=(get_user_by_id(m["sender_id"]) or {}).get("name", "Unknown"),
-            content=m["content"],
-            read=m.get("read", False),
-            created_at=m.get("created_at", ""),
-        )
-        for m in msgs
-    ]
+    if limit is None and (since or before):
+        limit = _PAGE_SIZE
+    msgs = get_messages(conv_id, since=since_key, before=before_key, limit=limit)
+
+    # Mark as read up to the newest message returned, not past unseen pages
+    if msgs:
+        newest = (msgs[-1]["created_at"], msgs[-1]["id"])
+        mark = mark_conversation_read(conv_id, user["id"], current=watermarks[user["id"]], upto=newest)
+        if mark:
+            watermarks[user["id"]] = mark
+            await _publish_read(conv_id, user["id"], mark, participants)
+
+    # Senders are participants, so one lookup covers the whole page
+    names = get_user_names(participants)
+    missing = {m["sender_id"] for m in msgs} - names.keys()
+    if missing:
+        names.update(get_user_names(missing))
+    return [_message_response(m, names, watermarks) for m in msgs]
 
 
 @router.post("/messages", response_model=MessageResponse, status_code=201)
@@ -64,10 +160,7 @@ async def send_message(req: MessageSend, user: dict = Depends(require_user)):
         raise HTTPException(status_code=404, detail="Recipient not found")
 
     # Find or create conversation
-    conv_id = get_conversation_between(user["id"], req.recipient_id)
-    if not conv_id:
-        conv_id = f"conv_{uuid4().hex[:12]}"
-        create_conversation(conv_id, [user["id"], req.recipient_id])
+    conv_id = get_or_create_direct_conversation(user["id"], req.recipient_id, f"conv_{uuid4().hex[:12]}")
 
     msg_id = f"msg_{uuid4().hex[:12]}"
     msg = create_message({
@@ -78,12 +171,275 @@ async def send_message(req: MessageSend, user: dict = Depends(require_user)):
         "read": False,
     })
 
-    return MessageResponse(
-        id=msg_id,
-        conversation_id=conv_id,
-        sender_id=user["id"],
-        sender_name=user.get("name", "Unknown"),
-        content=req.content,
-        read=False,
-        created_at=msg.get("created_at", ""),
+    resp = _message_response(msg, {user["id"]: user.get("name", "")})
+    await pubsub.publish_many(
+        [user_channel(user["id"]), user_channel(req.recipient_id)],
+        {"type": "message", "conversation_id": conv_id, "message": resp.model_dump()},
+    )
+    return resp
+
+
+# ─── Real-time events ─────────────────────────────────────
+async def _publish_read(conv_id: str, reader_id: str, mark: tuple[str, str], participants: list[str]):
+    await pubsub.publish_many(
+        [user_channel(uid) for uid in participants],
+        {
+            "type": "read",
+            "conversation_id": conv_id,
+            "reader_id": reader_id,
+            "last_read_at": mark[0],
+            "last_read_message_id": mark[1],
+        },
+    )
+
+
+def _token_user(headers, token: Optional[str]) -> Optional[dict]:
+    """Browsers cannot set headers on a WebSocket or EventSource, so the JWT may come as ?token=."""
+    if not token:
+        scheme, _, value = headers.get("authorization", "").partition(" ")
+        token = value if scheme.lower() == "bearer" else None
+    payload = decode_token(token) if token else None
+    if not payload or not payload.get("sub"):
+        return None
+    return get_user_by_id(payload["sub"])
+
+
+class _ChatSession:
+    """Client → server frames for one socket: typing, read and ping."""
+
+    def __init__(self, websocket: WebSocket, user: dict, conversations: set[str]):
+        self.websocket = websocket
+        self.user = user
+        self.conversations = conversations
+        self._last_typing: dict[str, float] = {}
+
+    def is_participant(self, conv_id: str) -> bool:
+        if conv_id in self.conversations:
+            return True
+        # Joined after the socket opened
+        if self.user["id"] in get_conversation_participants(conv_id):
+            self.conversations.add(conv_id)
+            return True
+        return False
+
+    async def read_frames(self) -> None:
+        try:
+            while True:
+                try:
+                    frame = json.loads(await self.websocket.receive_text())
+                except ValueError:
+                    await self.websocket.send_json({"type": "error", "detail": "Frames must be JSON."})
+                    continue
+                await self.handle(frame if isinstance(frame, dict) else {})
+        except WebSocketDisconnect:
+            return
+
+    async def handle(self, frame: dict) -> None:
+        kind = frame.get("type")
+        if kind == "ping":
+            await self.websocket.send_json({"type": "pong"})
+            return
+        if kind not in ("typing", "read"):
+            await self.websocket.send_json({"type": "error", "detail": f"Unknown frame type: {kind!r}"})
+            return
+        conv_id = frame.get("conversation_id") or ""
+        if not self.is_participant(conv_id):
+            await self.websocket.send_json({"type": "error", "detail": "Not a participant", "conversation_id": conv_id})
+            return
+
+        uid = self.user["id"]
+        if kind == "typing":
+            now = time.monotonic()
+            if now - self._last_typing.get(conv_id, float("-inf")) < _TYPING_INTERVAL:
+                return
+            self._last_typing[conv_id] = now
+            others = [p for p in get_conversation_participants(conv_id) if p != uid]
+            await pubsub.publish_many(
+                [user_channel(p) for p in others],
+                {"type": "typing", "conversation_id": conv_id, "user_id": uid, "name": self.user.get("name", "")},
+            )
+        else:
+            watermarks = get_read_watermarks(conv_id)
+            mark = mark_conversation_read(conv_id, uid, current=watermarks.get(uid))
+            if mark:
+                await _publish_read(conv_id, uid, mark, list(watermarks))
+
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """Push chat events for every conversation the user is in.
+
+    Server → client: ``ready``, ``message``, ``read``, ``typing``, ``ping``.
+    Client → server: ``{"type": "typing" | "read", "conversation_id"}`` and ``{"type": "ping"}``.
+    """
+    user = _token_user(websocket.headers, token)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    sub = pubsub.subscribe(user_channel(user["id"]))
+    session = _ChatSession(websocket, user, get_conversation_ids_for_user(user["id"]))
+    reader = asyncio.create_task(session.read_frames())
+    getter: Optional[asyncio.Task] = None
+    try:
+        await websocket.send_json({"type": "ready", "user_id": user["id"], "conversations": sorted(session.conversations)})
+        while True:
+            getter = getter or asyncio.create_task(sub.get())
+            done, _ = await asyncio.wait({reader, getter}, timeout=_PING_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+            if reader in done:
+                break
+            if sub.overflowed:
+                # Fell too far behind; the client reconnects and resyncs over REST
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                break
+            if getter in done:
+                event = getter.result()
+                getter = None
+                if event.get("type") == "message":
+                    session.conversations.add(event["conversation_id"])
+                await websocket.send_json(event)
+            else:
+                await websocket.send_json({"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sub.close()
+        for task in (reader, getter):
+            if task is not None:
+                task.cancel()
+
+
+# ─── Inbox stream ─────────────────────────────────────────
+class _InboxState:
+    """What one inbox stream knows: the user's conversations and read positions."""
+
+    def __init__(self, user_id: str, read_positions: dict[str, Optional[tuple[str, str]]]):
+        self.user_id = user_id
+        self.read_positions = read_positions
+
+    def unread(self, conv_id: str) -> str:
+        count = count_unread(conv_id, self.user_id, self.read_positions.get(conv_id))
+        return format_event("unread", {"conversation_id": conv_id, "unread_count": count})
+
+    def conversation(self, conv_id: str) -> str:
+        self.read_positions.setdefault(conv_id, None)
+        participants = get_conversation_participants(conv_id)
+        return format_event("conversation", {
+            "id": conv_id,
+            "participants": participants,
+            "participant_names": get_user_names(participants),
+        })
+
+    def message(self, conv_id: str, message: dict, is_new: bool, with_unread: bool = True) -> list[str]:
+        frames = [self.conversation(conv_id)] if is_new else []
+        frames.append(format_event(
+            "message", {"conversation_id": conv_id, "message": message}, event_id=message["cursor"],
+        ))
+        if with_unread and message["sender_id"] != self.user_id:
+            frames.append(self.unread(conv_id))
+        return frames
+
+    def replay(self, missed: list[dict]) -> list[str]:
+        names = get_user_names({m["sender_id"] for m in missed})
+        frames = []
+        started: set[str] = set()
+        received: dict[str, None] = {}
+        for m in missed:
+            conv_id = m["conversation_id"]
+            # New to the client if its first missed message is the conversation's first
+            is_new = conv_id not in started and not get_messages(
+                conv_id, before=(m.get("created_at", ""), m["id"]), limit=1,
+            )
+            started.add(conv_id)
+            if m["sender_id"] != self.user_id:
+                received[conv_id] = None
+            frames += self.message(conv_id, _message_response(m, names).model_dump(), is_new, with_unread=False)
+        # One count per conversation rather than one per replayed message
+        return frames + [self.unread(conv_id) for conv_id in received]
+
+    def live(self, event: dict) -> list[str]:
+        conv_id = event.get("conversation_id", "")
+        if event.get("type") == "message":
+            return self.message(conv_id, event["message"], conv_id not in self.read_positions)
+        if event.get("type") == "read" and event.get("reader_id") == self.user_id:
+            # Read on another device or tab
+            self.read_positions[conv_id] = (event["last_read_at"], event.get("last_read_message_id") or "")
+            return [self.unread(conv_id)]
+        return []
+
+
+async def inbox_events(user: dict, last_event_id: Optional[str] = None, is_disconnected=None):
+    """SSE frames for one user's inbox: ``ready``, ``conversation``, ``message``, ``unread``, ``resync``, ``ping``.
+
+    ``message`` events carry the message cursor as their id, so a client
+    reconnecting with Last-Event-ID gets what it missed replayed first. When
+    that is more than CHAT_INBOX_RESUME_LIMIT messages, the id is older than
+    CHAT_INBOX_RESUME_MAX_AGE, or it is not a cursor, it gets ``resync`` and
+    should refetch /api/chat/conversations.
+    """
+    # Subscribe before reading state so nothing published meanwhile is lost
+    sub = pubsub.subscribe(user_channel(user["id"]))
+    try:
+        state = _InboxState(user["id"], get_read_positions(user["id"]))
+        yield format_event("ready", {"user_id": user["id"], "conversations": sorted(state.read_positions)})
+
+        replayed_to = None
+        if last_event_id:
+            try:
+                since = _decode_cursor(last_event_id)
+            except HTTPException:
+                since = None
+            # A long gap resyncs without scanning: the replay would be too big to send anyway
+            oldest = datetime.now(timezone.utc) - timedelta(seconds=_RESUME_MAX_AGE)
+            missed = (
+                get_messages_for_conversations(list(state.read_positions), since, limit=_RESUME_LIMIT + 1)
+                if since and message_key(*since)[0] >= oldest else None
+            )
+            if missed is None or len(missed) > _RESUME_LIMIT:
+                yield format_event("resync", {"reason": "resume_unavailable"})
+            else:
+                for frame in state.replay(missed):
+                    yield frame
+                if missed:
+                    replayed_to = message_key(missed[-1].get("created_at", ""), missed[-1]["id"])
+
+        while True:
+            if is_disconnected is not None and await is_disconnected():
+                return
+            event = await sub.get(timeout=_PING_SECONDS)
+            if sub.overflowed:
+                yield format_event("resync", {"reason": "fell_behind"})
+                return
+            if event is None:
+                yield format_event("ping", {})
+                continue
+            if replayed_to is not None and event.get("type") == "message":
+                msg = event["message"]
+                if message_key(msg.get("created_at", ""), msg["id"]) <= replayed_to:
+                    continue  # already sent by the replay
+            for frame in state.live(event):
+                yield frame
+    finally:
+        sub.close()
+
+
+@router.get("/inbox/stream")
+async def inbox_stream(
+    request: Request,
+    token: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Server-Sent Events feed of inbox changes for the current user.
+
+    Cheaper than polling /api/chat/conversations for badges: the full inbox
+    is built once by the client, then kept current from these deltas.
+    """
+    user = _token_user(request.headers, token)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return StreamingResponse(
+        inbox_events(user, last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
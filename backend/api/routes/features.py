@@ -1,18 +1,20 @@
 """
 HireFlow Feature Requests Routes
 =================================
-Public feature request board with voting and comments.
+Public feature request board with voting and comments. Board views are
+served from api/services/feature_board.py, which the write endpoints here
+keep current.
 """
 
 from __future__ import annotations
 
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from api.core.config import require_user, get_current_user
+from api.core.config import require_admin, require_user, get_current_user
+from api.core.http_cache import LIST_CACHE, PRIVATE_CACHE, conditional, make_etag
 from api.core.database import (
-    get_user_by_id,
     create_feature_request,
     get_feature_requests,
     get_feature_request_by_id,
@@ -25,6 +27,7 @@ from api.core.database import (
     create_feature_comment,
     get_comment_counts,
 )
+from api.services.feature_board import BoardKey, feature_board
 from api.models.schemas import (
     FeatureRequestCreate,
     FeatureRequestResponse,
@@ -36,18 +39,25 @@ from api.models.schemas import (
 
 router = APIRouter(prefix="/api/features", tags=["Feature Requests"])
 
-# Admin emails — users with these emails can update feature status
-ADMIN_EMAILS = {"admin@hireflow.com"}
+
+def author_fields(user: dict) -> dict:
+    """Author name and role stored on feature rows and comments at write time.
+
+    Kept current by the trigger in migration 012 when the user changes.
+    """
+    return {
+        "author_name": user.get("name") or user.get("company_name") or "Anonymous",
+        "author_role": user.get("role"),
+    }
 
 
 def _enrich_feature(f: dict, user_votes: set[str], comment_counts: dict[str, int]) -> FeatureRequestResponse:
-    """Enrich a raw feature_request row with user info, vote status, and comment count."""
-    author = get_user_by_id(f["user_id"]) or {}
+    """Enrich a raw feature_request row with vote status and comment count."""
     return FeatureRequestResponse(
         id=f["id"],
         user_id=f["user_id"],
-        user_name=author.get("name") or author.get("company_name") or "Anonymous",
-        user_role=author.get("role"),
+        user_name=f.get("author_name") or "Anonymous",
+        user_role=f.get("author_role"),
         title=f["title"],
         description=f["description"],
         category=f["category"],
@@ -62,6 +72,8 @@ def _enrich_feature(f: dict, user_votes: set[str], comment_counts: dict[str, int
 # ── List Feature Requests ────────────────────────────────
 @router.get("", response_model=list[FeatureRequestResponse])
 async def list_features(
+    request: Request,
+    response: Response,
     category: str = Query(None, description="Filter by category"),
     status: str = Query(None, description="Filter by status"),
     sort: str = Query("votes", description="Sort by: votes, newest"),
@@ -70,25 +82,32 @@ async def list_features(
     user=Depends(get_current_user),
 ):
     """List feature requests. Public endpoint — auth optional for vote status."""
-    features = get_feature_requests(category=category, status=status, sort_by=sort, limit=limit)
-
-    # Filter by submitter role in Python (simpler than joining)
-    if role:
-        role_filtered = []
-        for f in features:
-            author = get_user_by_id(f["user_id"]) or {}
-            if author.get("role") == role:
-                role_filtered.append(f)
-        features = role_filtered
+    board = feature_board.board(BoardKey.of(category, status, role, sort), _load_board)[:limit]
+    user_votes = feature_board.user_votes(user["id"], get_user_votes) if user else set()
 
-    user_votes: set[str] = set()
-    if user:
-        user_votes = get_user_votes(user["id"])
+    # Validate against the ranked board before building any responses
+    etag = make_etag(
+        "features",
+        [(f.id, f.vote_count, f.comment_count, f.status, f.user_name, f.id in user_votes) for f in board],
+    )
+    not_modified = conditional(
+        request, response, etag,
+        cache_control=PRIVATE_CACHE if user else LIST_CACHE,
+        vary="Authorization",
+    )
+    if not_modified:
+        return not_modified
+    if not user:
+        return board
+    return [f.model_copy(update={"user_has_voted": f.id in user_votes}) for f in board]
 
-    feature_ids = [f["id"] for f in features]
-    comment_counts = get_comment_counts(feature_ids)
 
-    return [_enrich_feature(f, user_votes, comment_counts) for f in features]
+def _load_board(key: BoardKey, size: int) -> list[FeatureRequestResponse]:
+    features = get_feature_requests(
+        category=key.category, status=key.status, sort_by=key.sort, limit=size, author_role=key.role,
+    )
+    comment_counts = get_comment_counts([f["id"] for f in features])
+    return [_enrich_feature(f, set(), comment_counts) for f in features]
 
 
 # ── Get Single Feature Request ───────────────────────────
@@ -101,7 +120,7 @@ async def get_feature(feature_id: str, user=Depends(get_current_user)):
 
     user_votes: set[str] = set()
     if user:
-        user_votes = get_user_votes(user["id"])
+        user_votes = feature_board.user_votes(user["id"], get_user_votes)
 
     comment_counts = get_comment_counts([feature_id])
     return _enrich_feature(f, user_votes, comment_counts)
@@ -120,18 +139,18 @@ async def create_feature(req: FeatureRequestCreate, user: dict = Depends(require
         "category": req.category,
         "status": "submitted",
         "vote_count": 0,
+        **author_fields(user),
     }
     f = create_feature_request(row)
-    return _enrich_feature(f, set(), {})
+    feature = _enrich_feature(f, set(), {})
+    feature_board.apply(feature)
+    return feature
 
 
 # ── Update Status (Admin Only) ──────────────────────────
 @router.patch("/{feature_id}/status", response_model=FeatureRequestResponse)
-async def update_status(feature_id: str, req: FeatureStatusUpdate, user: dict = Depends(require_user)):
+async def update_status(feature_id: str, req: FeatureStatusUpdate, user: dict = Depends(require_admin)):
     """Update feature request status (admin only)."""
-    if user.get("email") not in ADMIN_EMAILS:
-        raise HTTPException(403, "Only admins can update feature status.")
-
     f = get_feature_request_by_id(feature_id)
     if not f:
         raise HTTPException(404, "Feature request not found.")
@@ -139,8 +158,9 @@ async def update_status(feature_id: str, req: FeatureStatusUpdate, user: dict =
     update_feature_request(feature_id, {"status": req.status})
     f["status"] = req.status
 
-    user_votes = get_user_votes(user["id"])
     comment_counts = get_comment_counts([feature_id])
+    feature_board.apply(_enrich_feature(f, set(), comment_counts))
+    user_votes = feature_board.user_votes(user["id"], get_user_votes)
     return _enrich_feature(f, user_votes, comment_counts)
 
 
@@ -157,16 +177,36 @@ async def vote_feature(feature_id: str, user: dict = Depends(require_user)):
         delete_feature_vote(feature_id, user["id"])
         new_count = max(0, f.get("vote_count", 0) - 1)
         update_feature_request(feature_id, {"vote_count": new_count})
+        _record_vote(f, user["id"], new_count, voted=False)
         return SuccessResponse(message="Vote removed", id=feature_id)
     else:
         vote_id = f"fv_{uuid4().hex[:12]}"
         create_feature_vote({"id": vote_id, "feature_id": feature_id, "user_id": user["id"]})
         new_count = f.get("vote_count", 0) + 1
         update_feature_request(feature_id, {"vote_count": new_count})
+        _record_vote(f, user["id"], new_count, voted=True)
         return SuccessResponse(message="Vote added", id=feature_id)
 
 
+def _record_vote(f: dict, user_id: str, new_count: int, voted: bool):
+    f = {**f, "vote_count": new_count}
+    feature_board.apply(_enrich_feature(f, set(), get_comment_counts([f["id"]])))
+    feature_board.record_vote(user_id, f["id"], voted)
+
+
 # ── Comments ─────────────────────────────────────────────
+def _comment_response(c: dict) -> FeatureCommentResponse:
+    return FeatureCommentResponse(
+        id=c["id"],
+        feature_id=c["feature_id"],
+        user_id=c["user_id"],
+        user_name=c.get("author_name") or "Anonymous",
+        user_role=c.get("author_role"),
+        content=c["content"],
+        created_at=c.get("created_at", ""),
+    )
+
+
 @router.get("/{feature_id}/comments", response_model=list[FeatureCommentResponse])
 async def list_comments(feature_id: str):
     """Get all comments for a feature request (public)."""
@@ -175,19 +215,7 @@ async def list_comments(feature_id: str):
         raise HTTPException(404, "Feature request not found.")
 
     comments = get_feature_comments(feature_id)
-    results = []
-    for c in comments:
-        author = get_user_by_id(c["user_id"]) or {}
-        results.append(FeatureCommentResponse(
-            id=c["id"],
-            feature_id=c["feature_id"],
-            user_id=c["user_id"],
-            user_name=author.get("name") or author.get("company_name") or "Anonymous",
-            user_role=author.get("role"),
-            content=c["content"],
-            created_at=c.get("created_at", ""),
-        ))
-    return results
+    return [_comment_response(c) for c in comments]
 
 
 @router.post("/{feature_id}/comments", response_model=FeatureCommentResponse, status_code=201)
@@ -203,15 +231,7 @@ async def add_comment(feature_id: str, req: FeatureCommentCreate, user: dict = D
         "feature_id": feature_id,
         "user_id": user["id"],
         "content": req.content,
+        **author_fields(user),
     })
-
-    author = get_user_by_id(user["id"]) or {}
-    return FeatureCommentResponse(
-        id=c["id"],
-        feature_id=feature_id,
-        user_id=user["id"],
-        user_name=author.get("name") or author.get("company_name") or "Anonymous",
-        user_role=author.get("role"),
-        content=c["content"],
-        created_at=c.get("created_at", ""),
-    )
+    feature_board.add_comment(feature_id)
+    return _comment_response(c)
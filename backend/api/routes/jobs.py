@@ -1,12 +1,17 @@
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from api.core.config import require_user, get_current_user
+from api.core.http_cache import ITEM_CACHE, LIST_CACHE, conditional, make_etag
+from api.services.jobs_api import MAX_PAGES
 from api.core.database import (
     get_user_by_id,
     get_job_by_id,
+    get_job_company_name,
+    get_job_company_names,
     search_jobs,
     create_job,
     update_job,
@@ -17,6 +22,7 @@ from api.core.database import (
     get_applications_by_seeker,
     create_application,
     update_application_status,
+    get_table_version,
 )
 from api.models.schemas import (
     JobCreate,
@@ -29,16 +35,19 @@ from api.models.schemas import (
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
+# Ingestion bookkeeping: never in a response, so not part of a job's version
+# (the jobs updated_at trigger ignores them too, see migration 015)
+_UNVERSIONED_FIELDS = ("last_seen_at", "expires_at")
 
-def _format_job(job: dict) -> JobResponse:
-    company = get_user_by_id(job.get("company_id", "")) or {}
+
+def _format_job(job: dict, company_name: Optional[str] = None) -> JobResponse:
     salary_display = None
     if job.get("salary_min") and job.get("salary_max"):
         salary_display = f"${job['salary_min']//1000}k–${job['salary_max']//1000}k"
     return JobResponse(
         id=job["id"],
-        company_id=job.get("company_id", ""),
-        company_name=company.get("company_name", "Unknown"),
+        company_id=job.get("company_id") or "",
+        company_name=company_name or get_job_company_name(job),
         title=job["title"],
         location=job.get("location", ""),
         salary_min=job.get("salary_min"),
@@ -52,6 +61,8 @@ def _format_job(job: dict) -> JobResponse:
         experience_level=job.get("experience_level"),
         status=job.get("status", "active"),
         applicant_count=job.get("applicant_count", 0),
+        source=job.get("source") or "hireflow",
+        apply_link=job.get("apply_link"),
         created_at=job.get("created_at", ""),
     )
 
@@ -59,14 +70,29 @@ def _format_job(job: dict) -> JobResponse:
 # ── List / Search Jobs ───────────────────────────────────
 @router.get("", response_model=list[JobResponse])
 async def list_jobs(
+    request: Request,
+    response: Response,
     search: str = Query(None, description="Search title, skills, or company"),
     remote_only: bool = Query(False),
     job_type: str = Query(None),
+    source: str = Query(None, description="'hireflow' or 'jsearch' (ingested external postings)"),
     limit: int = Query(50, ge=1, le=100),
 ):
     """List all active jobs with optional filtering."""
-    jobs = search_jobs(search=search, remote_only=remote_only, job_type=job_type, limit=limit)
-    return [_format_job(j) for j in jobs]
+    newest, count = get_table_version("jobs", status="active")
+    # Native jobs show their employer's name from users, so companies version the listing too
+    companies_newest, companies = get_table_version("users", role="company")
+    etag = make_etag("jobs", newest, count, companies_newest, companies, sorted(request.query_params.multi_items()))
+    not_modified = conditional(
+        request, response, etag,
+        last_modified=max(filter(None, (newest, companies_newest)), default=None),
+        cache_control=LIST_CACHE,
+    )
+    if not_modified:
+        return not_modified
+    jobs = search_jobs(search=search, remote_only=remote_only, job_type=job_type, source=source, limit=limit)
+    names = get_job_company_names(jobs)
+    return [_format_job(j, names[j["id"]]) for j in jobs]
 
 
 # ── External Job Search (JSearch API) ────────────────────
@@ -75,18 +101,23 @@ async def search_external_jobs(
     query: str = Query("software engineer", description="Job search query"),
     location: str = Query("", description="Location filter"),
     remote_only: bool = Query(False),
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, description="First page to fetch"),
+    pages: int = Query(1, ge=1, le=MAX_PAGES, description="Consecutive pages to fetch and merge"),
     user=Depends(get_current_user),
 ):
-    """Search real job postings from JSearch and optionally match against user profile."""
-    from api.services.jobs_api import search_jsearch
+    """Search real job postings from JSearch and optionally match against user profile.
+
+    Multiple pages are fetched concurrently and merged without duplicate
+    postings; seekers get them ranked by match score.
+    """
+    from api.services.jobs_api import search_jsearch_pages
     from api.core.config import RAPIDAPI_KEY
 
     if not RAPIDAPI_KEY:
         raise HTTPException(400, "External job search not configured. Set RAPIDAPI_KEY env var.")
 
     try:
-        jobs = await search_jsearch(query, location, remote_only, page, api_key=RAPIDAPI_KEY)
+        jobs = await search_jsearch_pages(query, location, remote_only, page, pages, api_key=RAPIDAPI_KEY)
     except ValueError as e:
         raise HTTPException(401, str(e))
     except Exception as e:
@@ -110,8 +141,9 @@ async def search_external_jobs(
                 job["match_reasons"] = match_result["match_reasons"]
                 job["matched_required"] = match_result["matched_required"]
                 job["matched_nice"] = match_result["matched_nice"]
+            jobs.sort(key=lambda j: j["match_score"], reverse=True)
 
-    return {"jobs": jobs, "count": len(jobs)}
+    return {"jobs": jobs, "count": len(jobs), "next_page": page + pages}
 
 
 # ── My Applications (Seeker) — must be before /{job_id} ──
@@ -132,12 +164,20 @@ async def my_applications(user: dict = Depends(require_user)):
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str):
+async def get_job(job_id: str, request: Request, response: Response):
     """Get a single job by ID."""
     job = get_job_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return _format_job(job)
+    # The row plus the employer's current name is the version
+    company_name = get_job_company_name(job)
+    version = {k: v for k, v in job.items() if k not in _UNVERSIONED_FIELDS}
+    not_modified = conditional(
+        request, response, make_etag("job", version, company_name),
+        last_modified=job.get("updated_at") or job.get("created_at"),
+        cache_control=ITEM_CACHE,
+    )
+    return not_modified or _format_job(job, company_name)
 
 
 # ── Create / Manage Jobs (Company) ────────────────────────
@@ -172,12 +212,21 @@ async def update_job_endpoint(job_id: str, req: JobCreate, user: dict = Depends(
     return _format_job({**job, **updated})
 
 
+def _require_hireflow_job(job: dict) -> None:
+    """Ingested external postings are applied to (and closed) at their source."""
+    source = job.get("source") or "hireflow"
+    if source != "hireflow":
+        where = job.get("apply_link") or "the employer's site"
+        raise HTTPException(status_code=400, detail=f"External {source} posting: apply at {where} (apply_link)")
+
+
 @router.delete("/{job_id}", response_model=SuccessResponse)
 async def close_job_endpoint(job_id: str, user: dict = Depends(require_user)):
     """Close a job posting."""
     job = get_job_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    _require_hireflow_job(job)
     if job.get("company_id") != user["id"]:
         raise HTTPException(status_code=403, detail="Not your job posting")
     close_job(job_id)
@@ -191,6 +240,7 @@ async def apply_to_job(job_id: str, req: ApplicationCreate, user: dict = Depends
     job = get_job_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    _require_hireflow_job(job)
     if job.get("status") != "active":
         raise HTTPException(status_code=400, detail="Job is no longer accepting applications")
 
@@ -226,6 +276,7 @@ async def get_job_applications(job_id: str, user: dict = Depends(require_user)):
     job = get_job_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    _require_hireflow_job(job)
 
     apps = get_applications_by_job(job_id)
     return [
@@ -7,25 +7,35 @@ Resume & Cover Letter vs Job Description matching powered by LLM.
 from __future__ import annotations
 
 import asyncio
+from contextlib import aclosing
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from api.core.config import require_user
+from api.core.sse import SSE_HEADERS, format_event
+from api.services.fanout import MAX_BATCH_SIZE, batch_limiter
+from api.services.rate_limit import RateLimited, llm_user
 from api.core.database import (
     get_user_by_id,
     get_job_by_id,
+    get_jobs_by_ids,
     create_matcher_analysis,
     get_matcher_analyses_by_seeker,
     get_matcher_analysis_by_id,
+    update_matcher_analysis,
 )
 from api.models.schemas import (
     MatcherRequest,
+    MatcherBatchRequest,
     MatcherResponse,
     MatcherAnalysis,
     MatcherHistoryItem,
+    TaskAccepted,
 )
+from api.routes.tasks import accept_task
 
 router = APIRouter(prefix="/api/matcher", tags=["Matcher"])
 
@@ -77,56 +87,43 @@ def _job_to_jd_text(job: dict) -> str:
     return "\n".join(parts)
 
 
-def _resolve_inputs(req: MatcherRequest, user: dict) -> tuple[str, str]:
-    """Resolve resume text and JD text from the request sources."""
-    # Resume
+def _resolve_resume(req: MatcherRequest | MatcherBatchRequest, user: dict) -> str:
+    """Resolve resume text from the request's resume source."""
     if req.resume_source == "profile":
         u = get_user_by_id(user["id"])
         if not u or not u.get("skills"):
             raise HTTPException(400, "Complete your profile first to use saved profile as resume source.")
-        resume_text = _profile_to_resume_text(u)
-    else:
-        if not req.resume_text or not req.resume_text.strip():
-            raise HTTPException(400, "resume_text is required when resume_source is 'upload'.")
-        resume_text = req.resume_text
+        return _profile_to_resume_text(u)
+    if not req.resume_text or not req.resume_text.strip():
+        raise HTTPException(400, "resume_text is required when resume_source is 'upload'.")
+    return req.resume_text
 
-    # JD
+
+def _resolve_jd(req: MatcherRequest) -> tuple[str, dict | None]:
+    """Resolve JD text from the request's JD source, plus the job for internal JDs."""
     if req.jd_source == "internal":
         if not req.job_id:
             raise HTTPException(400, "job_id is required when jd_source is 'internal'.")
         job = get_job_by_id(req.job_id)
         if not job:
             raise HTTPException(404, "Job not found.")
-        jd_text = _job_to_jd_text(job)
-    else:
-        if not req.jd_text or not req.jd_text.strip():
-            raise HTTPException(400, "jd_text is required when jd_source is 'external'.")
-        jd_text = req.jd_text
-
-    return resume_text, jd_text
-
+        return _job_to_jd_text(job), job
+    if not req.jd_text or not req.jd_text.strip():
+        raise HTTPException(400, "jd_text is required when jd_source is 'external'.")
+    return req.jd_text, None
 
-# ── Endpoints ────────────────────────────────────────────
-@router.post("/analyze", response_model=MatcherResponse)
-async def analyze_match(req: MatcherRequest, user: dict = Depends(require_user)):
-    """Analyze how well a resume and optional cover letter match a job description."""
-    if req.mode not in ("analyze",):
-        raise HTTPException(400, "Use mode 'analyze' for this endpoint.")
 
-    resume_text, jd_text = _resolve_inputs(req, user)
+def _resolve_inputs(req: MatcherRequest, user: dict) -> tuple[str, str]:
+    """Resolve resume text and JD text from the request sources."""
+    resume_text = _resolve_resume(req, user)
+    jd_text, _ = _resolve_jd(req)
+    return resume_text, jd_text
 
-    from api.services.llm import analyze_match as llm_analyze
-    try:
-        result = await asyncio.to_thread(
-            llm_analyze, resume_text, jd_text, req.cover_letter
-        )
-    except RuntimeError as e:
-        raise HTTPException(503, str(e))
-    except Exception:
-        raise HTTPException(502, "AI analysis failed. Please try again.")
 
+def _save_analysis(req: MatcherRequest, user: dict, resume_text: str, jd_text: str, result: dict) -> str:
+    """Persist a matcher_analyses row and return its id."""
     analysis_id = f"ma_{uuid4().hex[:12]}"
-    row = {
+    create_matcher_analysis({
         "id": analysis_id,
         "seeker_id": user["id"],
         "mode": req.mode,
@@ -134,19 +131,200 @@ async def analyze_match(req: MatcherRequest, user: dict = Depends(require_user))
         "job_id": req.job_id if req.jd_source == "internal" else None,
         "jd_text": jd_text[:8000],
         "resume_snapshot": resume_text[:8000],
-        "result": {**result, "generated_cover_letter": None},
-    }
-    create_matcher_analysis(row)
+        "result": result,
+    })
+    return analysis_id
+
+
+# ── Endpoints ────────────────────────────────────────────
+async def _refine_analysis(
+    analysis_id: str,
+    user_id: str,
+    resume_text: str,
+    jd_text: str,
+    cover_letter: str | None,
+    local: dict,
+    use_cache: bool,
+    prompt=None,
+) -> None:
+    """Background step: replace the local estimate with the LLM analysis."""
+    from api.services.llm import analyze_match as llm_analyze
+    llm_user.set(user_id)
+    try:
+        result = await llm_analyze(resume_text, jd_text, cover_letter, use_cache=use_cache, prompt=prompt)
+    except RateLimited as e:
+        failed = {"error": str(e), "retry_after": e.retry_after}
+    except RuntimeError as e:
+        failed = {"error": str(e)}
+    except Exception:
+        failed = {"error": "AI analysis failed. Please try again."}
+    else:
+        update_matcher_analysis(analysis_id, {"result": {
+            **result, "source": "llm", "status": "complete", "generated_cover_letter": None,
+        }})
+        return
+    update_matcher_analysis(analysis_id, {"result": {
+        **local, **failed, "status": "failed", "generated_cover_letter": None,
+    }})
+
+
+@router.post("/analyze", response_model=MatcherResponse)
+async def analyze_match(
+    req: MatcherRequest,
+    background_tasks: BackgroundTasks,
+    instant: bool = Query(False, description="Return a local estimate at once and refine it in the background"),
+    user: dict = Depends(require_user),
+):
+    """Analyze how well a resume and optional cover letter match a job description.
+
+    Waits for the LLM analysis by default. With ``instant=true`` it returns
+    at once: a cached LLM analysis comes back ``complete``, otherwise a
+    local keyword-based estimate comes back ``pending`` while the LLM
+    analysis runs in the background. Poll ``GET /history/{id}`` until the
+    status is ``complete`` (or ``failed``, in which case the estimate stands).
+    """
+    if req.mode not in ("analyze",):
+        raise HTTPException(400, "Use mode 'analyze' for this endpoint.")
+
+    resume_text = _resolve_resume(req, user)
+    jd_text, job = _resolve_jd(req)
+    llm_user.set(user["id"])
+
+    from api.services.ai import local_match_analysis
+    from api.services.llm import analyze_match as llm_analyze, analyze_prompt, cached_analysis, is_configured
+
+    prompt = None
+    if not instant:
+        try:
+            result = await llm_analyze(resume_text, jd_text, req.cover_letter, use_cache=not req.refresh)
+        except RateLimited:
+            raise
+        except RuntimeError as e:
+            raise HTTPException(503, str(e))
+        except Exception:
+            raise HTTPException(502, "AI analysis failed. Please try again.")
+        result, status = {**result, "source": "llm"}, "complete"
+    else:
+        # Compacted once here; the cache lookup and the refine step share it
+        prompt = analyze_prompt(resume_text, jd_text, req.cover_letter) if is_configured() else None
+        cached = None if req.refresh else await cached_analysis(resume_text, jd_text, req.cover_letter, prompt=prompt)
+        if cached is not None:
+            result, status = {**cached, "source": "llm"}, "complete"
+        else:
+            result = {**local_match_analysis(resume_text, jd_text, job=job), "source": "local"}
+            # Without a provider the local estimate is the final answer
+            status = "pending" if is_configured() else "complete"
+
+    analysis_id = _save_analysis(
+        req, user, resume_text, jd_text, {**result, "status": status, "generated_cover_letter": None}
+    )
+    if status == "pending":
+        background_tasks.add_task(
+            _refine_analysis, analysis_id, user["id"], resume_text, jd_text,
+            req.cover_letter, result, not req.refresh, prompt,
+        )
 
     return MatcherResponse(
         id=analysis_id,
         mode=req.mode,
         analysis=MatcherAnalysis(**result),
         generated_cover_letter=None,
+        status=status,
         created_at=datetime.now(timezone.utc).isoformat(),
     )
 
 
+@router.post("/analyze/batch")
+async def analyze_batch(
+    req: MatcherBatchRequest,
+    request: Request,
+    user: dict = Depends(require_user),
+):
+    """Analyze one resume against many jobs, streaming results as Server-Sent Events.
+
+    The resume is resolved once and internal jobs are fetched in a single
+    query. Analyses run concurrently under per-user and global limits.
+    Events: ``start`` with the item count, one ``result`` or ``error`` per
+    item in completion order (each carries its request ``index``), then
+    ``done``. Every successful analysis is persisted to history.
+    """
+    total = len(req.job_ids) + len(req.jd_texts)
+    if total == 0:
+        raise HTTPException(400, "Provide at least one job_id or jd_text.")
+    if total > MAX_BATCH_SIZE:
+        raise HTTPException(400, f"A batch can hold at most {MAX_BATCH_SIZE} jobs.")
+    if any(not t or not t.strip() for t in req.jd_texts):
+        raise HTTPException(400, "jd_texts entries must not be empty.")
+
+    resume_text = _resolve_resume(req, user)
+    jobs = get_jobs_by_ids(req.job_ids)
+    llm_user.set(user["id"])
+
+    # (index, per-item request, jd_text or None when the job is missing)
+    items: list[tuple[int, MatcherRequest, str | None]] = []
+    common = {
+        "mode": "analyze", "resume_source": req.resume_source,
+        "cover_letter": req.cover_letter, "refresh": req.refresh,
+    }
+    for job_id in req.job_ids:
+        job = jobs.get(job_id)
+        item_req = MatcherRequest(**common, jd_source="internal", job_id=job_id)
+        items.append((len(items), item_req, _job_to_jd_text(job) if job else None))
+    for jd_text in req.jd_texts:
+        item_req = MatcherRequest(**common, jd_source="external")
+        items.append((len(items), item_req, jd_text))
+
+    from api.services.llm import analyze_match as llm_analyze
+
+    async def run_one(index: int, item_req: MatcherRequest, jd_text: str | None) -> tuple[str, dict]:
+        ref = {"index": index, "job_id": item_req.job_id}
+        if jd_text is None:
+            return "error", {**ref, "status": 404, "detail": "Job not found."}
+        try:
+            async with batch_limiter.slot(user["id"]):
+                result = await llm_analyze(resume_text, jd_text, req.cover_letter, use_cache=not req.refresh)
+        except RateLimited as e:
+            return "error", {**ref, "status": 429, "detail": str(e), "retry_after": e.retry_after}
+        except RuntimeError as e:
+            return "error", {**ref, "status": 503, "detail": str(e)}
+        except Exception:
+            return "error", {**ref, "status": 502, "detail": "AI analysis failed. Please try again."}
+
+        analysis_id = _save_analysis(
+            item_req, user, resume_text, jd_text, {**result, "generated_cover_letter": None}
+        )
+        response = MatcherResponse(
+            id=analysis_id,
+            mode=item_req.mode,
+            analysis=MatcherAnalysis(**result),
+            generated_cover_letter=None,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        return "result", {**ref, **response.model_dump(mode="json")}
+
+    async def events():
+        yield format_event("start", {"total": total})
+        tasks = [asyncio.ensure_future(run_one(*item)) for item in items]
+        completed = failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event, data = await next_done
+                if await request.is_disconnected():
+                    return
+                if event == "result":
+                    completed += 1
+                else:
+                    failed += 1
+                yield format_event(event, data)
+        finally:
+            # Client went away (or the stream was closed): stop pending analyses
+            for t in tasks:
+                t.cancel()
+        yield format_event("done", {"completed": completed, "failed": failed})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/generate", response_model=MatcherResponse)
 async def generate_or_improve(req: MatcherRequest, user: dict = Depends(require_user)):
     """Generate or improve a cover letter based on resume and job description."""
@@ -154,19 +332,18 @@ async def generate_or_improve(req: MatcherRequest, user: dict = Depends(require_
         raise HTTPException(400, "Use mode 'generate' or 'improve' for this endpoint.")
 
     resume_text, jd_text = _resolve_inputs(req, user)
+    llm_user.set(user["id"])
 
     from api.services.llm import generate_cover_letter, improve_cover_letter
     try:
         if req.mode == "improve":
             if not req.cover_letter or not req.cover_letter.strip():
                 raise HTTPException(400, "cover_letter is required for 'improve' mode.")
-            cover_text = await asyncio.to_thread(
-                improve_cover_letter, resume_text, jd_text, req.cover_letter
-            )
+            cover_text = await improve_cover_letter(resume_text, jd_text, req.cover_letter)
         else:
-            cover_text = await asyncio.to_thread(
-                generate_cover_letter, resume_text, jd_text
-            )
+            cover_text = await generate_cover_letter(resume_text, jd_text)
+    except RateLimited:
+        raise
     except RuntimeError as e:
         raise HTTPException(503, str(e))
     except HTTPException:
@@ -174,18 +351,9 @@ async def generate_or_improve(req: MatcherRequest, user: dict = Depends(require_
     except Exception:
         raise HTTPException(502, "AI generation failed. Please try again.")
 
-    analysis_id = f"ma_{uuid4().hex[:12]}"
-    row = {
-        "id": analysis_id,
-        "seeker_id": user["id"],
-        "mode": req.mode,
-        "jd_source": req.jd_source,
-        "job_id": req.job_id if req.jd_source == "internal" else None,
-        "jd_text": jd_text[:8000],
-        "resume_snapshot": resume_text[:8000],
-        "result": {"generated_cover_letter": cover_text},
-    }
-    create_matcher_analysis(row)
+    analysis_id = _save_analysis(
+        req, user, resume_text, jd_text, {"generated_cover_letter": cover_text}
+    )
 
     return MatcherResponse(
         id=analysis_id,
@@ -196,6 +364,113 @@ async def generate_or_improve(req: MatcherRequest, user: dict = Depends(require_
     )
 
 
+@router.post("/generate/stream")
+async def generate_or_improve_stream(
+    req: MatcherRequest,
+    request: Request,
+    user: dict = Depends(require_user),
+):
+    """Stream a generated or improved cover letter as Server-Sent Events.
+
+    Events: ``start`` once the request is accepted, ``token`` per text
+    delta, then ``done`` with the persisted MatcherResponse, or ``error``.
+    A client disconnect closes the upstream provider stream.
+    """
+    if req.mode not in ("generate", "improve"):
+        raise HTTPException(400, "Use mode 'generate' or 'improve' for this endpoint.")
+    if req.mode == "improve" and (not req.cover_letter or not req.cover_letter.strip()):
+        raise HTTPException(400, "cover_letter is required for 'improve' mode.")
+
+    resume_text, jd_text = _resolve_inputs(req, user)
+    llm_user.set(user["id"])
+
+    from api.services.llm import stream_cover_letter
+
+    async def events():
+        yield format_event("start", {"mode": req.mode})
+        parts: list[str] = []
+        existing = req.cover_letter if req.mode == "improve" else None
+        try:
+            async with aclosing(stream_cover_letter(resume_text, jd_text, existing)) as deltas:
+                async for delta in deltas:
+                    if await request.is_disconnected():
+                        return
+                    parts.append(delta)
+                    yield format_event("token", {"text": delta})
+        except RateLimited as e:
+            yield format_event("error", {"status": 429, "detail": str(e), "retry_after": e.retry_after})
+            return
+        except RuntimeError as e:
+            yield format_event("error", {"status": 503, "detail": str(e)})
+            return
+        except Exception:
+            yield format_event("error", {"status": 502, "detail": "AI generation failed. Please try again."})
+            return
+
+        cover_text = "".join(parts).strip()
+        analysis_id = _save_analysis(
+            req, user, resume_text, jd_text, {"generated_cover_letter": cover_text}
+        )
+        done = MatcherResponse(
+            id=analysis_id,
+            mode=req.mode,
+            analysis=None,
+            generated_cover_letter=cover_text,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+        yield format_event("done", done.model_dump(mode="json"))
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _enqueue_matcher(
+    req: MatcherRequest,
+    user: dict,
+    response: Response,
+    background_tasks: BackgroundTasks,
+) -> TaskAccepted:
+    resume_text, jd_text = _resolve_inputs(req, user)
+    return accept_task("matcher.run", {
+        "analysis_id": f"ma_{uuid4().hex[:12]}",
+        "seeker_id": user["id"],
+        "mode": req.mode,
+        "jd_source": req.jd_source,
+        "job_id": req.job_id if req.jd_source == "internal" else None,
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "cover_letter": req.cover_letter,
+        "use_cache": not req.refresh,
+    }, user, response, background_tasks)
+
+
+@router.post("/analyze/async", response_model=TaskAccepted, status_code=202)
+async def analyze_match_async(
+    req: MatcherRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(require_user),
+):
+    """Queue an LLM analysis and return 202. Poll ``status_url`` for the MatcherResponse."""
+    if req.mode not in ("analyze",):
+        raise HTTPException(400, "Use mode 'analyze' for this endpoint.")
+    return _enqueue_matcher(req, user, response, background_tasks)
+
+
+@router.post("/generate/async", response_model=TaskAccepted, status_code=202)
+async def generate_or_improve_async(
+    req: MatcherRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(require_user),
+):
+    """Queue cover letter generation or improvement and return 202."""
+    if req.mode not in ("generate", "improve"):
+        raise HTTPException(400, "Use mode 'generate' or 'improve' for this endpoint.")
+    if req.mode == "improve" and (not req.cover_letter or not req.cover_letter.strip()):
+        raise HTTPException(400, "cover_letter is required for 'improve' mode.")
+    return _enqueue_matcher(req, user, response, background_tasks)
+
+
 @router.get("/history", response_model=list[MatcherHistoryItem])
 async def get_history(
     user: dict = Depends(require_user),
@@ -216,6 +491,7 @@ async def get_history(
             mode=r["mode"],
             job_title=job_title,
             overall_score=result.get("overall_score"),
+            status=result.get("status", "complete"),
             created_at=r.get("created_at", ""),
         ))
     return items
@@ -244,6 +520,7 @@ async def get_analysis(analysis_id: str, user: dict = Depends(require_user)):
             keyword_misses=result.get("keyword_misses", []),
             cover_letter_score=result.get("cover_letter_score"),
             cover_letter_feedback=result.get("cover_letter_feedback"),
+            source=result.get("source", "llm"),
         )
 
     return MatcherResponse(
@@ -251,5 +528,6 @@ async def get_analysis(analysis_id: str, user: dict = Depends(require_user)):
         mode=row["mode"],
         analysis=analysis,
         generated_cover_letter=generated_cl,
+        status=result.get("status", "complete"),
         created_at=row.get("created_at", ""),
     )
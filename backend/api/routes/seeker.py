@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from api.core.config import require_user
 from api.core.database import (
     get_user_by_id,
+    get_job_company_name,
     update_user,
     get_active_jobs,
     get_applications_by_seeker,
@@ -73,7 +74,7 @@ def _build_match_response(job: dict, match: dict, company_name: str) -> JobMatch
 
     return JobMatchResponse(
         id=job["id"],
-        company_id=job.get("company_id", ""),
+        company_id=job.get("company_id") or "",
         company_name=company_name,
         title=job["title"],
         location=job.get("location", ""),
@@ -88,6 +89,8 @@ def _build_match_response(job: dict, match: dict, company_name: str) -> JobMatch
         experience_level=job.get("experience_level"),
         status=job.get("status", "active"),
         applicant_count=job.get("applicant_count", 0),
+        source=job.get("source") or "hireflow",
+        apply_link=job.get("apply_link"),
         created_at=job.get("created_at", ""),
         match_score=match["match_score"],
         matched_required=match["matched_required"],
@@ -172,8 +175,7 @@ def _match_jobs_against_profile(user_skills, desired_roles, work_prefs, salary_r
         match = compute_job_match(user_skills, desired_roles, work_prefs, salary_range, exp_level, job)
         if match["match_score"] < min_score:
             continue
-        company = get_user_by_id(job.get("company_id", "")) or {}
-        results.append(_build_match_response(job, match, company.get("company_name", "Unknown")))
+        results.append(_build_match_response(job, match, get_job_company_name(job)))
 
     results.sort(key=lambda x: x.match_score, reverse=True)
     return results[:limit]
@@ -221,8 +223,7 @@ async def get_seeker_analytics(user: dict = Depends(require_user)):
             u.get("work_preferences", []), u.get("salary_range"),
             u.get("experience_level"), job,
         )
-        company = get_user_by_id(job.get("company_id", "")) or {}
-        scores.append({"company": company.get("company_name", "Unknown"), "score": match["match_score"]})
+        scores.append({"company": get_job_company_name(job), "score": match["match_score"]})
 
     avg_score = sum(s["score"] for s in scores) / max(len(scores), 1)
 
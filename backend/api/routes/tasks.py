@@ -0,0 +1,52 @@
+"""
+HireFlow Task Routes
+====================
+Status polling for background tasks enqueued by the ``/async`` endpoints.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+
+from api.core.config import require_user
+from api.models.schemas import TaskAccepted, TaskResponse
+from api.services import task_handlers  # noqa: F401 — registers task handlers
+from api.services import task_queue
+
+router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
+
+
+def accept_task(
+    kind: str,
+    payload: dict,
+    user: dict,
+    response: Response,
+    background_tasks: BackgroundTasks,
+) -> TaskAccepted:
+    """Enqueue a task and describe it for a 202 response."""
+    task = task_queue.enqueue(kind, payload, owner_id=user["id"])
+    if task_queue.INLINE:
+        background_tasks.add_task(task_queue.drain)
+    status_url = f"{router.prefix}/{task['id']}"
+    response.headers["Location"] = status_url
+    return TaskAccepted(task_id=task["id"], status=task["status"], status_url=status_url)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task_status(task_id: str, user: dict = Depends(require_user)):
+    """Poll a background task. ``result`` is set once status is ``succeeded``."""
+    task = task_queue.get_task(task_id)
+    if not task:
+        raise HTTPException(404, "Task not found.")
+    if task.get("owner_id") != user["id"]:
+        raise HTTPException(403, "Access denied.")
+    return TaskResponse(
+        id=task["id"],
+        kind=task["kind"],
+        status=task["status"],
+        attempts=task.get("attempts", 0),
+        result=task.get("result") if task["status"] == "succeeded" else None,
+        error=task.get("last_error"),
+        created_at=task.get("created_at", ""),
+        updated_at=task.get("updated_at", ""),
+    )
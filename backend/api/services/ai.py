@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import hashlib
 import io
+import os
 import re
 from datetime import datetime
 from typing import Optional
@@ -16,6 +17,8 @@ from typing import Optional
 import PyPDF2
 import docx
 
+from api.services.skills import find_skills
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  MATCHING ENGINE
@@ -114,6 +117,70 @@ def compute_job_match(
     }
 
 
+_NICE_TO_HAVE_RE = re.compile(r"^.*\b(?:nice to have|preferred|bonus points?)\b.*$", re.IGNORECASE | re.MULTILINE)
+_YEARS_RE = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)", re.IGNORECASE)
+
+
+def local_match_analysis(resume_text: str, jd_text: str, job: Optional[dict] = None) -> dict:
+    """
+    Deterministic resume-vs-JD analysis used as an instant first answer
+    while the LLM analysis runs. Same shape as llm.analyze_match.
+
+    Skills come from the taxonomy. For internal jobs the posting's
+    required/nice skills are used; for pasted JDs, skills mentioned after
+    a "nice to have"/"preferred" line count as nice-to-have.
+    """
+    resume_skills = find_skills(resume_text)
+    if job and (job.get("required_skills") or job.get("nice_skills")):
+        required = list(job.get("required_skills", []))
+        nice = [s for s in job.get("nice_skills", []) if s not in required]
+        title = job.get("title", "")
+        experience_level = job.get("experience_level")
+    else:
+        m = _NICE_TO_HAVE_RE.search(jd_text)
+        head, tail = (jd_text[:m.start()], jd_text[m.start():]) if m else (jd_text, "")
+        required = find_skills(head)
+        nice = [s for s in find_skills(tail) if s not in required]
+        title = next((l.strip() for l in jd_text.splitlines() if l.strip()), "")
+        experience_level = None
+
+    resume_lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+    match = compute_job_match(
+        user_skills=resume_skills,
+        desired_roles=resume_lines[1:2],  # headline, as rendered from profiles
+        work_preferences=[],
+        salary_range=None,
+        experience_level=experience_level,
+        job={"id": "", "title": title, "required_skills": required, "nice_skills": nice},
+    )
+
+    jd_skills = required + nice
+    resume_lower = {s.lower() for s in resume_skills}
+    matches = [s for s in jd_skills if s.lower() in resume_lower]
+    misses = [s for s in jd_skills if s.lower() not in resume_lower]
+    gaps = [f"No mention of {s}" for s in misses if s in required]
+
+    years = [int(y) for y in _YEARS_RE.findall(jd_text)]
+    if years and not _YEARS_RE.search(resume_text):
+        gaps.append(f"Role asks for {max(years)}+ years of experience; resume doesn't state years")
+
+    if jd_skills:
+        summary = f"Quick estimate: your resume covers {len(matches)} of {len(jd_skills)} skills in this job description."
+    else:
+        summary = "Quick estimate: no recognised skills found in this job description."
+
+    return {
+        "overall_score": match["match_score"] if jd_skills else 0,
+        "summary": summary,
+        "strengths": match["match_reasons"],
+        "gaps": gaps,
+        "keyword_matches": matches,
+        "keyword_misses": misses,
+        "cover_letter_score": None,
+        "cover_letter_feedback": None,
+    }
+
+
 def compute_candidate_match(candidate: dict, job: dict) -> int:
     """Compute match score for a candidate against a specific job (recruiter/company view)."""
     result = compute_job_match(
@@ -131,44 +198,61 @@ def compute_candidate_match(candidate: dict, job: dict) -> int:
 #  RESUME PARSER
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-# Skill taxonomy derived from frontend SKILL_CATEGORIES
-_SKILL_TAXONOMY = [
-    # Frontend
-    "React", "Vue.js", "Angular", "TypeScript", "JavaScript", "HTML/CSS",
-    "Next.js", "Tailwind CSS", "Redux", "Svelte",
-    # Backend
-    "Node.js", "Python", "Java", "Go", "Ruby", "PHP", "C#", ".NET", "Rust", "Elixir",
-    # Data & AI
-    "Machine Learning", "TensorFlow", "PyTorch", "Data Analysis", "SQL", "Pandas",
-    "NLP", "Computer Vision", "Deep Learning", "MLOps",
-    # Cloud & DevOps
-    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "CI/CD",
-    "Linux", "Nginx", "Jenkins",
-    # Design
-    "Figma", "UX Research", "UI Design", "Design Systems", "Prototyping",
-    "Adobe XD", "Sketch", "Accessibility", "Motion Design", "Branding",
-    # Management
-    "Agile/Scrum", "Product Strategy", "Stakeholder Mgmt", "Roadmapping",
-    "Team Leadership", "Budgeting", "OKRs", "Hiring", "Mentoring", "Cross-functional",
-    # Common extras
-    "GraphQL", "MongoDB", "Redis", "PostgreSQL", "Express", "Django", "FastAPI",
-    "Flask", "Spring", "Kafka", "Git", "GitHub", "Jira", "NumPy",
-    "Elasticsearch", "RabbitMQ",
+# PDF extraction limits. Resumes past a few pages are usually portfolios or
+# publication lists, so the tail is capped and read only when needed.
+_PDF_MAX_PAGES = int(os.environ.get("RESUME_PDF_MAX_PAGES", "6"))
+# Leading pages that must all be textless before the PDF is treated as scanned
+_PDF_SCAN_PROBE_PAGES = int(os.environ.get("RESUME_PDF_SCAN_PROBE_PAGES", "2"))
+
+# Section headings the fast path looks for before it stops reading pages
+_CORE_SECTION_PATTERNS = [
+    re.compile(r"^\s*(?:skills|technical skills|core competencies)\b", re.IGNORECASE | re.MULTILINE),
+    re.compile(r"^\s*(?:experience|work history|employment)\b", re.IGNORECASE | re.MULTILINE),
+    re.compile(r"^\s*(?:education|academic background)\b", re.IGNORECASE | re.MULTILINE),
 ]
+_CONTACT_RE = re.compile(
+    r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+|\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}"
+)
+
+
+def _has_core_sections(text: str) -> bool:
+    """True once contact details and the skills/experience/education sections are present."""
+    if not _CONTACT_RE.search(text):
+        return False
+    return all(p.search(text) for p in _CORE_SECTION_PATTERNS)
+
+
+def _extract_pdf_text(content: bytes, max_pages: Optional[int] = None) -> str:
+    """
+    Extract text from a PDF, reading at most ``max_pages`` pages.
 
-# Build a lowercase-to-canonical mapping for fast lookups
-_SKILL_LOWER_MAP: dict[str, str] = {s.lower(): s for s in _SKILL_TAXONOMY}
+    Extraction stops as soon as the contact, skills, experience and
+    education sections have all been seen. If the leading pages carry no
+    text at all the PDF is treated as scanned and abandoned (there is no
+    OCR step).
+    """
+    max_pages = _PDF_MAX_PAGES if max_pages is None else max_pages
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    total = min(len(reader.pages), max(max_pages, 1))
+    probe = max(_PDF_SCAN_PROBE_PAGES, 1)
+
+    texts: list[str] = []
+    for i in range(total):
+        texts.append(reader.pages[i].extract_text() or "")
+        if _has_core_sections("\n".join(texts)):
+            break
+        if i + 1 == probe and not any(t.strip() for t in texts):
+            return ""
+    return "\n".join(texts)
 
 
-def _extract_text(filename: str, content: bytes) -> str:
+def _extract_text(filename: str, content: bytes, max_pages: Optional[int] = None) -> str:
     """Extract plain text from PDF, DOCX, or DOC bytes."""
     ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
 
     if ext == "pdf":
         try:
-            reader = PyPDF2.PdfReader(io.BytesIO(content))
-            pages = [page.extract_text() or "" for page in reader.pages]
-            return "\n".join(pages)
+            return _extract_pdf_text(content, max_pages)
         except Exception:
             return ""
 
@@ -254,27 +338,7 @@ def _parse_structured_data(text: str) -> dict:
         location = loc_match.group(0)
 
     # ── Skills — taxonomy matching across full text ───────
-    text_lower = text.lower()
-    found_skills: list[str] = []
-    for skill_lower, canonical in _SKILL_LOWER_MAP.items():
-        # Use word-boundary aware search
-        pattern = r"(?<![a-zA-Z0-9])" + re.escape(skill_lower) + r"(?![a-zA-Z0-9])"
-        if re.search(pattern, text_lower):
-            found_skills.append(canonical)
-
-    # Also extract from an explicit "Skills:" section
-    skills_section_match = re.search(
-        r"(?:skills|technical skills|core competencies)[:\s]*\n?(.*?)(?:\n\n|\Z)",
-        text,
-        re.IGNORECASE | re.DOTALL,
-    )
-    if skills_section_match:
-        section_text = skills_section_match.group(1).lower()
-        for skill_lower, canonical in _SKILL_LOWER_MAP.items():
-            if canonical not in found_skills:
-                pattern = r"(?<![a-zA-Z0-9])" + re.escape(skill_lower) + r"(?![a-zA-Z0-9])"
-                if re.search(pattern, section_text):
-                    found_skills.append(canonical)
+    found_skills: list[str] = find_skills(text)
 
     # ── Experience ────────────────────────────────────────
     experience: list[dict] = []
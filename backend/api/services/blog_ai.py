@@ -55,14 +55,14 @@ def compute_reading_time(markdown_text: str) -> int:
     return max(1, round(words / 238))
 
 
-def enrich_post(title: str, body_markdown: str, category: str) -> dict:
+async def enrich_post(title: str, body_markdown: str, category: str) -> dict:
     """AI-enrich a blog post with SEO metadata, excerpt, and related skills."""
     prompt = (
         f"TITLE: {title}\n"
         f"CATEGORY: {category}\n\n"
         f"CONTENT:\n{body_markdown[:6000]}"
     )
-    raw = _call_llm(_ENRICH_SYSTEM, prompt, json_mode=True)
+    raw = await _call_llm(_ENRICH_SYSTEM, prompt, json_mode=True, prompt_type="enrich")
     result = _parse_json_response(raw)
 
     return {
@@ -76,7 +76,7 @@ def enrich_post(title: str, body_markdown: str, category: str) -> dict:
     }
 
 
-def suggest_topics(job_data: list[dict]) -> dict:
+async def suggest_topics(job_data: list[dict]) -> dict:
     """Suggest blog topics based on active job listings and skill demand."""
     # Summarize job data for the prompt
     skill_counts: dict[str, int] = {}
@@ -97,11 +97,11 @@ def suggest_topics(job_data: list[dict]) -> dict:
         + f"\n\nTotal active jobs: {len(job_data)}"
         + "\n\nSuggest 5 blog post ideas that would attract seekers with these in-demand skills."
     )
-    raw = _call_llm(_SUGGEST_SYSTEM, prompt, json_mode=True)
+    raw = await _call_llm(_SUGGEST_SYSTEM, prompt, json_mode=True, prompt_type="suggest")
     return _parse_json_response(raw)
 
 
-def generate_draft(title: str, category: str) -> str:
-    """Generate an AI first-draft for a blog post."""
+async def generate_draft(title: str, category: str) -> str:
+    """Generate an AI first-draft for a blog post (never cached)."""
     prompt = f"TITLE: {title}\nCATEGORY: {category}\n\nWrite the blog post."
-    return _call_llm(_DRAFT_SYSTEM, prompt, json_mode=False)
+    return await _call_llm(_DRAFT_SYSTEM, prompt, json_mode=False, use_cache=False, prompt_type="draft")
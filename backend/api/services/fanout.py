@@ -0,0 +1,60 @@
+"""
+Bounded fan-out for batch LLM work.
+
+A batch request can ask for many analyses at once. ``FanoutLimiter``
+caps how many run concurrently per user and across the process, so one
+large batch cannot monopolise the provider connection pool or starve
+other seekers' requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+_GLOBAL_LIMIT = int(os.environ.get("MATCHER_BATCH_CONCURRENCY", "8"))
+_USER_LIMIT = int(os.environ.get("MATCHER_BATCH_USER_CONCURRENCY", "3"))
+MAX_BATCH_SIZE = int(os.environ.get("MATCHER_BATCH_MAX_ITEMS", "25"))
+
+
+class FanoutLimiter:
+    """Per-user and global concurrency caps, rebuilt per event loop."""
+
+    def __init__(self, global_limit: int, per_user_limit: int):
+        self.global_limit = max(1, global_limit)
+        self.per_user_limit = max(1, per_user_limit)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._users: dict[str, tuple[asyncio.Semaphore, int]] = {}
+
+    def _bind(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.global_limit)
+            self._users = {}
+
+    @asynccontextmanager
+    async def slot(self, user_id: str) -> AsyncIterator[None]:
+        """Hold one per-user slot, then one global slot, for the block."""
+        self._bind()
+        sem, holders = self._users.get(user_id) or (asyncio.Semaphore(self.per_user_limit), 0)
+        self._users[user_id] = (sem, holders + 1)
+        try:
+            async with sem:
+                async with self._global:
+                    yield
+        finally:
+            sem, holders = self._users[user_id]
+            if holders <= 1:
+                del self._users[user_id]
+            else:
+                self._users[user_id] = (sem, holders - 1)
+
+    def active_users(self) -> int:
+        return len(self._users)
+
+
+batch_limiter = FanoutLimiter(_GLOBAL_LIMIT, _USER_LIMIT)
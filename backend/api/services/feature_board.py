@@ -0,0 +1,203 @@
+"""
+HireFlow Feature Board Cache
+============================
+The public feature board is read far more often than it changes, so each
+(category, status, role, sort) view is ranked once and kept in memory.
+Writes made through this instance (new features, votes, status changes,
+comments) patch the cached boards in place instead of invalidating them;
+the TTL bounds how long writes made on other instances go unseen.
+Each voter's ``user_has_voted`` set is cached separately, under the same
+TTL, and overlaid on the shared board, so anonymous views never touch the
+database. A load that overlapped a write is returned but not cached, since
+it may predate the write.
+Configured via environment variables:
+  FEATURE_BOARD_TTL        = <seconds a ranked board is served, default 60; 0 disables>
+  FEATURE_BOARD_SIZE       = <features ranked per board, default 100>
+  FEATURE_BOARD_MAX_VOTERS = <per-user vote sets kept (LRU), default 5000>
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from api.models.schemas import FeatureRequestResponse
+
+_TTL = float(os.environ.get("FEATURE_BOARD_TTL", "60"))
+_SIZE = int(os.environ.get("FEATURE_BOARD_SIZE", "100"))
+_MAX_VOTERS = int(os.environ.get("FEATURE_BOARD_MAX_VOTERS", "5000"))
+
+
+class BoardKey(NamedTuple):
+    category: Optional[str]
+    status: Optional[str]
+    role: Optional[str]
+    sort: str
+
+    @classmethod
+    def of(cls, category=None, status=None, role=None, sort="votes") -> "BoardKey":
+        # The database sorts by votes for anything but "newest"
+        return cls(category or None, status or None, role or None, "newest" if sort == "newest" else "votes")
+
+    def matches(self, f: FeatureRequestResponse) -> bool:
+        return (
+            (self.category is None or f.category == self.category)
+            and (self.status is None or f.status == self.status)
+            and (self.role is None or f.user_role == self.role)
+        )
+
+    def rank(self, f: FeatureRequestResponse) -> tuple:
+        """Descending sort key; created_at and id break ties like the query does."""
+        if self.sort == "newest":
+            return (f.created_at, f.id)
+        return (f.vote_count, f.created_at, f.id)
+
+
+class _Board:
+    def __init__(self, key: BoardKey, items: list[FeatureRequestResponse], size: int):
+        self.key = key
+        self.items = items
+        # Fewer rows than asked for means the board holds every match
+        self.complete = len(items) < size
+        self.loaded_at = time.monotonic()
+
+
+class _Votes:
+    def __init__(self, feature_ids: set[str]):
+        self.feature_ids = feature_ids
+        self.loaded_at = time.monotonic()
+
+
+class FeatureBoardCache:
+    """Ranked boards plus per-user vote sets, patched in place on writes."""
+
+    def __init__(self, ttl: float = _TTL, size: int = _SIZE, max_voters: int = _MAX_VOTERS):
+        self.ttl = ttl
+        self.size = size
+        self.max_voters = max_voters
+        self._boards: dict[BoardKey, _Board] = {}
+        self._votes: OrderedDict[str, _Votes] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every write; a load that saw it change is not cached
+        self._generation = 0
+        self.hits = self.misses = self.patches = self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at < self.ttl
+
+    # ── Boards ────────────────────────────────────────────
+    def board(
+        self,
+        key: BoardKey,
+        load: Callable[[BoardKey, int], list[FeatureRequestResponse]],
+    ) -> list[FeatureRequestResponse]:
+        """The ranked board for ``key``, loading up to ``size`` rows on a miss.
+
+        ``load`` returns the rows ranked, with ``user_has_voted`` unset.
+        """
+        if not self.enabled:
+            return load(key, self.size)
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None and self._fresh(board.loaded_at):
+                self.hits += 1
+                return list(board.items)
+            self.misses += 1
+            generation = self._generation
+        items = load(key, self.size)
+        with self._lock:
+            if generation == self._generation:
+                self._boards[key] = _Board(key, list(items), self.size)
+        return items
+
+    def apply(self, feature: FeatureRequestResponse) -> None:
+        """Place a new or changed feature on every cached board it belongs to."""
+        feature = feature.model_copy(update={"user_has_voted": False})
+        with self._lock:
+            self._generation += 1
+            for key, board in list(self._boards.items()):
+                if not self._apply(board, feature):
+                    del self._boards[key]
+                    self.invalidations += 1
+            self.patches += 1
+
+    def _apply(self, board: _Board, feature: FeatureRequestResponse) -> bool:
+        """Patch one board. False when it can no longer be trusted and must reload."""
+        key = board.key
+        was_on = any(f.id == feature.id for f in board.items)
+        items = [f for f in board.items if f.id != feature.id]
+        if key.matches(feature):
+            items.append(feature)
+            items.sort(key=key.rank, reverse=True)
+        if not board.complete:
+            # A truncated board cannot tell what ranks just below its last row
+            if was_on and (len(items) < self.size or items[-1].id == feature.id):
+                return False
+            items = items[: self.size]
+        board.items = items
+        return True
+
+    def add_comment(self, feature_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for board in self._boards.values():
+                board.items = [
+                    f.model_copy(update={"comment_count": f.comment_count + 1}) if f.id == feature_id else f
+                    for f in board.items
+                ]
+            self.patches += 1
+
+    # ── Per-user votes ────────────────────────────────────
+    def user_votes(self, user_id: str, load: Callable[[str], set[str]]) -> set[str]:
+        if not self.enabled:
+            return load(user_id)
+        with self._lock:
+            votes = self._votes.get(user_id)
+            if votes is not None and self._fresh(votes.loaded_at):
+                self._votes.move_to_end(user_id)
+                return set(votes.feature_ids)
+            generation = self._generation
+        feature_ids = load(user_id)
+        with self._lock:
+            if generation == self._generation:
+                self._votes[user_id] = _Votes(set(feature_ids))
+                self._votes.move_to_end(user_id)
+                while len(self._votes) > self.max_voters:
+                    self._votes.popitem(last=False)
+        return feature_ids
+
+    def record_vote(self, user_id: str, feature_id: str, voted: bool) -> None:
+        with self._lock:
+            self._generation += 1
+            votes = self._votes.get(user_id)
+            if votes is not None:
+                (votes.feature_ids.add if voted else votes.feature_ids.discard)(feature_id)
+
+    # ── Housekeeping ──────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "boards": len(self._boards),
+                "voters": len(self._votes),
+                "hits": self.hits,
+                "misses": self.misses,
+                "patches": self.patches,
+                "invalidations": self.invalidations,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._boards.clear()
+            self._votes.clear()
+            self._generation += 1
+            self.hits = self.misses = self.patches = self.invalidations = 0
+
+
+feature_board = FeatureBoardCache()
@@ -0,0 +1,172 @@
+"""
+HireFlow External Job Ingestion
+===============================
+Pulls configured JSearch queries through ``search_jsearch_pages`` and
+stores the postings in the jobs table (source="jsearch"), so external jobs
+are listed, searched and matched from the local database. Run it with
+``python -m tools.ingest_jobs``. Configured via environment variables:
+  JOB_INGEST_CONFIG     = <JSON file: [{"query", "location", "remote_only", "pages"}, ...]>
+  JOB_INGEST_TTL_HOURS  = <hours a posting stays active after it was last seen, default 72>
+  JOB_INGEST_CONCURRENCY = <queries fetched at once, default 2>
+
+Each run writes only new or changed postings (compared by content hash),
+refreshes last_seen_at/expires_at on unchanged ones in one batched update
+per chunk, and closes postings that have not been seen within the TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from api.core.database import expire_jobs, get_job_hashes, touch_jobs, upsert_jobs
+from api.services.jobs_api import dedupe_jobs, search_jsearch_pages
+
+logger = logging.getLogger(__name__)
+
+SOURCE = "jsearch"
+_TTL_HOURS = float(os.environ.get("JOB_INGEST_TTL_HOURS", "72"))
+_CONCURRENCY = int(os.environ.get("JOB_INGEST_CONCURRENCY", "2"))
+_CONFIG_PATH = os.environ.get("JOB_INGEST_CONFIG", "")
+
+# JSearch job_employment_type → jobs.type
+_EMPLOYMENT_TYPES = {
+    "FULLTIME": "full-time",
+    "PARTTIME": "part-time",
+    "CONTRACTOR": "contract",
+    "INTERN": "internship",
+}
+
+# Fields that make a posting "changed" when they differ
+_CONTENT_FIELDS = (
+    "title", "company_name", "company_logo", "location", "remote", "type", "description",
+    "salary_min", "salary_max", "required_skills", "nice_skills", "experience_level",
+    "apply_link", "posted_at",
+)
+
+
+@dataclass(frozen=True)
+class IngestQuery:
+    query: str
+    location: str = ""
+    remote_only: bool = False
+    pages: int = 1
+
+
+DEFAULT_QUERIES = [
+    IngestQuery("software engineer", pages=3),
+    IngestQuery("frontend developer", pages=2),
+    IngestQuery("data scientist", pages=2),
+    IngestQuery("product designer", pages=2),
+    IngestQuery("software engineer", remote_only=True, pages=2),
+]
+
+
+def load_queries(path: str = _CONFIG_PATH) -> list[IngestQuery]:
+    if not path:
+        return list(DEFAULT_QUERIES)
+    with open(path) as f:
+        return [IngestQuery(**q) for q in json.load(f)]
+
+
+def external_job_id(external_id: str) -> str:
+    """Stable jobs.id for a JSearch posting, so re-ingesting updates in place."""
+    return f"js_{hashlib.sha256(external_id.encode()).hexdigest()[:16]}"
+
+
+def content_hash(row: dict) -> str:
+    payload = json.dumps({k: row.get(k) for k in _CONTENT_FIELDS}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def to_job_row(job: dict, now: datetime, ttl_hours: float = _TTL_HOURS) -> dict:
+    """Map a ``_transform_job`` result onto a jobs table row."""
+    row = {
+        "id": external_job_id(job["id"]),
+        "company_id": None,
+        "company_name": job.get("company") or None,
+        "company_logo": job.get("company_logo"),
+        "title": job.get("title") or "Untitled",
+        "location": job.get("location") or "",
+        "remote": bool(job.get("remote")),
+        "type": _EMPLOYMENT_TYPES.get((job.get("employment_type") or "").upper(), "full-time"),
+        "description": job.get("description") or "",
+        "salary_min": int(job["salary_min"]) if job.get("salary_min") else None,
+        "salary_max": int(job["salary_max"]) if job.get("salary_max") else None,
+        "required_skills": job.get("required_skills") or [],
+        "nice_skills": job.get("nice_skills") or [],
+        "experience_level": job.get("experience_level") or None,
+        "apply_link": job.get("apply_link") or None,
+        "posted_at": job.get("posted_at") or None,
+        "status": "active",
+        "source": SOURCE,
+        "external_id": job["id"],
+    }
+    row["content_hash"] = content_hash(row)
+    row["last_seen_at"] = now.isoformat()
+    row["expires_at"] = (now + timedelta(hours=ttl_hours)).isoformat()
+    return row
+
+
+async def fetch_postings(queries: list[IngestQuery], api_key: str, concurrency: int = _CONCURRENCY) -> tuple[list[dict], list[str]]:
+    """Run every query; returns (deduplicated postings, error messages)."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def run(q: IngestQuery) -> list[dict]:
+        async with sem:
+            # Bypass the search cache: a cached page would re-store old postings
+            return await search_jsearch_pages(
+                q.query, q.location, q.remote_only, 1, q.pages, api_key=api_key, fresh=True,
+            )
+
+    results = await asyncio.gather(*(run(q) for q in queries), return_exceptions=True)
+    postings, errors = [], []
+    for q, r in zip(queries, results):
+        if isinstance(r, BaseException):
+            errors.append(f"{q.query!r} in {q.location or 'anywhere'}: {r}")
+        else:
+            postings.extend(r)
+    return dedupe_jobs([p for p in postings if p.get("id")]), errors
+
+
+async def ingest(
+    queries: list[IngestQuery],
+    api_key: str,
+    now: Optional[datetime] = None,
+    ttl_hours: float = _TTL_HOURS,
+) -> dict:
+    """One ingestion pass. Returns counts for logging."""
+    now = now or datetime.now(timezone.utc)
+    postings, errors = await fetch_postings(queries, api_key)
+    rows = [to_job_row(p, now, ttl_hours) for p in postings]
+
+    stored = get_job_hashes([r["id"] for r in rows])
+    changed = [r for r in rows if stored.get(r["id"]) != r["content_hash"]]
+    unchanged = [r["id"] for r in rows if stored.get(r["id"]) == r["content_hash"]]
+
+    upsert_jobs(changed)
+    if unchanged:
+        touch_jobs(unchanged, {
+            "last_seen_at": now.isoformat(),
+            "expires_at": (now + timedelta(hours=ttl_hours)).isoformat(),
+            "status": "active",
+        })
+    # Only expire after a clean run; a failed query must not close its postings
+    expired = 0 if errors else expire_jobs(SOURCE, now.isoformat())
+
+    for err in errors:
+        logger.warning("Job ingestion query failed: %s", err)
+    return {
+        "fetched": len(postings),
+        "inserted": sum(1 for r in changed if r["id"] not in stored),
+        "updated": sum(1 for r in changed if r["id"] in stored),
+        "unchanged": len(unchanged),
+        "expired": expired,
+        "errors": errors,
+    }
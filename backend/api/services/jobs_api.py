@@ -2,13 +2,193 @@
 JSearch API client for fetching real job postings from RapidAPI.
 Transforms external data to HireFlow's internal job schema so the
 existing compute_job_match() scoring works unchanged.
+
+Searches go through one pooled HTTP/2 keep-alive client and a TTL cache
+with stale-while-revalidate. Configured via environment variables:
+  JSEARCH_CACHE_TTL         = <seconds a result is served as fresh, default 900; 0 disables>
+  JSEARCH_CACHE_STALE       = <further seconds a result is served while it is
+                               refreshed in the background, default 3600>
+  JSEARCH_CACHE_MAX_ENTRIES = <LRU bound, default 500>
+  JSEARCH_TIMEOUT           = <request timeout in seconds, default 15>
+  JSEARCH_MAX_CONNECTIONS   = <connection pool size, default 20>
+  JSEARCH_PAGE_CONCURRENCY  = <pages fetched at once by search_jsearch_pages, default 3>
+  JSEARCH_MAX_PAGES         = <most pages one search_jsearch_pages call fetches, default 5>
+  JSEARCH_HEDGE             = "0" to disable hedged requests (default: enabled)
+  JSEARCH_HEDGE_MIN_SAMPLES = <latencies observed before hedging starts, default 20>
+  JSEARCH_HEDGE_FLOOR_MS    = <never hedge sooner than this, default 250>
 """
 
-import httpx
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
 from typing import Optional
 
+import httpx
+
+from api.services.singleflight import SingleFlight
+from api.services.skills import find_skills
+
+logger = logging.getLogger(__name__)
+
 JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
 
+_CACHE_TTL = float(os.environ.get("JSEARCH_CACHE_TTL", "900"))
+_CACHE_STALE = float(os.environ.get("JSEARCH_CACHE_STALE", "3600"))
+_CACHE_MAX_ENTRIES = int(os.environ.get("JSEARCH_CACHE_MAX_ENTRIES", "500"))
+_TIMEOUT = float(os.environ.get("JSEARCH_TIMEOUT", "15"))
+_MAX_CONNECTIONS = int(os.environ.get("JSEARCH_MAX_CONNECTIONS", "20"))
+_PAGE_CONCURRENCY = int(os.environ.get("JSEARCH_PAGE_CONCURRENCY", "3"))
+MAX_PAGES = int(os.environ.get("JSEARCH_MAX_PAGES", "5"))
+_HEDGE = os.environ.get("JSEARCH_HEDGE", "1") == "1"
+_HEDGE_MIN_SAMPLES = int(os.environ.get("JSEARCH_HEDGE_MIN_SAMPLES", "20"))
+_HEDGE_FLOOR_MS = float(os.environ.get("JSEARCH_HEDGE_FLOOR_MS", "250"))
+
+_inflight = SingleFlight("jsearch")
+
+
+# ── Pooled client ─────────────────────────────────────────
+# Reused across requests so DNS/TLS setup is paid once per connection.
+# Bound to the event loop that created it, like the LLM provider clients.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_retiring: set[asyncio.Task] = set()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception:
+        # Transports bound to a closed loop may fail to shut down cleanly
+        logger.debug("Closing a retired JSearch client failed", exc_info=True)
+
+
+def _retire_client() -> None:
+    """Close a client left behind by another event loop instead of leaking its pool."""
+    if _client is None:
+        return
+    if _client_loop is not None and _client_loop.is_running() and not _client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(_close_quietly(_client), _client_loop)
+    else:
+        # Its loop is gone; close from this one so the sockets are released
+        task = asyncio.get_running_loop().create_task(_close_quietly(_client))
+        _retiring.add(task)
+        task.add_done_callback(_retiring.discard)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _retire_client()
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+            headers={"X-RapidAPI-Host": "jsearch.p.rapidapi.com"},
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    """Close the pooled JSearch client (called on app shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+# ── Response cache ────────────────────────────────────────
+class SearchCache:
+    """LRU of search results, invalidated by age only.
+
+    ``get`` returns (jobs, fresh): fresh entries are younger than ``ttl``;
+    stale ones are up to ``stale`` seconds older and should be refreshed.
+    """
+
+    def __init__(self, ttl: float = _CACHE_TTL, stale: float = _CACHE_STALE, max_entries: int = _CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str) -> tuple[Optional[list[dict]], bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.time() - entry[0] if entry else None
+            if entry is None or age >= self.ttl + self.stale:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1], True
+            self.stale_hits += 1
+            return entry[1], False
+
+    def set(self, key: str, jobs: list[dict]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), jobs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.stale_hits = self.misses = self.refreshes = 0
+
+
+search_cache = SearchCache()
+_refreshing: set[asyncio.Task] = set()
+
+
+def _normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _search_key(query: str, location: str, remote_only: bool, page: int, num_pages: int, api_key: str) -> str:
+    key_id = hashlib.sha256(api_key.encode()).hexdigest()[:8]
+    return "|".join([
+        _normalize_query(query), _normalize_query(location),
+        "1" if remote_only else "0", str(page), str(num_pages), key_id,
+    ])
+
 
 async def search_jsearch(
     query: str,
@@ -17,12 +197,109 @@ async def search_jsearch(
     page: int = 1,
     num_pages: int = 1,
     api_key: str = "",
+    fresh: bool = False,
+) -> list[dict]:
+    """Fetch jobs from JSearch API and transform to internal schema.
+
+    Results are cached per normalized (query, location, remote_only, page).
+    A stale entry is returned immediately while one background request
+    refreshes it. Identical concurrent misses share a single upstream
+    request. ``fresh`` skips the cache lookup (the result still refreshes
+    the cache), for callers such as ingestion that need current postings.
+    """
+    key = _search_key(query, location, remote_only, page, num_pages, api_key)
+
+    async def fetch() -> list[dict]:
+        jobs = await _fetch_jsearch(query, location, remote_only, page, num_pages, api_key)
+        if search_cache.enabled:
+            search_cache.set(key, jobs)
+        return jobs
+
+    if fresh:
+        jobs, current = None, False
+    else:
+        jobs, current = search_cache.get(key) if search_cache.enabled else (None, False)
+    if jobs is None:
+        jobs = await _inflight.do(key, fetch)
+    elif not current and not _inflight.in_flight(key):
+        search_cache.refreshes += 1
+        task = asyncio.ensure_future(_inflight.do(key, fetch))
+        _refreshing.add(task)
+        task.add_done_callback(_refresh_done)
+    # Callers annotate jobs with per-user match data, so each gets its own dicts
+    return [dict(j) for j in jobs]
+
+
+async def search_jsearch_pages(
+    query: str,
+    location: str = "",
+    remote_only: bool = False,
+    start_page: int = 1,
+    pages: int = 1,
+    api_key: str = "",
+    fresh: bool = False,
+) -> list[dict]:
+    """Fetch ``pages`` consecutive pages concurrently and merge them.
+
+    Each page goes through search_jsearch (and its cache, unless
+    ``fresh``). Postings are
+    deduplicated across pages by job id and by normalized
+    title + employer + location, keeping page order. A failed page is
+    skipped unless every page failed.
+    """
+    pages = max(1, min(pages, MAX_PAGES))
+    sem = asyncio.Semaphore(_PAGE_CONCURRENCY)
+
+    async def one(page: int) -> list[dict]:
+        async with sem:
+            return await search_jsearch(query, location, remote_only, page, api_key=api_key, fresh=fresh)
+
+    results = await asyncio.gather(
+        *(one(p) for p in range(start_page, start_page + pages)), return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if len(errors) == len(results):
+        raise errors[0]
+    for err in errors:
+        logger.warning("JSearch page fetch failed: %s", err)
+    return dedupe_jobs([job for r in results if not isinstance(r, BaseException) for job in r])
+
+
+def _posting_key(job: dict) -> str:
+    return "|".join(_normalize_query(job.get(k) or "") for k in ("title", "company", "location"))
+
+
+def dedupe_jobs(jobs: list[dict]) -> list[dict]:
+    """Drop repeated postings (same id, or same title/employer/location)."""
+    seen_ids: set[str] = set()
+    seen_postings: set[str] = set()
+    unique = []
+    for job in jobs:
+        posting = _posting_key(job)
+        if (job.get("id") and job["id"] in seen_ids) or posting in seen_postings:
+            continue
+        if job.get("id"):
+            seen_ids.add(job["id"])
+        seen_postings.add(posting)
+        unique.append(job)
+    return unique
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _refreshing.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # Keep serving the stale entry; the next stale hit retries
+        logger.warning("JSearch background refresh failed: %s", task.exception())
+
+
+async def _fetch_jsearch(
+    query: str,
+    location: str,
+    remote_only: bool,
+    page: int,
+    num_pages: int,
+    api_key: str,
 ) -> list[dict]:
-    """Fetch jobs from JSearch API and transform to internal schema."""
-    headers = {
-        "X-RapidAPI-Key": api_key,
-        "X-RapidAPI-Host": "jsearch.p.rapidapi.com",
-    }
     params: dict[str, str] = {
         "query": query,
         "page": str(page),
@@ -33,16 +310,100 @@ async def search_jsearch(
     if remote_only:
         params["remote_jobs_only"] = "true"
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.get(JSEARCH_URL, headers=headers, params=params)
-        if resp.status_code == 403:
-            raise ValueError("Invalid or expired RapidAPI key. Check your RAPIDAPI_KEY.")
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await _hedged_get(params, {"X-RapidAPI-Key": api_key})
+    if resp.status_code == 403:
+        raise ValueError("Invalid or expired RapidAPI key. Check your RAPIDAPI_KEY.")
+    resp.raise_for_status()
+    data = resp.json()
 
     return [_transform_job(j) for j in data.get("data", [])]
 
 
+# ── Hedged requests ───────────────────────────────────────
+class _LatencyTracker:
+    """Recent JSearch latencies; the hedge delay is their p95.
+
+    A cancelled attempt contributes its elapsed time at cancellation: a
+    lower bound on its latency, but dropping it would hide exactly the slow
+    tail the hedge exists for and pull the p95 down.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def hedge_after(self) -> Optional[float]:
+        """Seconds to wait before a duplicate request, or None while warming up."""
+        if len(self._samples) < _HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(p95, _HEDGE_FLOOR_MS / 1000)
+
+    def stats(self) -> dict:
+        delay = self.hedge_after()
+        return {
+            "samples": len(self._samples),
+            "hedge_after_ms": round(delay * 1000, 1) if delay is not None else None,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self.hedged = self.hedge_wins = 0
+
+
+latency = _LatencyTracker()
+
+
+async def _hedged_get(params: dict, headers: dict) -> httpx.Response:
+    """GET the search endpoint; if it outlasts the p95, race a duplicate.
+
+    The first successful response wins and the other request is
+    cancelled. Costs at most one extra call for the slowest ~5%.
+    """
+    client = _get_client()
+
+    async def attempt() -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            resp = await client.get(JSEARCH_URL, headers=headers, params=params)
+        except asyncio.CancelledError:
+            latency.observe(time.perf_counter() - started)  # censored: at least this slow
+            raise
+        latency.observe(time.perf_counter() - started)
+        return resp
+
+    delay = latency.hedge_after() if _HEDGE else None
+    primary = asyncio.ensure_future(attempt())
+    tasks = [primary]
+    try:
+        if delay is None:
+            return await primary
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            latency.hedged += 1
+            tasks.append(asyncio.ensure_future(attempt()))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        latency.hedge_wins += 1
+                    return task.result()
+        return primary.result()  # every attempt failed: surface the first error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
 def _transform_job(raw: dict) -> dict:
     """Transform JSearch response to HireFlow internal job schema."""
     return {
@@ -75,73 +436,13 @@ def _build_location(raw: dict) -> str:
     return f"{city}, {state}" if city else "Unknown"
 
 
-# Skills we try to detect in qualification text
-_KNOWN_SKILLS = {
-    "react", "vue", "angular", "typescript", "javascript", "python",
-    "java", "go", "rust", "node.js", "sql", "postgresql", "mongodb",
-    "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-    "figma", "machine learning", "pytorch", "tensorflow", "git",
-    "ci/cd", "graphql", "rest", "html", "css", "tailwind",
-    "next.js", "fastapi", "django", "flask", "spring", "redis",
-    "c#", ".net", "ruby", "php", "kafka", "elasticsearch",
-}
-
-
 def _extract_skills(raw: dict) -> list[str]:
-    """Extract skills from job highlights or qualifications."""
-    skills: list[str] = []
+    """Taxonomy skills in the qualifications and description, first mentioned first.
+
+    Skills that are also everyday words ("Hiring", "Spring") only count
+    when listed under Qualifications, not in the description's prose.
+    """
     highlights = raw.get("job_highlights") or {}
-    quals = highlights.get("Qualifications") or []
-
-    # Also check the description for skills if qualifications are sparse
-    text_sources = list(quals)
-    if len(quals) < 3:
-        desc = raw.get("job_description", "")
-        if desc:
-            text_sources.append(desc)
-
-    for text in text_sources:
-        text_lower = text.lower()
-        for skill in _KNOWN_SKILLS:
-            if skill in text_lower:
-                canonical = skill.title()
-                # Preserve special casing
-                if skill == "aws":
-                    canonical = "AWS"
-                elif skill == "gcp":
-                    canonical = "GCP"
-                elif skill == "sql":
-                    canonical = "SQL"
-                elif skill == "css":
-                    canonical = "CSS"
-                elif skill == "html":
-                    canonical = "HTML"
-                elif skill == "ci/cd":
-                    canonical = "CI/CD"
-                elif skill == "graphql":
-                    canonical = "GraphQL"
-                elif skill == "node.js":
-                    canonical = "Node.js"
-                elif skill == "next.js":
-                    canonical = "Next.js"
-                elif skill == "postgresql":
-                    canonical = "PostgreSQL"
-                elif skill == "mongodb":
-                    canonical = "MongoDB"
-                elif skill == "fastapi":
-                    canonical = "FastAPI"
-                elif skill == "pytorch":
-                    canonical = "PyTorch"
-                elif skill == "tensorflow":
-                    canonical = "TensorFlow"
-                elif skill == "c#":
-                    canonical = "C#"
-                elif skill == ".net":
-                    canonical = ".NET"
-                elif skill == "elasticsearch":
-                    canonical = "Elasticsearch"
-
-                if canonical not in skills:
-                    skills.append(canonical)
-
-    return skills[:10]  # Cap at 10
+    listed = find_skills("\n".join(highlights.get("Qualifications") or []), by_position=True)
+    described = find_skills(raw.get("job_description") or "", by_position=True, prose=True)
+    return list(dict.fromkeys(listed + described))[:10]  # Cap at 10
@@ -2,22 +2,66 @@
 HireFlow LLM Service
 ====================
 Provider-agnostic LLM client. Configured via environment variables:
-  LLM_PROVIDER = "openai" | "anthropic"   (default: "openai")
-  LLM_API_KEY  = <provider api key>
+  LLM_PROVIDER = "openai" | "anthropic" | "fake"   (default: "openai")
+  LLM_API_KEY  = <provider api key; not needed for "fake">
   LLM_MODEL    = <optional model override>
 
-Public surface:
-  analyze_match(resume_text, jd_text, cover_letter) -> dict
+  LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_DB
+               = <response cache, see llm_cache.py>
+  LLM_TIMEOUT, LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE, LLM_KEEPALIVE_EXPIRY
+               = <optional connection-pool tuning>
+  LLM_RPM, LLM_TPM, LLM_QUEUE_TIMEOUT, LLM_MAX_QUEUE
+               = <provider quota and admission control, see rate_limit.py>
+  MATCHER_JD_TOKEN_BUDGET, MATCHER_RESUME_TOKEN_BUDGET, MATCHER_COVER_LETTER_TOKEN_BUDGET
+               = <input token budgets, see prompt_compaction.py>
+  LLM_MAX_RETRIES = <retries for transient provider errors, default 2>
+  LLM_RETRY_BASE  = <first retry delay in seconds, doubled per retry, default 0.5>
+  LLM_MAX_RETRY_AFTER = <longest provider Retry-After to wait out before
+                         giving up instead, in seconds, default 20>
+  LLM_TELEMETRY_WINDOW, LLM_TELEMETRY_LOG
+               = <per-call metrics, see llm_telemetry.py>
+
+The "fake" provider answers locally with schema-valid replies for load
+tests and offline benchmarks; it never makes a network call:
+  LLM_FAKE_LATENCY_MS    = <median reply latency, default 800>
+  LLM_FAKE_LATENCY_SIGMA = <log-normal spread of latency; 0 = fixed, default 0.35>
+  LLM_FAKE_TTFT_MS       = <median time to first streamed token, default 250>
+  LLM_FAKE_TOKEN_MS      = <delay between streamed tokens, default 15>
+  LLM_FAKE_ERROR_RATE    = <fraction of calls that fail, default 0>
+  LLM_FAKE_ERRORS        = <comma list drawn from: timeout, 429, 500, malformed>
+  LLM_FAKE_SEED          = <seed for latency and error draws; unset = random>
+
+Public surface (coroutines):
+  analyze_match(resume_text, jd_text, cover_letter, prompt=None) -> dict
+  cached_analysis(resume_text, jd_text, cover_letter, prompt=None) -> dict | None  (no provider call)
+  analyze_prompt(resume_text, jd_text, cover_letter) -> MatcherPrompt  (compact once, pass to both)
   generate_cover_letter(resume_text, jd_text) -> str
   improve_cover_letter(resume_text, jd_text, cover_letter) -> str
+  stream_cover_letter(resume_text, jd_text, cover_letter=None) -> async iterator of str
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
+import random
 import re
-from typing import Optional
+import time
+import zlib
+from contextlib import aclosing
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, NamedTuple, Optional
+
+from api.services.llm_cache import fingerprint, llm_cache
+from api.services.llm_telemetry import LLMCall, telemetry
+from api.services.prompt_compaction import compact_matcher_inputs, count_tokens
+from api.services.rate_limit import admission, estimate_tokens
+from api.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 _PROVIDER = os.environ.get("LLM_PROVIDER", "openai").lower()
@@ -52,55 +96,540 @@ Use the candidate's resume as the source of facts.
 Output only the improved cover letter text. Do not include any JSON, markdown fences, or meta-commentary."""
 
 
-# ── Provider calls ────────────────────────────────────────
-def _call_openai(system: str, user: str, json_mode: bool) -> str:
-    try:
-        import openai
-    except ImportError:
-        raise RuntimeError("Install 'openai' package: pip install openai>=1.0.0")
-
-    client = openai.OpenAI(api_key=_API_KEY)
-    model = _MODEL or "gpt-4o-mini"
-    kwargs = dict(
-        model=model,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
-        temperature=0.3,
+# ── Providers ─────────────────────────────────────────────
+# One async client per provider, created lazily and reused across calls so
+# connections stay alive between requests instead of paying DNS/TLS setup
+# on every call. Clients are bound to the event loop that created them.
+_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "60"))
+_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "200"))
+_MAX_KEEPALIVE = int(os.environ.get("LLM_MAX_KEEPALIVE", "50"))
+_KEEPALIVE_EXPIRY = float(os.environ.get("LLM_KEEPALIVE_EXPIRY", "60"))
+_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+_RETRY_BASE = float(os.environ.get("LLM_RETRY_BASE", "0.5"))
+_MAX_RETRY_AFTER = float(os.environ.get("LLM_MAX_RETRY_AFTER", "20"))
+
+
+def _pooled_http_client(sdk):
+    """Build the SDK's own async httpx client with keep-alive pool limits."""
+    limits_cls = type(sdk.DEFAULT_CONNECTION_LIMITS)
+    return sdk.DefaultAsyncHttpxClient(
+        limits=limits_cls(
+            max_connections=_MAX_CONNECTIONS,
+            max_keepalive_connections=_MAX_KEEPALIVE,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        ),
+        timeout=_TIMEOUT,
     )
-    if json_mode:
-        kwargs["response_format"] = {"type": "json_object"}
-    resp = client.chat.completions.create(**kwargs)
-    return resp.choices[0].message.content.strip()
 
 
-def _call_anthropic(system: str, user: str) -> str:
+_retiring: set[asyncio.Task] = set()
+
+
+async def _close_quietly(client) -> None:
     try:
-        import anthropic
-    except ImportError:
-        raise RuntimeError("Install 'anthropic' package: pip install anthropic>=0.25.0")
-
-    client = anthropic.Anthropic(api_key=_API_KEY)
-    model = _MODEL or "claude-3-5-haiku-20241022"
-    resp = client.messages.create(
-        model=model,
-        max_tokens=2048,
-        system=system,
-        messages=[{"role": "user", "content": user}],
+        await client.close()
+    except Exception:
+        # Transports bound to a closed loop may fail to shut down cleanly
+        logger.debug("Closing a retired LLM client failed", exc_info=True)
+
+
+class _Provider:
+    """Base class for an LLM backend holding one pooled async client."""
+
+    name = ""
+    default_model = ""
+
+    def __init__(self):
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def model(self) -> str:
+        return _MODEL or self.default_model
+
+    def _new_client(self):
+        raise NotImplementedError
+
+    def client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._retire_client()
+            self._client = self._new_client()
+            self._loop = loop
+        return self._client
+
+    def _retire_client(self) -> None:
+        """Close a client left behind by another event loop instead of leaking its pool."""
+        old, old_loop = self._client, self._loop
+        if old is None:
+            return
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(old), old_loop)
+        else:
+            # Its loop is gone; close from this one so the sockets are released
+            task = asyncio.get_running_loop().create_task(_close_quietly(old))
+            _retiring.add(task)
+            task.add_done_callback(_retiring.discard)
+
+    async def complete(self, system: str, user: str, json_mode: bool) -> str:
+        raise NotImplementedError
+
+    async def complete_with_usage(self, system: str, user: str, json_mode: bool) -> tuple[str, Optional[tuple[int, int]]]:
+        """Return the reply and (input, output) token usage, or None if unreported."""
+        return await self.complete(system, user, json_mode), None
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        """Yield text deltas. Providers without streaming yield one chunk."""
+        yield await self.complete(system, user, json_mode=False)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._loop = None
+
+
+class _OpenAIProvider(_Provider):
+    name = "openai"
+    default_model = "gpt-4o-mini"
+
+    def _new_client(self):
+        try:
+            import openai
+        except ImportError:
+            raise RuntimeError("Install 'openai' package: pip install openai>=1.0.0")
+        # Retries happen in _complete_with_retries so each one is counted
+        return openai.AsyncOpenAI(api_key=_API_KEY, http_client=_pooled_http_client(openai), max_retries=0)
+
+    async def complete(self, system: str, user: str, json_mode: bool) -> str:
+        return (await self.complete_with_usage(system, user, json_mode))[0]
+
+    async def complete_with_usage(self, system: str, user: str, json_mode: bool) -> tuple[str, Optional[tuple[int, int]]]:
+        kwargs = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=0.3,
+        )
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        resp = await self.client().chat.completions.create(**kwargs)
+        usage = getattr(resp, "usage", None)
+        tokens = (usage.prompt_tokens, usage.completion_tokens) if usage else None
+        return resp.choices[0].message.content.strip(), tokens
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        stream = await self.client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=0.3,
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+
+class _AnthropicProvider(_Provider):
+    name = "anthropic"
+    default_model = "claude-3-5-haiku-20241022"
+
+    def _new_client(self):
+        try:
+            import anthropic
+        except ImportError:
+            raise RuntimeError("Install 'anthropic' package: pip install anthropic>=0.25.0")
+        return anthropic.AsyncAnthropic(api_key=_API_KEY, http_client=_pooled_http_client(anthropic), max_retries=0)
+
+    async def complete(self, system: str, user: str, json_mode: bool) -> str:
+        return (await self.complete_with_usage(system, user, json_mode))[0]
+
+    async def complete_with_usage(self, system: str, user: str, json_mode: bool) -> tuple[str, Optional[tuple[int, int]]]:
+        resp = await self.client().messages.create(
+            model=self.model,
+            max_tokens=2048,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+        )
+        usage = getattr(resp, "usage", None)
+        tokens = (usage.input_tokens, usage.output_tokens) if usage else None
+        return resp.content[0].text.strip(), tokens
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        async with self.client().messages.stream(
+            model=self.model,
+            max_tokens=2048,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+
+class FakeProviderError(Exception):
+    """An injected provider error carrying an HTTP status like the SDK errors do."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _FakeProvider(_Provider):
+    """Local stand-in for load tests: realistic latency, streaming and failures.
+
+    Replies are derived from the prompt so identical prompts get identical
+    replies (and cache/coalesce like real ones); latency and error draws
+    come from one seeded RNG.
+    """
+
+    name = "fake"
+    default_model = "fake-llm"
+
+    _ERRORS = ("timeout", "429", "500", "malformed")
+
+    def __init__(
+        self,
+        latency_ms: Optional[float] = None,
+        sigma: Optional[float] = None,
+        ttft_ms: Optional[float] = None,
+        token_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        errors: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        super().__init__()
+        env = os.environ.get
+        self.latency_ms = latency_ms if latency_ms is not None else float(env("LLM_FAKE_LATENCY_MS", "800"))
+        self.sigma = sigma if sigma is not None else float(env("LLM_FAKE_LATENCY_SIGMA", "0.35"))
+        self.ttft_ms = ttft_ms if ttft_ms is not None else float(env("LLM_FAKE_TTFT_MS", "250"))
+        self.token_ms = token_ms if token_ms is not None else float(env("LLM_FAKE_TOKEN_MS", "15"))
+        self.error_rate = error_rate if error_rate is not None else float(env("LLM_FAKE_ERROR_RATE", "0"))
+        errors = errors if errors is not None else env("LLM_FAKE_ERRORS", ",".join(self._ERRORS))
+        self.errors = [e.strip() for e in errors.split(",") if e.strip() in self._ERRORS] or ["429"]
+        if seed is None and env("LLM_FAKE_SEED"):
+            seed = int(env("LLM_FAKE_SEED"))
+        self.rng = random.Random(seed)
+
+    def _new_client(self):
+        return None
+
+    def _delay(self, median_ms: float) -> float:
+        if median_ms <= 0:
+            return 0.0
+        return median_ms * self.rng.lognormvariate(0, self.sigma) / 1000 if self.sigma else median_ms / 1000
+
+    def _draw_error(self) -> Optional[str]:
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return self.rng.choice(self.errors)
+        return None
+
+    @staticmethod
+    def _raise(error: str) -> None:
+        if error == "timeout":
+            raise TimeoutError("Fake provider timed out")
+        if error == "429":
+            raise FakeProviderError(429, "Fake provider rate limit exceeded")
+        if error == "500":
+            raise FakeProviderError(500, "Fake provider internal error")
+
+    async def complete_with_usage(self, system: str, user: str, json_mode: bool) -> tuple[str, Optional[tuple[int, int]]]:
+        error = self._draw_error()
+        await asyncio.sleep(self._delay(self.latency_ms))
+        if error and error != "malformed":
+            self._raise(error)
+        reply = _fake_reply(system, user, json_mode)
+        if error == "malformed":
+            reply = reply[: len(reply) // 2]
+        return reply, (count_tokens(system) + count_tokens(user), count_tokens(reply))
+
+    async def complete(self, system: str, user: str, json_mode: bool) -> str:
+        return (await self.complete_with_usage(system, user, json_mode))[0]
+
+    async def stream(self, system: str, user: str) -> AsyncIterator[str]:
+        error = self._draw_error()
+        await asyncio.sleep(self._delay(self.ttft_ms))
+        if error and error != "malformed":
+            self._raise(error)
+        words = re.findall(r"\S+\s*", _fake_reply(system, user, json_mode=False))
+        if error == "malformed":
+            words = words[: len(words) // 2]
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield word
+
+
+def _fake_reply(system: str, user: str, json_mode: bool) -> str:
+    """A schema-valid reply for whichever prompt ``system`` is."""
+    from api.services.ai import find_skills
+
+    digest = zlib.crc32(f"{system}\x00{user}".encode("utf-8"))
+    sections = dict(re.findall(r"^([A-Z][A-Z ]+):\n(.*?)(?=\n\n[A-Z][A-Z ]+:\n|\Z)", user, re.M | re.S))
+    if '"overall_score"' in system:
+        resume_skills = set(find_skills(sections.get("RESUME", "")))
+        jd_skills = find_skills(sections.get("JOB DESCRIPTION", ""))
+        matches = [s for s in jd_skills if s in resume_skills]
+        misses = [s for s in jd_skills if s not in resume_skills]
+        score = round(100 * len(matches) / len(jd_skills)) if jd_skills else 40 + digest % 40
+        has_letter = "COVER LETTER" in sections
+        return json.dumps({
+            "overall_score": score,
+            "summary": f"The candidate matches {len(matches)} of {len(jd_skills)} skills in the job description.",
+            "strengths": [f"Experience with {s}" for s in matches[:5]],
+            "gaps": [f"No evidence of {s}" for s in misses[:5]],
+            "keyword_matches": matches,
+            "keyword_misses": misses,
+            "cover_letter_score": 50 + digest % 45 if has_letter else None,
+            "cover_letter_feedback": "Tie your examples more directly to the role." if has_letter else None,
+        })
+    if '"suggestions"' in system:
+        skills = find_skills(user)[:5] or ["Python"]
+        return json.dumps({"suggestions": [
+            {
+                "title": f"How to Stand Out with {skill} in Today's Job Market",
+                "category": "career-playbook",
+                "rationale": f"{skill} appears in many active listings.",
+                "target_skills": [skill],
+            }
+            for skill in skills
+        ]})
+    if '"excerpt"' in system:
+        title = user.split("\n", 1)[0].removeprefix("TITLE: ").strip()
+        skills = find_skills(sections.get("CONTENT", user))[:6]
+        return json.dumps({
+            "excerpt": f"{title}. A practical guide for job seekers.",
+            "seo_title": title[:60],
+            "seo_description": f"Learn {title.lower()} with practical, actionable advice."[:155],
+            "seo_keywords": [s.lower() for s in skills] or ["careers"],
+            "suggested_tags": ["career-advice", "job-search"],
+            "related_skills": skills,
+        })
+    if json_mode:
+        return "{}"
+    if "blog post" in system:
+        title = user.split("\n", 1)[0].removeprefix("TITLE: ").strip()
+        body = "Hiring teams look for concrete evidence of impact. " * 8
+        return f"## {title}\n\n{body.strip()}\n\n## Key takeaways\n\n- Quantify results\n- Tailor every application\n"
+    skills = find_skills(sections.get("JOB DESCRIPTION", ""))[:3] or ["the core requirements"]
+    return (
+        "Dear Hiring Manager,\n\n"
+        f"I am excited to apply for this role. My experience with {', '.join(skills)} "
+        "maps directly to what your team needs, and I have delivered measurable results "
+        "in similar positions.\n\n"
+        "Thank you for your consideration.\n\nSincerely,\nThe Candidate"
     )
-    return resp.content[0].text.strip()
 
 
-def _call_llm(system: str, user: str, json_mode: bool = False) -> str:
-    if not _API_KEY:
+_PROVIDERS = {
+    "openai": _OpenAIProvider,
+    "anthropic": _AnthropicProvider,
+    "fake": _FakeProvider,
+}
+_provider: Optional[_Provider] = None
+_inflight = SingleFlight("llm")
+
+
+def _get_provider() -> _Provider:
+    global _provider
+    if _provider is None:
+        _provider = _PROVIDERS.get(_PROVIDER, _OpenAIProvider)()
+    return _provider
+
+
+async def close_clients():
+    """Close the pooled provider client (called on app shutdown)."""
+    if _provider is not None:
+        await _provider.aclose()
+
+
+def _require_configured() -> None:
+    if not is_configured():
         raise RuntimeError(
             "LLM_API_KEY environment variable is not set. "
-            "Set it to your OpenAI or Anthropic API key."
+            "Set it to your OpenAI or Anthropic API key, or set LLM_PROVIDER=fake."
         )
-    if _PROVIDER == "anthropic":
-        return _call_anthropic(system, user)
-    return _call_openai(system, user, json_mode)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Timeouts, dropped connections, 408/409/429 and 5xx are worth retrying."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status in (408, 409, 429) or status >= 500
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait (retry-after-ms / Retry-After), if it said."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(float(headers["retry-after-ms"]) / 1000, 0.0)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    when = when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+async def _complete_with_retries(
+    provider: _Provider,
+    system: str,
+    user: str,
+    json_mode: bool,
+    attempt: dict,
+) -> tuple[str, Optional[tuple[int, int]]]:
+    """provider.complete_with_usage with exponential backoff; counts retries in ``attempt``.
+
+    A Retry-After from the provider (typically on 429) replaces the backoff;
+    one longer than LLM_MAX_RETRY_AFTER is not waited out. Every attempt,
+    retries included, is admitted (and charged) separately.
+    """
+    tokens = estimate_tokens(system, user)
+    while True:
+        await admission.acquire(tokens)
+        try:
+            return await provider.complete_with_usage(system, user, json_mode)
+        except Exception as exc:
+            if attempt["retries"] >= _MAX_RETRIES or not _is_retryable(exc):
+                raise
+            delay = _retry_after(exc)
+            if delay is None:
+                delay = _RETRY_BASE * 2 ** attempt["retries"] * (0.5 + random.random() / 2)
+            elif delay > _MAX_RETRY_AFTER:
+                raise
+            attempt["retries"] += 1
+            await asyncio.sleep(delay)
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _call_llm(
+    system: str,
+    user: str,
+    json_mode: bool = False,
+    use_cache: bool = True,
+    prompt_type: str = "other",
+    tokens_saved: int = 0,
+) -> str:
+    _require_configured()
+    provider = _get_provider()
+    started = time.perf_counter()
+    attempt: dict = {"retries": 0}
+
+    def record(**fields) -> None:
+        telemetry.record(LLMCall(
+            prompt_type=prompt_type,
+            provider=provider.name,
+            model=provider.model,
+            latency_ms=_ms_since(started),
+            retries=attempt["retries"],
+            tokens_saved=tokens_saved,
+            **fields,
+        ))
+
+    async def complete() -> str:
+        # Only calls that actually reach the provider count against quota
+        text, usage = await _complete_with_retries(provider, system, user, json_mode, attempt)
+        attempt["usage"] = usage or (count_tokens(system) + count_tokens(user), count_tokens(text))
+        return text
+
+    async def fetch() -> str:
+        text = await complete()
+        if text and llm_cache.enabled:
+            await llm_cache.aset(key, text, provider.name, provider.model)
+        return text
+
+    try:
+        if not use_cache:
+            text = await complete()
+        else:
+            key = fingerprint(provider.name, provider.model, system, user, json_mode)
+            cached = await llm_cache.aget(key) if llm_cache.enabled else None
+            if cached is not None:
+                record(cache_hit=True)
+                return cached
+            # Identical concurrent calls share one upstream request
+            text = await _inflight.do(key, fetch)
+    except Exception as exc:
+        record(error=type(exc).__name__)
+        raise
+
+    if "usage" in attempt:
+        record(input_tokens=attempt["usage"][0], output_tokens=attempt["usage"][1])
+    else:
+        record(coalesced=True)  # another caller's request answered this one
+    return text
+
+
+async def _stream_llm(
+    system: str,
+    user: str,
+    prompt_type: str = "other",
+    tokens_saved: int = 0,
+) -> AsyncIterator[str]:
+    """Streaming variant of _call_llm: yields text deltas as they arrive.
+
+    Closing the generator (e.g. on client disconnect) closes the upstream
+    provider stream. Streamed output is never cached. Token counts are
+    estimated, since streaming responses do not report usage.
+    """
+    _require_configured()
+    provider = _get_provider()
+    started = time.perf_counter()
+    ttft_ms: Optional[float] = None
+    parts: list[str] = []
+    error: Optional[str] = None
+    try:
+        await admission.acquire(estimate_tokens(system, user))
+        async with aclosing(provider.stream(system, user)) as deltas:
+            async for delta in deltas:
+                if ttft_ms is None:
+                    ttft_ms = _ms_since(started)
+                parts.append(delta)
+                yield delta
+    except (GeneratorExit, asyncio.CancelledError):
+        error = "cancelled"
+        raise
+    except Exception as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        telemetry.record(LLMCall(
+            prompt_type=prompt_type,
+            provider=provider.name,
+            model=provider.model,
+            latency_ms=_ms_since(started),
+            ttft_ms=ttft_ms,
+            input_tokens=count_tokens(system) + count_tokens(user),
+            output_tokens=count_tokens("".join(parts)),
+            streamed=True,
+            tokens_saved=tokens_saved,
+            error=error,
+        ))
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the LLM response cache, plus coalesced calls."""
+    return {**llm_cache.stats(), "coalesced": _inflight.stats()["coalesced"]}
 
 
 def _parse_json_response(raw: str) -> dict:
@@ -121,18 +650,59 @@ def _parse_json_response(raw: str) -> dict:
 
 
 # ── Public API ────────────────────────────────────────────
-def analyze_match(
+async def analyze_match(
     resume_text: str,
     jd_text: str,
     cover_letter: Optional[str] = None,
+    use_cache: bool = True,
+    prompt: Optional[MatcherPrompt] = None,
 ) -> dict:
-    """Analyze resume (and optional cover letter) against a job description."""
-    parts = [f"RESUME:\n{resume_text[:4000]}\n\nJOB DESCRIPTION:\n{jd_text[:4000]}"]
-    if cover_letter:
-        parts.append(f"\nCOVER LETTER:\n{cover_letter[:3000]}")
-    prompt = "\n".join(parts)
+    """Analyze resume (and optional cover letter) against a job description.
+
+    Pass ``prompt`` from analyze_prompt() when the caller already built it.
+    """
+    prompt = prompt or analyze_prompt(resume_text, jd_text, cover_letter)
+    raw = await _call_llm(
+        _ANALYZE_SYSTEM, prompt.text, json_mode=True, use_cache=use_cache,
+        prompt_type="analyze", tokens_saved=prompt.tokens_saved,
+    )
+    return _analysis_from_raw(raw)
+
+
+async def cached_analysis(
+    resume_text: str,
+    jd_text: str,
+    cover_letter: Optional[str] = None,
+    prompt: Optional[MatcherPrompt] = None,
+) -> Optional[dict]:
+    """Return a previously cached analyze_match result without calling the provider."""
+    if not is_configured() or not llm_cache.enabled:
+        return None
+    provider = _get_provider()
+    prompt = prompt or analyze_prompt(resume_text, jd_text, cover_letter)
+    raw = await llm_cache.aget(fingerprint(provider.name, provider.model, _ANALYZE_SYSTEM, prompt.text, True))
+    return _analysis_from_raw(raw) if raw is not None else None
+
+
+def is_configured() -> bool:
+    return bool(_API_KEY) or _PROVIDER == "fake"
+
 
-    raw = _call_llm(_ANALYZE_SYSTEM, prompt, json_mode=True)
+class MatcherPrompt(NamedTuple):
+    """A compacted matcher prompt and the input tokens compaction removed."""
+    text: str
+    tokens_saved: int = 0
+
+
+def analyze_prompt(resume_text: str, jd_text: str, cover_letter: Optional[str] = None) -> MatcherPrompt:
+    inputs = compact_matcher_inputs(resume_text, jd_text, cover_letter)
+    parts = [f"RESUME:\n{inputs.resume}\n\nJOB DESCRIPTION:\n{inputs.jd}"]
+    if inputs.cover_letter:
+        parts.append(f"\nCOVER LETTER:\n{inputs.cover_letter}")
+    return MatcherPrompt("\n".join(parts), inputs.tokens_saved)
+
+
+def _analysis_from_raw(raw: str) -> dict:
     result = _parse_json_response(raw)
 
     # Ensure required fields have defaults
@@ -148,21 +718,49 @@ def analyze_match(
     }
 
 
-def generate_cover_letter(resume_text: str, jd_text: str) -> str:
-    """Generate a tailored cover letter from resume and job description."""
-    prompt = f"RESUME:\n{resume_text[:4000]}\n\nJOB DESCRIPTION:\n{jd_text[:4000]}"
-    return _call_llm(_GENERATE_SYSTEM, prompt, json_mode=False)
+def _cover_letter_prompt(resume_text: str, jd_text: str, cover_letter: Optional[str] = None) -> MatcherPrompt:
+    inputs = compact_matcher_inputs(resume_text, jd_text, cover_letter)
+    prompt = f"RESUME:\n{inputs.resume}\n\nJOB DESCRIPTION:\n{inputs.jd}"
+    if inputs.cover_letter:
+        prompt += f"\n\nEXISTING COVER LETTER:\n{inputs.cover_letter}"
+    return MatcherPrompt(prompt, inputs.tokens_saved)
 
 
-def improve_cover_letter(
+async def generate_cover_letter(resume_text: str, jd_text: str, use_cache: bool = False) -> str:
+    """Generate a tailored cover letter from resume and job description.
+
+    Uncached by default: users who regenerate expect a fresh draft.
+    """
+    prompt = _cover_letter_prompt(resume_text, jd_text)
+    return await _call_llm(
+        _GENERATE_SYSTEM, prompt.text, json_mode=False, use_cache=use_cache,
+        prompt_type="generate", tokens_saved=prompt.tokens_saved,
+    )
+
+
+async def improve_cover_letter(
     resume_text: str,
     jd_text: str,
     cover_letter: str,
+    use_cache: bool = False,
 ) -> str:
     """Improve an existing cover letter to better match the job description."""
-    prompt = (
-        f"RESUME:\n{resume_text[:4000]}\n\n"
-        f"JOB DESCRIPTION:\n{jd_text[:4000]}\n\n"
-        f"EXISTING COVER LETTER:\n{cover_letter[:3000]}"
+    prompt = _cover_letter_prompt(resume_text, jd_text, cover_letter)
+    return await _call_llm(
+        _IMPROVE_SYSTEM, prompt.text, json_mode=False, use_cache=use_cache,
+        prompt_type="improve", tokens_saved=prompt.tokens_saved,
     )
-    return _call_llm(_IMPROVE_SYSTEM, prompt, json_mode=False)
+
+
+async def stream_cover_letter(
+    resume_text: str,
+    jd_text: str,
+    cover_letter: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Stream a generated cover letter, or an improved one when ``cover_letter`` is given."""
+    system = _IMPROVE_SYSTEM if cover_letter else _GENERATE_SYSTEM
+    prompt = _cover_letter_prompt(resume_text, jd_text, cover_letter)
+    prompt_type = "improve" if cover_letter else "generate"
+    async with aclosing(_stream_llm(system, prompt.text, prompt_type, prompt.tokens_saved)) as deltas:
+        async for delta in deltas:
+            yield delta
@@ -0,0 +1,161 @@
+"""
+HireFlow LLM Response Cache
+===========================
+Deterministic cache in front of ``_call_llm``. Entries are keyed by a
+fingerprint of provider, model, system prompt version, user prompt and
+json_mode, so a changed prompt template never serves a stale answer.
+
+Configured via environment variables:
+  LLM_CACHE_TTL         = <seconds, default 86400; 0 disables the cache>
+  LLM_CACHE_MAX_ENTRIES = <in-memory LRU bound, default 1024>
+  LLM_CACHE_DB          = "1" to also persist entries in the llm_cache table
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_version(system: str) -> str:
+    """Short, stable version stamp for a system prompt template."""
+    return hashlib.sha256(system.encode("utf-8")).hexdigest()[:12]
+
+
+def fingerprint(provider: str, model: str, system: str, user: str, json_mode: bool) -> str:
+    """Cache key for one LLM call."""
+    h = hashlib.sha256()
+    for part in (provider, model, prompt_version(system), "1" if json_mode else "0", user):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return f"llm_{h.hexdigest()}"
+
+
+class LLMCache:
+    """TTL + LRU bounded in-memory cache with an optional DB tier."""
+
+    def __init__(self, ttl: int, max_entries: int, use_db: bool = False):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.use_db = use_db
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "db_hits": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        return self._db_result(key, self._db_get(key) if self.use_db else None)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """``get`` for the event loop: the DB round-trip runs in a worker thread."""
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        db_value = await asyncio.to_thread(self._db_get, key) if self.use_db else None
+        return self._db_result(key, db_value)
+
+    def set(self, key: str, value: str, provider: str = "", model: str = "") -> None:
+        self._remember(key, value, time.time() + self.ttl)
+        if self.use_db:
+            self._db_set(key, value, provider, model)
+
+    async def aset(self, key: str, value: str, provider: str = "", model: str = "") -> None:
+        """``set`` for the event loop: the DB write runs in a worker thread."""
+        self._remember(key, value, time.time() + self.ttl)
+        if self.use_db:
+            await asyncio.to_thread(self._db_set, key, value, provider, model)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+        return None
+
+    def _db_result(self, key: str, value: Optional[str]) -> Optional[str]:
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["db_hits"] += 1
+        self._remember(key, value, time.time() + self.ttl)
+        return value
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _db_get(self, key: str) -> Optional[str]:
+        from api.core.database import get_llm_cache_entry
+        try:
+            row = get_llm_cache_entry(key)
+        except Exception:
+            logger.warning("llm_cache DB read failed", exc_info=True)
+            return None
+        if not row:
+            return None
+        expires = row.get("expires_at") or ""
+        if expires and expires < datetime.now(timezone.utc).isoformat():
+            return None
+        return row.get("response")
+
+    def _db_set(self, key: str, value: str, provider: str, model: str) -> None:
+        from api.core.database import upsert_llm_cache_entry
+        expires = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        try:
+            upsert_llm_cache_entry({
+                "id": key,
+                "response": value,
+                "provider": provider,
+                "model": model,
+                "expires_at": expires.isoformat(),
+            })
+        except Exception:
+            logger.warning("llm_cache DB write failed", exc_info=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for k in self._stats:
+                self._stats[k] = 0
+
+
+llm_cache = LLMCache(
+    ttl=int(os.environ.get("LLM_CACHE_TTL", "86400")),
+    max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "1024")),
+    use_db=os.environ.get("LLM_CACHE_DB", "") == "1",
+)
@@ -0,0 +1,163 @@
+"""
+HireFlow LLM Telemetry
+======================
+Per-call measurements for every ``_call_llm`` / ``_stream_llm`` call,
+aggregated per prompt type (analyze, generate, improve, enrich, suggest,
+draft). Configured via environment variables:
+  LLM_TELEMETRY_WINDOW  = <recent calls kept per prompt type, default 1000>
+  LLM_TELEMETRY_LOG     = <path of a JSON-lines file to append each call to,
+                           written off the event loop; unset disables the log>
+  LLM_PRICE_INPUT_PER_MTOK, LLM_PRICE_OUTPUT_PER_MTOK
+                        = <USD per million tokens, overriding the built-in
+                           price table for the configured model>
+
+Token counts come from the provider's usage report when available and
+are estimated from the text otherwise. Cache hits and coalesced calls are
+recorded with zero tokens and cost: they never reached the provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_WINDOW = int(os.environ.get("LLM_TELEMETRY_WINDOW", "1000"))
+_LOG_PATH = os.environ.get("LLM_TELEMETRY_LOG", "")
+_PRICE_INPUT = os.environ.get("LLM_PRICE_INPUT_PER_MTOK", "")
+_PRICE_OUTPUT = os.environ.get("LLM_PRICE_OUTPUT_PER_MTOK", "")
+
+# USD per million (input, output) tokens; matched by model-name prefix
+_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+
+def price_per_mtok(model: str) -> tuple[float, float]:
+    if _PRICE_INPUT or _PRICE_OUTPUT:
+        return float(_PRICE_INPUT or 0), float(_PRICE_OUTPUT or 0)
+    for prefix in sorted(_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            return _PRICES[prefix]
+    return 0.0, 0.0
+
+
+@dataclass
+class LLMCall:
+    prompt_type: str
+    provider: str
+    model: str
+    latency_ms: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    ttft_ms: Optional[float] = None  # streaming calls only
+    retries: int = 0
+    tokens_saved: int = 0  # input tokens removed by prompt compaction
+    cache_hit: bool = False
+    coalesced: bool = False
+    streamed: bool = False
+    error: Optional[str] = None
+    cost_usd: float = 0.0
+    ts: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        if not self.cost_usd and (self.input_tokens or self.output_tokens):
+            p_in, p_out = price_per_mtok(self.model)
+            self.cost_usd = round((self.input_tokens * p_in + self.output_tokens * p_out) / 1_000_000, 8)
+
+
+def _percentile(sorted_vals: list[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    idx = min(len(sorted_vals) - 1, max(0, round(p * (len(sorted_vals) - 1))))
+    return round(sorted_vals[idx], 1)
+
+
+class LLMTelemetry:
+    """Rolling per-prompt-type window plus all-time totals."""
+
+    def __init__(self, window: int = _WINDOW, log_path: str = _LOG_PATH):
+        self.window = window
+        self.log_path = log_path
+        self._recent: dict[str, deque[LLMCall]] = {}
+        self._totals: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: LLMCall) -> None:
+        with self._lock:
+            self._recent.setdefault(call.prompt_type, deque(maxlen=self.window)).append(call)
+            t = self._totals.setdefault(call.prompt_type, {
+                "calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0, "retries": 0,
+                "input_tokens": 0, "output_tokens": 0, "tokens_saved": 0, "cost_usd": 0.0,
+            })
+            t["calls"] += 1
+            t["cache_hits"] += call.cache_hit
+            t["coalesced"] += call.coalesced
+            t["errors"] += call.error is not None
+            t["retries"] += call.retries
+            t["input_tokens"] += call.input_tokens
+            t["output_tokens"] += call.output_tokens
+            t["tokens_saved"] += call.tokens_saved
+            t["cost_usd"] += call.cost_usd
+        if self.log_path:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._append_log(call)  # no event loop to block
+            else:
+                loop.run_in_executor(None, self._append_log, call)
+
+    def _append_log(self, call: LLMCall) -> None:
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(asdict(call), separators=(",", ":")) + "\n")
+        except OSError:
+            logger.warning("Could not write LLM telemetry log to %s", self.log_path, exc_info=True)
+
+    def summary(self) -> dict:
+        """Totals plus latency/TTFT percentiles over the recent window, per prompt type."""
+        with self._lock:
+            out = {}
+            for prompt_type, calls in self._recent.items():
+                upstream = [c for c in calls if not c.cache_hit and not c.coalesced and c.error is None]
+                latencies = sorted(c.latency_ms for c in upstream)
+                ttfts = sorted(c.ttft_ms for c in upstream if c.ttft_ms is not None)
+                totals = dict(self._totals[prompt_type])
+                totals["cost_usd"] = round(totals["cost_usd"], 6)
+                out[prompt_type] = {
+                    **totals,
+                    "cache_hit_rate": round(totals["cache_hits"] / totals["calls"], 3) if totals["calls"] else 0.0,
+                    "avg_cost_usd": round(totals["cost_usd"] / totals["calls"], 8) if totals["calls"] else 0.0,
+                    "window": len(calls),
+                    "latency_ms": {p: _percentile(latencies, q) for p, q in (("p50", .5), ("p95", .95), ("p99", .99))},
+                    "ttft_ms": {p: _percentile(ttfts, q) for p, q in (("p50", .5), ("p95", .95), ("p99", .99))},
+                }
+            return out
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            calls = [c for q in self._recent.values() for c in q]
+        calls.sort(key=lambda c: c.ts, reverse=True)
+        return [asdict(c) for c in calls[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+
+telemetry = LLMTelemetry()
@@ -0,0 +1,229 @@
+"""
+HireFlow Prompt Compaction
+==========================
+Fits resumes, job descriptions and cover letters into a token budget
+before they are sent to the LLM. Configured via:
+  MATCHER_JD_TOKEN_BUDGET           (default: 1000)
+  MATCHER_RESUME_TOKEN_BUDGET       (default: 1000)
+  MATCHER_COVER_LETTER_TOKEN_BUDGET (default: 750)
+
+Blind character slicing keeps whatever comes first, which for a typical
+posting is the company pitch, while the requirements at the bottom get
+cut. Compaction instead:
+  1. drops boilerplate (EEO statements, benefits and perks lists),
+  2. drops duplicate lines,
+  3. ranks sections (requirements/skills/experience first, "about us"
+     last) and keeps the highest-priority ones that fit the budget,
+     emitting the survivors in their original order.
+
+Token counts use tiktoken when installed, otherwise ~4 chars per token.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+JD_TOKEN_BUDGET = int(os.environ.get("MATCHER_JD_TOKEN_BUDGET", "1000"))
+RESUME_TOKEN_BUDGET = int(os.environ.get("MATCHER_RESUME_TOKEN_BUDGET", "1000"))
+COVER_LETTER_TOKEN_BUDGET = int(os.environ.get("MATCHER_COVER_LETTER_TOKEN_BUDGET", "750"))
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # not installed, or encoding files unavailable offline
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+# ── Classification ────────────────────────────────────────
+_DROP, _LOW, _MID, _HIGH = 3, 2, 1, 0  # lower value = kept first
+
+_BOILERPLATE_RE = re.compile(
+    r"equal opportunity employer|without regard to (?:race|age|sex)|"
+    r"reasonable accommodation|e-verify|affirmative action|"
+    r"protected veteran|applicants? with disabilit|"
+    r"\b401\s*\(?k\)?|paid time off|\bpto\b|parental leave|"
+    # Coverage only as an offered benefit: a bullet that opens with the plan
+    # list and ends on it, so "medical billing" requirements survive
+    r"^[\s\-*\u2022]*(?:(?:comprehensive|competitive|full|premium)\s+)?"
+    r"(?:health|medical|dental|vision)(?:(?:,|,? and|,? &)\s*(?:health|medical|dental|vision|life))*"
+    r"\s+(?:insurance|coverage|benefits|plans?)(?:\s+for\s+you\b.*)?[.!]?\s*$|"
+    r"commuter benefits|wellness (?:stipend|program)|free (?:lunch|snacks)|"
+    r"references available upon request",
+    re.IGNORECASE,
+)
+
+# Heading keyword -> priority. First match wins, so order matters.
+_JD_SECTIONS = [
+    (re.compile(r"benefit|perk|what we offer|compensation|why (?:join|work)|eeo|equal opportunity", re.I), _DROP),
+    (re.compile(r"nice to have|preferred|bonus|plus", re.I), _MID),
+    (re.compile(r"require|qualif|must have|skill|what you.?ll (?:need|bring)|who you are|experience|you have", re.I), _HIGH),
+    (re.compile(r"responsib|what you.?ll do|the role|duties|day to day|about the (?:role|job|position)", re.I), _HIGH),
+    (re.compile(r"about (?:us|the company)|who we are|our (?:mission|culture|story|values)|company", re.I), _LOW),
+]
+
+_RESUME_SECTIONS = [
+    (re.compile(r"skill|technolog|tool|stack|competenc", re.I), _HIGH),
+    (re.compile(r"experience|employment|work history|career|project", re.I), _HIGH),
+    (re.compile(r"summary|profile|objective|about", re.I), _MID),
+    (re.compile(r"certif|education|degree|award|publication", re.I), _MID),
+    (re.compile(r"interest|hobb|reference|volunteer", re.I), _LOW),
+]
+
+_HEADING_RE = re.compile(r"^\s*(?:#+\s*)?([A-Za-z][A-Za-z0-9 &/'’()\-]{1,60}?)\s*:?\s*$")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·▪●◦]|\d+[.)])\s*")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_LONG_LINE = 400
+
+
+def _is_heading(line: str, rules: list) -> bool:
+    """A short label line ending in ':' or a known section name like "Benefits"."""
+    m = _HEADING_RE.match(line)
+    if not m:
+        return False
+    if line.rstrip().endswith(":"):
+        return True
+    return len(m.group(1).split()) <= 4 and any(p.search(line) for p, _ in rules)
+
+
+def _section_priority(heading: str, rules: list) -> int:
+    for pattern, priority in rules:
+        if pattern.search(heading):
+            return priority
+    return _MID
+
+
+def _normalize(line: str) -> str:
+    return re.sub(r"\s+", " ", _BULLET_RE.sub("", line)).strip().lower()
+
+
+def _units(text: str) -> list[str]:
+    """Split into lines, breaking very long paragraphs into sentences."""
+    units = []
+    for line in text.splitlines():
+        if len(line) > _LONG_LINE:
+            units.extend(_SENTENCE_SPLIT_RE.split(line))
+        else:
+            units.append(line)
+    return units
+
+
+# ── Compaction ────────────────────────────────────────────
+@dataclass
+class Compacted:
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+_stats = {"calls": 0, "tokens_before": 0, "tokens_after": 0}
+
+
+def _record(result: Compacted) -> Compacted:
+    _stats["calls"] += 1
+    _stats["tokens_before"] += result.tokens_before
+    _stats["tokens_after"] += result.tokens_after
+    return result
+
+
+def compaction_stats() -> dict:
+    return {**_stats, "tokens_saved": _stats["tokens_before"] - _stats["tokens_after"]}
+
+
+def _truncate(text: str, budget: int) -> str:
+    """Last resort: cut to the budget on a whitespace boundary."""
+    if count_tokens(text) <= budget:
+        return text
+    cut = text[: budget * 4]
+    return cut[: cut.rfind(" ")] if " " in cut else cut
+
+
+def compact(text: str, budget: int, kind: str = "jd") -> Compacted:
+    """Fit ``text`` into ``budget`` tokens.
+
+    ``kind`` is "jd" or "resume" (section-aware) or "letter" (order and
+    wording preserved; only duplicates and overflow are removed).
+    """
+    text = (text or "").strip()
+    before = count_tokens(text)
+
+    # Each section: [priority, first_unit_index, [(index, line), ...]]
+    rules = _JD_SECTIONS if kind == "jd" else _RESUME_SECTIONS
+    sections: list[list] = [[_HIGH, 0, []]]  # preamble: title, location, intro
+    seen: set[str] = set()
+    for i, unit in enumerate(_units(text)):
+        norm = _normalize(unit)
+        if not norm:
+            if kind == "letter" and sections[-1][2]:
+                sections[-1][2].append((i, ""))  # keep paragraph breaks
+            continue
+        if norm in seen:
+            continue
+        seen.add(norm)
+        if kind != "letter":
+            if _BOILERPLATE_RE.search(unit):
+                continue
+            if _is_heading(unit, rules):
+                sections.append([_section_priority(unit, rules), i, []])
+        sections[-1][2].append((i, unit.strip()))
+
+    kept: list[tuple[int, str]] = []
+    used = 0
+    for priority, _, lines in sorted(sections, key=lambda s: (s[0], s[1])):
+        if priority == _DROP or not lines:
+            continue
+        # Keep each section's leading lines until the budget runs out
+        for idx, line in lines:
+            cost = count_tokens(line) + 1  # +1 for the newline
+            if used + cost > budget:
+                break
+            kept.append((idx, line))
+            used += cost
+
+    if not kept and text:
+        out = _truncate(text, budget)
+    else:
+        out = "\n".join(line for _, line in sorted(kept))
+    return _record(Compacted(out, before, count_tokens(out)))
+
+
+class MatcherInputs(NamedTuple):
+    resume: str
+    jd: str
+    cover_letter: Optional[str]
+    tokens_saved: int
+
+
+def compact_matcher_inputs(
+    resume_text: str,
+    jd_text: str,
+    cover_letter: str | None = None,
+) -> MatcherInputs:
+    """Compact the three matcher inputs to their configured budgets."""
+    parts = [
+        compact(resume_text, RESUME_TOKEN_BUDGET, kind="resume"),
+        compact(jd_text, JD_TOKEN_BUDGET, kind="jd"),
+    ]
+    if cover_letter:
+        parts.append(compact(cover_letter, COVER_LETTER_TOKEN_BUDGET, kind="letter"))
+    return MatcherInputs(
+        parts[0].text,
+        parts[1].text,
+        parts[2].text if cover_letter else None,
+        sum(p.tokens_saved for p in parts),
+    )
@@ -0,0 +1,203 @@
+"""
+HireFlow Pub/Sub
+================
+In-process publish/subscribe used to push chat events to open WebSocket
+connections. Every subscriber gets its own bounded queue; ``publish``
+delivers to the local subscribers of a channel and, when a cross-instance
+backend is configured, forwards the event to the other API instances.
+Configured via environment variables:
+  PUBSUB_URL         = <redis://... to fan out across instances; unset = this process only>
+  PUBSUB_PREFIX      = <channel prefix on the shared backend, default "hireflow:">
+  PUBSUB_QUEUE_SIZE  = <events buffered per subscriber before it is dropped, default 256>
+
+A subscriber that falls ``PUBSUB_QUEUE_SIZE`` events behind is marked
+overflowed and receives no more events; its consumer should close and
+let the client resync over REST rather than silently miss messages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Optional, Protocol
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+_URL = os.environ.get("PUBSUB_URL", "").strip()
+_PREFIX = os.environ.get("PUBSUB_PREFIX", "hireflow:")
+_QUEUE_SIZE = int(os.environ.get("PUBSUB_QUEUE_SIZE", "256"))
+
+
+def user_channel(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+class Subscription:
+    """One consumer's view of a channel. Iterate with ``await sub.get()``."""
+
+    def __init__(self, hub: "PubSub", channel: str, maxsize: int):
+        self.hub = hub
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def _put(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            logger.warning("Subscriber on %s fell behind; dropping it", self.channel)
+
+    def deliver(self, event: dict) -> None:
+        """Thread-safe: publishers may run on another event loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(event)
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None on timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class Backend(Protocol):
+    """Cross-instance transport. ``listen`` calls ``deliver(channel, envelope)``."""
+
+    async def publish(self, channel: str, envelope: str) -> None: ...
+
+    async def listen(self, deliver) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisBackend:
+    """Redis PUBLISH/PSUBSCRIBE transport (needs the optional ``redis`` package)."""
+
+    def __init__(self, url: str, prefix: str = _PREFIX):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError("PUBSUB_URL is set but the 'redis' package is not installed.") from exc
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url, decode_responses=True)
+
+    async def publish(self, channel: str, envelope: str) -> None:
+        await self._redis.publish(self.prefix + channel, envelope)
+
+    async def listen(self, deliver) -> None:
+        pubsub = self._redis.pubsub()
+        await pubsub.psubscribe(self.prefix + "*")
+        try:
+            async for msg in pubsub.listen():
+                if msg.get("type") == "pmessage":
+                    deliver(msg["channel"][len(self.prefix):], msg["data"])
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class PubSub:
+    """Channel → subscribers, with an optional cross-instance backend."""
+
+    def __init__(self, backend: Optional[Backend] = None, queue_size: int = _QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = max(1, queue_size)
+        self.instance_id = uuid4().hex
+        self._subs: dict[str, set[Subscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._stats = {"published": 0, "delivered": 0, "remote": 0}
+
+    def subscribe(self, channel: str) -> Subscription:
+        self._ensure_listener()
+        sub = Subscription(self, channel, self.queue_size)
+        self._subs.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subs.get(sub.channel)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.channel]
+
+    def _deliver_local(self, channel: str, event: dict) -> None:
+        for sub in list(self._subs.get(channel, ())):
+            sub.deliver(event)
+            self._stats["delivered"] += 1
+
+    async def publish(self, channel: str, event: dict[str, Any]) -> None:
+        self._stats["published"] += 1
+        self._deliver_local(channel, event)
+        if self.backend is not None:
+            envelope = json.dumps({"origin": self.instance_id, "event": event}, separators=(",", ":"))
+            try:
+                await self.backend.publish(channel, envelope)
+            except Exception:
+                # Local subscribers already have it; other instances resync over REST
+                logger.exception("Pub/sub backend publish failed on %s", channel)
+
+    async def publish_many(self, channels, event: dict[str, Any]) -> None:
+        for channel in channels:
+            await self.publish(channel, event)
+
+    def _on_remote(self, channel: str, envelope: str) -> None:
+        try:
+            msg = json.loads(envelope)
+        except ValueError:
+            return
+        if msg.get("origin") == self.instance_id:
+            return  # already delivered locally
+        self._stats["remote"] += 1
+        self._deliver_local(channel, msg["event"])
+
+    def _ensure_listener(self) -> None:
+        if self.backend is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self.backend.listen(self._on_remote))
+
+    async def close(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            self._listener.cancel()
+        self._listener = None
+        if self.backend is not None:
+            await self.backend.close()
+
+    def subscriber_count(self, channel: Optional[str] = None) -> int:
+        if channel is not None:
+            return len(self._subs.get(channel, ()))
+        return sum(len(s) for s in self._subs.values())
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "channels": len(self._subs),
+            "subscribers": self.subscriber_count(),
+            "backend": type(self.backend).__name__ if self.backend else None,
+        }
+
+
+def _build() -> PubSub:
+    return PubSub(RedisBackend(_URL) if _URL else None)
+
+
+pubsub = _build()
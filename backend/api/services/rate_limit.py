@@ -0,0 +1,214 @@
+"""
+HireFlow LLM Admission Control
+==============================
+Rate limiting in front of every provider call. Configured via:
+  LLM_RPM            = provider requests per minute        (default: 500)
+  LLM_TPM            = provider tokens per minute          (default: 200000)
+  LLM_QUEUE_TIMEOUT  = max seconds a call may wait queued  (default: 10)
+  LLM_MAX_QUEUE      = max queued calls before shedding    (default: 200)
+  LLM_EST_OUTPUT_TOKENS = output tokens assumed per call   (default: 700)
+
+Two token buckets model the provider quota: one for requests, one for
+estimated tokens (prompt chars / 4 plus an output allowance). A call is
+admitted immediately when both buckets have room and nobody is queued.
+Otherwise it joins a per-user queue; queues are served round-robin so one
+user's burst cannot starve everyone else.
+
+Calls that could not be admitted within LLM_QUEUE_TIMEOUT are shed with
+``RateLimited`` carrying a Retry-After hint — up front when the projected
+wait already exceeds the deadline, so the client hears back immediately
+instead of after a long stall. Routes map it to HTTP 429.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Optional
+
+_RPM = float(os.environ.get("LLM_RPM", "500"))
+_TPM = float(os.environ.get("LLM_TPM", "200000"))
+_QUEUE_TIMEOUT = float(os.environ.get("LLM_QUEUE_TIMEOUT", "10"))
+_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", "200"))
+_EST_OUTPUT_TOKENS = int(os.environ.get("LLM_EST_OUTPUT_TOKENS", "700"))
+
+# The user on whose behalf LLM calls in the current request are made.
+# Routes set it; calls without one share the "anonymous" queue.
+llm_user: ContextVar[str] = ContextVar("llm_user", default="anonymous")
+
+
+class RateLimited(Exception):
+    """Raised when a call is shed instead of queued. Maps to HTTP 429."""
+
+    def __init__(self, retry_after: float, reason: str = "LLM capacity exceeded"):
+        super().__init__(reason)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+def estimate_tokens(*texts: str, output_tokens: int = _EST_OUTPUT_TOKENS) -> int:
+    """Rough token estimate for quota purposes (about 4 chars per token)."""
+    return sum(len(t) for t in texts) // 4 + output_tokens
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` per second."""
+
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = max(1.0, per_minute)
+        self.rate = self.capacity / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, n: float) -> float:
+        """Seconds until ``n`` tokens are available (0 if available now)."""
+        self._refill()
+        n = min(n, self.capacity)
+        return 0.0 if self._tokens >= n else (n - self._tokens) / self.rate
+
+    def take(self, n: float) -> None:
+        self._refill()
+        self._tokens -= min(n, self.capacity)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "future", "enqueued")
+
+    def __init__(self, tokens: int, future: asyncio.Future, enqueued: float):
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = enqueued
+
+
+class AdmissionController:
+    """RPM/TPM token buckets with per-user round-robin queueing."""
+
+    def __init__(
+        self,
+        rpm: float = _RPM,
+        tpm: float = _TPM,
+        queue_timeout: float = _QUEUE_TIMEOUT,
+        max_queue: int = _MAX_QUEUE,
+    ):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._depth = 0
+        self._queued_tokens = 0
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._waits: deque[float] = deque(maxlen=1000)
+        self._stats = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0, "max_depth": 0}
+
+    def _wait_for(self, requests: float, tokens: float) -> float:
+        return max(self.requests.wait_time(requests), self.tokens.wait_time(tokens))
+
+    async def acquire(self, tokens: int, user_id: Optional[str] = None) -> None:
+        """Wait for quota to make one call of ``tokens`` estimated tokens.
+
+        Raises ``RateLimited`` if the call cannot be admitted in time.
+        """
+        user_id = user_id or llm_user.get()
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and self._dispatcher.get_loop() is not loop:
+            self._reset_queues()  # waiters from another (closed) event loop
+        if self._depth == 0 and self._wait_for(1, tokens) == 0:
+            self._admit(tokens, waited=0.0)
+            return
+
+        projected = self._wait_for(self._depth + 1, self._queued_tokens + tokens)
+        if self._depth >= self.max_queue or projected > self.queue_timeout:
+            self._stats["rejected"] += 1
+            raise RateLimited(projected)
+
+        waiter = _Waiter(tokens, loop.create_future(), time.monotonic())
+        self._queues.setdefault(user_id, deque()).append(waiter)
+        self._depth += 1
+        self._queued_tokens += tokens
+        self._stats["queued"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], self._depth)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                return  # admitted just as the deadline fired
+            self._stats["timed_out"] += 1
+            raise RateLimited(self._wait_for(self._depth + 1, self._queued_tokens + tokens))
+        finally:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._remove(user_id, waiter)
+
+    def _reset_queues(self) -> None:
+        self._queues.clear()
+        self._depth = 0
+        self._queued_tokens = 0
+        self._dispatcher = None
+
+    def _admit(self, tokens: int, waited: float) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self._waits.append(waited)
+        self._stats["admitted"] += 1
+
+    def _remove(self, user_id: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(user_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            self._depth -= 1
+            self._queued_tokens -= waiter.tokens
+            if not queue:
+                del self._queues[user_id]
+
+    async def _dispatch(self) -> None:
+        """Release queued callers one at a time, rotating across users."""
+        while self._queues:
+            user_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            delay = self._wait_for(1, waiter.tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            queue.popleft()
+            self._depth -= 1
+            self._queued_tokens -= waiter.tokens
+            # Move this user to the back so the next user goes first
+            del self._queues[user_id]
+            if queue:
+                self._queues[user_id] = queue
+            if not waiter.future.done():
+                self._admit(waiter.tokens, waited=time.monotonic() - waiter.enqueued)
+                waiter.future.set_result(None)
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 4)
+
+        return {
+            **self._stats,
+            "queue_depth": self._depth,
+            "queued_users": len(self._queues),
+            "wait_p50_s": pct(0.50),
+            "wait_p95_s": pct(0.95),
+            "wait_max_s": round(waits[-1], 4) if waits else 0.0,
+        }
+
+
+admission = AdmissionController()
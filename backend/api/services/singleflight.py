@@ -0,0 +1,78 @@
+"""
+Request coalescing ("singleflight") for async upstream calls.
+
+Concurrent callers asking for the same key share one in-flight call:
+the first caller starts it, later callers await the same result, and
+every waiter sees the same return value or exception.
+
+The shared call runs in its own task, so cancelling one waiter never
+cancels the work other waiters depend on. When the last waiter goes
+away before the call finishes, the call itself is cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._flights: dict[str, _Flight] = {}
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is not None and flight.task.get_loop() is not loop:
+            flight = None  # left over from another (closed) event loop
+
+        # A call made from inside the shared task must not wait on itself
+        if flight is not None and asyncio.current_task() is flight.task:
+            return await fn()
+
+        if flight is None:
+            flight = _Flight(loop.create_task(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _t, k=key, f=flight: self._forget(k, f))
+            self._stats["calls"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left to receive the result; drop it so a new
+                # caller starts fresh instead of joining a cancelled call.
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.task.done() and not flight.task.cancelled():
+            flight.task.exception()  # mark retrieved so asyncio doesn't warn
+
+    def in_flight(self, key: Optional[str] = None) -> int:
+        if key is not None:
+            return 1 if key in self._flights else 0
+        return len(self._flights)
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_flight": len(self._flights)}
@@ -0,0 +1,115 @@
+"""
+HireFlow Skill Taxonomy
+=======================
+The canonical skill list shared by the resume parser (ai.py) and the
+external job transformer (jobs_api.py), plus one compiled matcher that
+finds every taxonomy skill in a text in a single pass.
+
+Matching is case-insensitive and word-bounded, so "go" never matches
+"good" and "Java" never matches "JavaScript". Common spellings map to
+one canonical name ("vue" → "Vue.js", "k8s" → "Kubernetes").
+
+Skills and short aliases that are also everyday words ("hiring",
+"spring", "node", "ml") only match as written ("Hiring", "ML"). In
+running prose even that is too loose ("Hiring Manager", "American
+Express"), so ``prose=True`` skips the everyday-word skills entirely.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Derived from the frontend's SKILL_CATEGORIES
+SKILL_TAXONOMY = [
+    # Frontend
+    "React", "Vue.js", "Angular", "TypeScript", "JavaScript", "HTML/CSS",
+    "Next.js", "Tailwind CSS", "Redux", "Svelte",
+    # Backend
+    "Node.js", "Python", "Java", "Go", "Ruby", "PHP", "C#", ".NET", "Rust", "Elixir",
+    # Data & AI
+    "Machine Learning", "TensorFlow", "PyTorch", "Data Analysis", "SQL", "Pandas",
+    "NLP", "Computer Vision", "Deep Learning", "MLOps",
+    # Cloud & DevOps
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "CI/CD",
+    "Linux", "Nginx", "Jenkins",
+    # Design
+    "Figma", "UX Research", "UI Design", "Design Systems", "Prototyping",
+    "Adobe XD", "Sketch", "Accessibility", "Motion Design", "Branding",
+    # Management
+    "Agile/Scrum", "Product Strategy", "Stakeholder Mgmt", "Roadmapping",
+    "Team Leadership", "Budgeting", "OKRs", "Hiring", "Mentoring", "Cross-functional",
+    # Common extras
+    "GraphQL", "MongoDB", "Redis", "PostgreSQL", "Express", "Django", "FastAPI",
+    "Flask", "Spring", "Kafka", "Git", "GitHub", "Jira", "NumPy",
+    "Elasticsearch", "RabbitMQ",
+]
+
+# Other spellings of taxonomy skills (lowercase → canonical)
+SKILL_ALIASES = {
+    "reactjs": "React", "react.js": "React",
+    "vue": "Vue.js", "vuejs": "Vue.js",
+    "angularjs": "Angular",
+    "html": "HTML/CSS", "css": "HTML/CSS", "html5": "HTML/CSS", "css3": "HTML/CSS",
+    "nextjs": "Next.js",
+    "tailwind": "Tailwind CSS", "tailwindcss": "Tailwind CSS",
+    "node": "Node.js", "nodejs": "Node.js",
+    "golang": "Go",
+    "c sharp": "C#",
+    "ml": "Machine Learning",
+    "natural language processing": "NLP",
+    "amazon web services": "AWS",
+    "google cloud": "GCP", "google cloud platform": "GCP",
+    "k8s": "Kubernetes",
+    "ci / cd": "CI/CD", "continuous integration": "CI/CD",
+    "agile": "Agile/Scrum", "scrum": "Agile/Scrum",
+    "postgres": "PostgreSQL",
+    "mongo": "MongoDB",
+    "express.js": "Express", "expressjs": "Express",
+    "spring boot": "Spring",
+    "elastic search": "Elasticsearch",
+}
+
+# Surface forms that are ordinary words in lowercase; only matched as written
+_CASE_SENSITIVE = {
+    "go": "Go", "ml": "ML", "node": "Node",
+    "express": "Express", "spring": "Spring", "sketch": "Sketch",
+    "hiring": "Hiring", "mentoring": "Mentoring", "budgeting": "Budgeting", "branding": "Branding",
+}
+
+# Skills that are everyday words even when capitalized; not matched in prose
+_COMMON_WORDS = {"Express", "Spring", "Sketch", "Hiring", "Mentoring", "Budgeting", "Branding"}
+
+_CANONICAL: dict[str, str] = {s.lower(): s for s in SKILL_TAXONOMY}
+_CANONICAL.update(SKILL_ALIASES)
+_TAXONOMY_ORDER = {s: i for i, s in enumerate(SKILL_TAXONOMY)}
+
+
+def _alternation(forms) -> str:
+    # Longest first, so "machine learning" wins over "ml" and "github" over "git"
+    return "|".join(re.escape(f) for f in sorted(forms, key=len, reverse=True))
+
+
+_SKILL_RE = re.compile(
+    r"(?<![a-z0-9])(?:"
+    + _alternation(f for f in _CANONICAL if f not in _CASE_SENSITIVE)
+    + r"|(?-i:" + _alternation(_CASE_SENSITIVE.values()) + r"))(?![a-z0-9])",
+    re.IGNORECASE,
+)
+
+
+def find_skills(text: str, by_position: bool = False, prose: bool = False) -> list[str]:
+    """Taxonomy skills mentioned in ``text``, in taxonomy order.
+
+    With ``by_position`` they come in order of first mention instead.
+    With ``prose`` (a job description rather than a skill list), skills
+    that are also everyday words are skipped.
+    """
+    found: dict[str, None] = {}
+    for m in _SKILL_RE.finditer(text):
+        skill = _CANONICAL[m.group(0).lower()]
+        if prose and skill in _COMMON_WORDS:
+            continue
+        found.setdefault(skill, None)
+    if by_position:
+        return list(found)
+    return sorted(found, key=_TAXONOMY_ORDER.__getitem__)
@@ -0,0 +1,73 @@
+"""
+Task handlers for the background queue (see task_queue.py).
+
+Importing this module registers the handlers; the API and the worker
+both import it. Handlers are idempotent: a retried matcher task reuses
+the analysis id chosen at enqueue time and returns the existing row if
+an earlier attempt already saved it.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from api.core.database import create_matcher_analysis, get_matcher_analysis_by_id
+from api.services.task_queue import PermanentTaskError, handler
+
+
+@handler("matcher.run")
+async def run_matcher(payload: dict) -> dict:
+    """Analyze, generate or improve; persist a matcher_analyses row."""
+    from api.services import llm
+
+    analysis_id = payload["analysis_id"]
+    existing = get_matcher_analysis_by_id(analysis_id)
+    if existing:
+        return _matcher_response(existing)
+
+    mode = payload["mode"]
+    resume_text, jd_text = payload["resume_text"], payload["jd_text"]
+    cover_letter = payload.get("cover_letter")
+    if mode == "analyze":
+        analysis = await llm.analyze_match(resume_text, jd_text, cover_letter, use_cache=payload.get("use_cache", True))
+        result = {**analysis, "source": "llm", "status": "complete", "generated_cover_letter": None}
+    elif mode == "generate":
+        result = {"generated_cover_letter": await llm.generate_cover_letter(resume_text, jd_text)}
+    elif mode == "improve":
+        result = {"generated_cover_letter": await llm.improve_cover_letter(resume_text, jd_text, cover_letter or "")}
+    else:
+        raise PermanentTaskError(f"Unknown matcher mode '{mode}'")
+
+    row = create_matcher_analysis({
+        "id": analysis_id,
+        "seeker_id": payload["seeker_id"],
+        "mode": mode,
+        "jd_source": payload["jd_source"],
+        "job_id": payload.get("job_id"),
+        "jd_text": jd_text[:8000],
+        "resume_snapshot": resume_text[:8000],
+        "result": result,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    })
+    return _matcher_response(row)
+
+
+def _matcher_response(row: dict) -> dict:
+    result = row.get("result") or {}
+    analysis = None
+    if row["mode"] == "analyze":
+        analysis = {k: v for k, v in result.items() if k not in ("status", "generated_cover_letter")}
+    return {
+        "id": row["id"],
+        "mode": row["mode"],
+        "analysis": analysis,
+        "generated_cover_letter": result.get("generated_cover_letter"),
+        "status": result.get("status", "complete"),
+        "created_at": row.get("created_at", ""),
+    }
+
+
+@handler("blog.enrich")
+async def run_blog_enrich(payload: dict) -> dict:
+    from api.services.blog_ai import enrich_post
+    return await enrich_post(payload["title"], payload["body_markdown"], payload["category"])
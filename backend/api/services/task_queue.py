@@ -0,0 +1,204 @@
+"""
+HireFlow Task Queue
+===================
+Durable background tasks backed by the ``tasks`` table (007_tasks.sql).
+Routes enqueue work and return 202; workers (``python -m tools.worker``)
+claim tasks with ``FOR UPDATE SKIP LOCKED`` and run the registered
+handler. Configured via:
+  TASK_VISIBILITY_TIMEOUT = seconds a claimed task stays leased  (default: 300)
+  TASK_MAX_ATTEMPTS       = attempts before dead-lettering       (default: 3)
+  TASK_RETRY_BASE         = first retry delay, doubled per retry (default: 5)
+  TASK_QUEUE_INLINE       = "1" to also drain the queue in the API process
+                            after each enqueue (local dev without a worker)
+
+Lifecycle: queued → running → succeeded, or back to queued with a backoff
+delay after a failure, or dead once attempts run out. Being shed by the
+LLM rate limiter does not use up an attempt. A worker that dies mid-task
+leaves its lease to expire; the task is then claimed again. Handlers are
+given less time than the lease so a slow call never runs twice
+concurrently, and outcomes are only written while the lease is still
+held, so a worker that lost its lease cannot overwrite the new owner's.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+from api.core.database import claim_tasks, create_task, get_task_by_id, update_task
+from api.services.rate_limit import RateLimited, llm_user
+
+VISIBILITY_TIMEOUT = int(os.environ.get("TASK_VISIBILITY_TIMEOUT", "300"))
+MAX_ATTEMPTS = int(os.environ.get("TASK_MAX_ATTEMPTS", "3"))
+RETRY_BASE = float(os.environ.get("TASK_RETRY_BASE", "5"))
+INLINE = os.environ.get("TASK_QUEUE_INLINE", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[dict]]
+_HANDLERS: dict[str, Handler] = {}
+
+
+class PermanentTaskError(Exception):
+    """Raised by a handler when retrying cannot help (bad payload, missing row)."""
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register an async ``payload -> result`` function for a task kind."""
+    def register(fn: Handler) -> Handler:
+        _HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ── Producer side ─────────────────────────────────────────
+def enqueue(kind: str, payload: dict, owner_id: Optional[str] = None, max_attempts: int = MAX_ATTEMPTS) -> dict:
+    if kind not in _HANDLERS:
+        raise ValueError(f"Unknown task kind '{kind}'")
+    now = _now().isoformat()
+    return create_task({
+        "id": f"task_{uuid4().hex[:12]}",
+        "kind": kind,
+        "payload": payload,
+        "status": "queued",
+        "owner_id": owner_id,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_after": now,
+        "locked_by": None,
+        "locked_until": None,
+        "result": None,
+        "last_error": None,
+        "updated_at": now,
+    })
+
+
+def get_task(task_id: str) -> Optional[dict]:
+    return get_task_by_id(task_id)
+
+
+# ── Consumer side ─────────────────────────────────────────
+def _retry_delay(task: dict, exc: Exception) -> float:
+    if isinstance(exc, RateLimited):
+        return float(exc.retry_after)
+    return RETRY_BASE * 2 ** max(task["attempts"] - 1, 0)
+
+
+async def run_task(task: dict, visibility_timeout: int = VISIBILITY_TIMEOUT) -> dict:
+    """Run one claimed task and record its outcome. Returns the updated row."""
+    fn = _HANDLERS.get(task["kind"])
+    if task.get("owner_id"):
+        llm_user.set(task["owner_id"])
+    try:
+        if fn is None:
+            raise PermanentTaskError(f"No handler registered for task kind '{task['kind']}'")
+        # Stay inside the lease so an expired task is never run twice at once
+        result = await asyncio.wait_for(fn(task.get("payload") or {}), timeout=visibility_timeout * 0.9)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        return _record_failure(task, exc)
+
+    return _finish(task, {
+        "status": "succeeded",
+        "result": result,
+        "last_error": None,
+        "locked_by": None,
+        "locked_until": None,
+        "updated_at": _now().isoformat(),
+    })
+
+
+def _finish(task: dict, update: dict) -> dict:
+    """Write a task's outcome unless its lease has passed to another worker."""
+    row = update_task(task["id"], update, locked_by=task.get("locked_by"))
+    if not row:
+        logger.warning("Task %s lost its lease before finishing; outcome discarded", task["id"])
+    return row
+
+
+def _record_failure(task: dict, exc: Exception) -> dict:
+    error = str(exc) or type(exc).__name__
+    if isinstance(exc, asyncio.TimeoutError):
+        error = "Task exceeded its visibility timeout"
+    # RuntimeError is how services report missing configuration (e.g. no
+    # LLM_API_KEY); retrying cannot fix that, so it dead-letters at once.
+    permanent = isinstance(exc, (PermanentTaskError, RuntimeError))
+    update = {
+        "last_error": error[:1000],
+        "locked_by": None,
+        "locked_until": None,
+        "updated_at": _now().isoformat(),
+    }
+    if isinstance(exc, RateLimited):
+        # Shed before reaching the provider: hand the claimed attempt back
+        update["attempts"] = max(task["attempts"] - 1, 0)
+        dead = False
+    else:
+        dead = permanent or task["attempts"] >= task["max_attempts"]
+    if dead:
+        update["status"] = "dead"
+    else:
+        update["status"] = "queued"
+        update["run_after"] = (_now() + timedelta(seconds=_retry_delay(task, exc))).isoformat()
+    return _finish(task, update)
+
+
+async def run_once(
+    worker_id: Optional[str] = None,
+    limit: int = 4,
+    visibility_timeout: int = VISIBILITY_TIMEOUT,
+) -> int:
+    """Claim up to ``limit`` tasks, run them concurrently, return how many ran."""
+    tasks = claim_tasks(worker_id or default_worker_id(), limit, visibility_timeout)
+    await asyncio.gather(*(run_task(t, visibility_timeout) for t in tasks))
+    return len(tasks)
+
+
+async def run_worker(
+    worker_id: Optional[str] = None,
+    concurrency: int = 4,
+    poll_interval: float = 1.0,
+    visibility_timeout: int = VISIBILITY_TIMEOUT,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """Keep up to ``concurrency`` tasks running until ``stop`` is set."""
+    worker_id = worker_id or default_worker_id()
+    stop = stop or asyncio.Event()
+    running: set[asyncio.Task] = set()
+    try:
+        while not stop.is_set():
+            free = concurrency - len(running)
+            claimed = claim_tasks(worker_id, free, visibility_timeout) if free > 0 else []
+            for task in claimed:
+                t = asyncio.ensure_future(run_task(task, visibility_timeout))
+                running.add(t)
+                t.add_done_callback(running.discard)
+            if claimed and len(running) < concurrency:
+                continue  # more may be waiting; claim again right away
+            # Idle or saturated: wake on the first finished task, a stop, or the poll interval
+            waiters = [*running, asyncio.ensure_future(stop.wait())]
+            await asyncio.wait(waiters, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            waiters[-1].cancel()
+    finally:
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+async def drain(limit: int = 4) -> None:
+    """Run queued tasks until none are due (TASK_QUEUE_INLINE mode)."""
+    while await run_once(limit=limit):
+        pass
@@ -0,0 +1,18 @@
+-- ─── LLM Response Cache ──────────────────────────────────
+-- Optional persistent tier for the LLM response cache (LLM_CACHE_DB=1).
+-- id is a sha256 fingerprint of provider, model, prompt version and input.
+create table if not exists public.llm_cache (
+  id          text primary key,
+  response    text not null,
+  provider    text,
+  model       text,
+  created_at  timestamptz default now(),
+  expires_at  timestamptz not null
+);
+
+create index if not exists idx_llm_cache_expires
+  on public.llm_cache (expires_at);
+
+alter table public.llm_cache enable row level security;
+create policy "Service role full access" on public.llm_cache
+  for all using (true) with check (true);
@@ -0,0 +1,75 @@
+-- ─── Background Tasks ────────────────────────────────────
+-- Durable queue for LLM work (matcher analyses, blog enrichment) that runs
+-- outside the HTTP request. Workers claim rows with claim_tasks(), which
+-- uses FOR UPDATE SKIP LOCKED so concurrent workers never double-claim.
+create table if not exists public.tasks (
+  id            text primary key,
+  kind          text not null,
+  payload       jsonb not null default '{}'::jsonb,
+  status        text not null default 'queued'
+                check (status in ('queued', 'running', 'succeeded', 'dead')),
+  owner_id      text references public.users(id),
+  attempts      int not null default 0,
+  max_attempts  int not null default 3,
+  run_after     timestamptz not null default now(),
+  locked_by     text,
+  locked_until  timestamptz,
+  result        jsonb,
+  last_error    text,
+  created_at    timestamptz default now(),
+  updated_at    timestamptz default now()
+);
+
+create index if not exists idx_tasks_claimable
+  on public.tasks (run_after)
+  where status in ('queued', 'running');
+
+create index if not exists idx_tasks_owner
+  on public.tasks (owner_id, created_at desc);
+
+alter table public.tasks enable row level security;
+create policy "Service role full access" on public.tasks
+  for all using (true) with check (true);
+
+-- Claim up to p_limit runnable tasks for p_worker. A task is runnable when
+-- it is queued and due, or when a previous worker's lease (visibility
+-- timeout) expired without finishing it. Expired leases that already used
+-- every attempt are dead-lettered instead of being handed out again.
+create or replace function public.claim_tasks(
+  p_worker text,
+  p_limit int default 1,
+  p_visibility_seconds int default 300
+)
+returns setof public.tasks
+language plpgsql
+as $$
+begin
+  update public.tasks
+     set status = 'dead',
+         last_error = coalesce(last_error, 'visibility timeout expired on final attempt'),
+         locked_by = null,
+         locked_until = null,
+         updated_at = now()
+   where status = 'running'
+     and locked_until < now()
+     and attempts >= max_attempts;
+
+  return query
+  update public.tasks t
+     set status = 'running',
+         attempts = t.attempts + 1,
+         locked_by = p_worker,
+         locked_until = now() + make_interval(secs => p_visibility_seconds),
+         updated_at = now()
+   where t.id in (
+     select c.id
+       from public.tasks c
+      where (c.status = 'queued' and c.run_after <= now())
+         or (c.status = 'running' and c.locked_until < now())
+      order by c.run_after
+      limit p_limit
+      for update skip locked
+   )
+  returning t.*;
+end;
+$$;
@@ -0,0 +1,26 @@
+-- ─── External Jobs ───────────────────────────────────────
+-- Postings ingested from JSearch (python -m tools.ingest_jobs) live in the
+-- jobs table next to native ones so listing and matching treat them alike.
+-- They have no HireFlow company, so company_id becomes optional and the
+-- employer is stored on the row.
+alter table public.jobs alter column company_id drop not null;
+
+alter table public.jobs
+  add column if not exists source        text not null default 'hireflow',
+  add column if not exists external_id   text,
+  add column if not exists company_name  text,
+  add column if not exists company_logo  text,
+  add column if not exists apply_link    text,
+  add column if not exists posted_at     timestamptz,
+  add column if not exists content_hash  text,
+  add column if not exists last_seen_at  timestamptz,
+  add column if not exists expires_at    timestamptz;
+
+create unique index if not exists idx_jobs_source_external
+  on public.jobs (source, external_id)
+  where external_id is not null;
+
+-- Expiry sweep: active external postings past their expiry
+create index if not exists idx_jobs_expiry
+  on public.jobs (source, expires_at)
+  where status = 'active' and expires_at is not null;
@@ -0,0 +1,6 @@
+-- ─── Message Cursors ─────────────────────────────────────
+-- GET /api/chat/conversations/{id}/messages pages by (created_at, id)
+-- keyset cursors; this index serves both the newest-page and since/before
+-- reads without scanning the whole conversation.
+create index if not exists idx_messages_conv_created
+  on public.messages (conversation_id, created_at, id);
@@ -0,0 +1,29 @@
+-- ─── Read Watermarks ─────────────────────────────────────
+-- Each participant's read position replaces per-message read flags:
+-- reading a conversation moves one row instead of updating every unread
+-- message, and unread counts are a count of messages newer than
+-- last_read_at (served by idx_messages_conv_created from 009).
+alter table public.conversation_participants
+  add column if not exists last_read_at timestamptz,
+  add column if not exists last_read_message_id text;
+
+-- Carry existing read state over: the newest message someone else sent
+-- that the participant had already marked read.
+update public.conversation_participants cp
+set last_read_at = m.created_at,
+    last_read_message_id = m.id
+from (
+  select distinct on (m.conversation_id, p.user_id)
+         m.conversation_id, p.user_id, m.created_at, m.id
+  from public.messages m
+  join public.conversation_participants p
+    on p.conversation_id = m.conversation_id and p.user_id <> m.sender_id
+  where m.read
+  order by m.conversation_id, p.user_id, m.created_at desc, m.id desc
+) m
+where cp.conversation_id = m.conversation_id
+  and cp.user_id = m.user_id
+  and cp.last_read_at is null;
+
+comment on column public.messages.read is
+  'Deprecated: read state lives in conversation_participants.last_read_at.';
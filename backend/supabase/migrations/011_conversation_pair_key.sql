@@ -0,0 +1,31 @@
+-- ─── Direct Conversation Pair Key ────────────────────────
+-- A direct conversation is identified by its two participants' ids,
+-- sorted and joined with ':'. The unique index makes find-or-create a
+-- single indexed lookup, and a concurrent duplicate insert a no-op
+-- (upsert ... on conflict (pair_key) do nothing).
+alter table public.conversations
+  add column if not exists pair_key text;
+
+-- Backfill existing two-person conversations. Where a pair already has
+-- duplicates, the oldest conversation keeps the key; the others remain
+-- readable but are no longer picked for new messages.
+with pairs as (
+  select cp.conversation_id,
+         string_agg(cp.user_id, ':' order by cp.user_id) as pair_key
+  from public.conversation_participants cp
+  group by cp.conversation_id
+  having count(*) = 2
+),
+ranked as (
+  select p.conversation_id, p.pair_key,
+         row_number() over (partition by p.pair_key order by c.created_at, c.id) as rn
+  from pairs p
+  join public.conversations c on c.id = p.conversation_id
+)
+update public.conversations c
+set pair_key = r.pair_key
+from ranked r
+where c.id = r.conversation_id and r.rn = 1 and c.pair_key is null;
+
+create unique index if not exists idx_conversations_pair_key
+  on public.conversations (pair_key);
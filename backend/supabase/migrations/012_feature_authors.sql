@@ -0,0 +1,54 @@
+-- ─── Feature Board Authors ───────────────────────────────
+-- The public board shows each post's and comment's author. Copying the
+-- display name and role onto the rows at write time lets the board render
+-- from the feature_requests query alone, and lets the role filter run in
+-- SQL instead of looking up every author. A trigger on users keeps the
+-- copies current when someone renames or changes role.
+alter table public.feature_requests
+  add column if not exists author_name text,
+  add column if not exists author_role text;
+
+alter table public.feature_comments
+  add column if not exists author_name text,
+  add column if not exists author_role text;
+
+-- Same fallback the API used when it looked authors up per row
+create or replace function feature_author_name(u public.users)
+returns text as $$
+  select coalesce(nullif(u.name, ''), nullif(u.company_name, ''), 'Anonymous');
+$$ language sql immutable;
+
+update public.feature_requests f
+set author_name = feature_author_name(u), author_role = u.role
+from public.users u
+where u.id = f.user_id and f.author_name is null;
+
+update public.feature_comments c
+set author_name = feature_author_name(u), author_role = u.role
+from public.users u
+where u.id = c.user_id and c.author_name is null;
+
+create index if not exists idx_fr_role_votes
+  on public.feature_requests (author_role, vote_count desc);
+
+create or replace function sync_feature_authors()
+returns trigger as $$
+begin
+  update public.feature_requests
+  set author_name = feature_author_name(NEW), author_role = NEW.role
+  where user_id = NEW.id;
+  update public.feature_comments
+  set author_name = feature_author_name(NEW), author_role = NEW.role
+  where user_id = NEW.id;
+  return NEW;
+end;
+$$ language plpgsql;
+
+drop trigger if exists trg_sync_feature_authors on public.users;
+create trigger trg_sync_feature_authors
+  after update of name, company_name, role on public.users
+  for each row
+  when (OLD.name is distinct from NEW.name
+        or OLD.company_name is distinct from NEW.company_name
+        or OLD.role is distinct from NEW.role)
+  execute function sync_feature_authors();
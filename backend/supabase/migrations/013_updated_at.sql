@@ -0,0 +1,40 @@
+-- ─── updated_at Version Stamps ───────────────────────────
+-- Public listings answer conditional GETs from (max(updated_at), count)
+-- of the rows they show, so updated_at must move on every change that
+-- shows up in a response. jobs gains the column; both tables get a
+-- trigger so writes that bypass the API (the applicant_count trigger,
+-- ingestion, SQL edits) still bump it. Columns passed as trigger
+-- arguments are ignored: otherwise blog view counting would invalidate
+-- everyone's cached copy on every read, and each ingestion run's
+-- last_seen_at sweep would invalidate the job board.
+alter table public.jobs
+  add column if not exists updated_at timestamptz default now();
+
+create or replace function touch_updated_at()
+returns trigger as $$
+begin
+  if (to_jsonb(NEW) - TG_ARGV - 'updated_at') = (to_jsonb(OLD) - TG_ARGV - 'updated_at') then
+    return NEW;
+  end if;
+  -- Keep an explicit value the API set; otherwise stamp the change
+  if NEW.updated_at is not distinct from OLD.updated_at then
+    NEW.updated_at = now();
+  end if;
+  return NEW;
+end;
+$$ language plpgsql;
+
+drop trigger if exists trg_jobs_updated_at on public.jobs;
+create trigger trg_jobs_updated_at
+  before update on public.jobs
+  for each row
+  execute function touch_updated_at('last_seen_at');
+
+drop trigger if exists trg_blog_posts_updated_at on public.blog_posts;
+create trigger trg_blog_posts_updated_at
+  before update on public.blog_posts
+  for each row
+  execute function touch_updated_at('view_count');
+
+create index if not exists idx_jobs_status_updated on public.jobs (status, updated_at desc);
+create index if not exists idx_blog_status_updated on public.blog_posts (status, updated_at desc);
@@ -0,0 +1,7 @@
+-- ─── Inbox Resume ────────────────────────────────────────
+-- The inbox stream replays messages after a Last-Event-ID cursor across
+-- all of a user's conversations. idx_messages_conv_created leads with
+-- conversation_id, so that read probed every conversation; this index lets
+-- it walk the (created_at, id) range once and stop at the replay limit.
+create index if not exists idx_messages_created
+  on public.messages (created_at, id);
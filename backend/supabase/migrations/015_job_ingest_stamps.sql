@@ -0,0 +1,9 @@
+-- ─── Ingestion-Neutral Job Stamps ────────────────────────
+-- Each ingestion run pushes expires_at forward on every posting it sees
+-- again. Neither it nor last_seen_at appears in any response, so the jobs
+-- trigger ignores both; only real changes to a posting move updated_at.
+drop trigger if exists trg_jobs_updated_at on public.jobs;
+create trigger trg_jobs_updated_at
+  before update on public.jobs
+  for each row
+  execute function touch_updated_at('last_seen_at', 'expires_at');
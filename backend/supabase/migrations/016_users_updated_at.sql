@@ -0,0 +1,15 @@
+-- ─── users.updated_at ────────────────────────────────────
+-- GET /api/jobs shows each native job's employer name from users. The
+-- listing's ETag uses (max(updated_at), count) of company users as that
+-- half of its version, so a rename is picked up without fetching the page.
+-- Password changes never show up in a response and are ignored.
+alter table public.users
+  add column if not exists updated_at timestamptz default now();
+
+drop trigger if exists trg_users_updated_at on public.users;
+create trigger trg_users_updated_at
+  before update on public.users
+  for each row
+  execute function touch_updated_at('hashed_password');
+
+create index if not exists idx_users_role_updated on public.users (role, updated_at desc);
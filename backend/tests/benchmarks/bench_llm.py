@@ -0,0 +1,171 @@
+"""
+LLM load harness against the local fake provider.
+
+Drives the matcher and pressroom AI paths (analyze, generate, enrich,
+draft) at a chosen concurrency with ``LLM_PROVIDER=fake`` semantics, so
+queueing, caching, coalescing and retry behaviour can be measured
+offline without API credits. Reports client-side latency per path plus
+the service's own telemetry, cache and admission stats as JSON.
+
+Usage:
+  python -m tests.benchmarks.bench_llm --requests 500 --concurrency 50
+  python -m tests.benchmarks.bench_llm --error-rate 0.1 --duplicates 0.5 --rpm 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+import api.services.llm as llm
+from api.services.blog_ai import enrich_post, generate_draft
+from api.services.llm_telemetry import telemetry
+from api.services.rate_limit import AdmissionController, RateLimited
+from tests.benchmarks.bench_parser import _git_commit, _summarize
+
+PATHS = ("analyze", "generate", "enrich", "draft")
+_MIX = (0.5, 0.2, 0.2, 0.1)
+_SKILLS = ["Python", "React", "TypeScript", "AWS", "Docker", "Kubernetes", "SQL", "Go", "Node.js", "GraphQL"]
+
+
+def _prompt_pool(size: int, rng: random.Random) -> list[dict]:
+    pool = []
+    for i in range(size):
+        have = rng.sample(_SKILLS, 4)
+        want = rng.sample(_SKILLS, 5)
+        pool.append({
+            "resume": f"Engineer {i}\nSKILLS\n{', '.join(have)}\nEXPERIENCE\nBuilt services at Company {i}.",
+            "jd": f"Role {i}. Requirements: {', '.join(want)}. 5+ years experience.",
+            "title": f"Breaking into {want[0]} roles ({i})",
+        })
+    return pool
+
+
+async def _one(path: str, p: dict) -> None:
+    if path == "analyze":
+        await llm.analyze_match(p["resume"], p["jd"])
+    elif path == "generate":
+        await llm.generate_cover_letter(p["resume"], p["jd"])
+    elif path == "enrich":
+        await enrich_post(p["title"], f"# {p['title']}\n\n{p['jd']}", "career-playbook")
+    else:
+        await generate_draft(p["title"], "career-playbook")
+
+
+async def _drive(plan: list[tuple[str, dict]], concurrency: int) -> tuple[dict, dict, float]:
+    sem = asyncio.Semaphore(concurrency)
+    samples: dict[str, list[float]] = {p: [] for p in PATHS}
+    errors: dict[str, int] = {}
+
+    async def run(path: str, prompt: dict) -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await _one(path, prompt)
+            except RateLimited:
+                errors["RateLimited"] = errors.get("RateLimited", 0) + 1
+                return
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                return
+            samples[path].append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(run(path, prompt) for path, prompt in plan))
+    return samples, errors, time.perf_counter() - t0
+
+
+def run_load(
+    requests: int = 200,
+    concurrency: int = 20,
+    duplicates: float = 0.2,
+    seed: int = 1234,
+    provider: llm._FakeProvider | None = None,
+    admission: AdmissionController | None = None,
+) -> dict:
+    """Run ``requests`` calls through the LLM service and return a JSON report."""
+    rng = random.Random(seed)
+    unique = max(1, round(requests * (1 - duplicates)))
+    pool = _prompt_pool(unique, rng)
+    plan = [(rng.choices(PATHS, _MIX)[0], pool[i] if i < unique else rng.choice(pool)) for i in range(requests)]
+
+    saved = (llm._API_KEY, llm._provider, llm.admission)
+    llm._provider = provider or llm._FakeProvider(seed=seed)
+    llm._API_KEY = llm._API_KEY or "fake"
+    llm.admission = admission or AdmissionController()
+    telemetry.clear()
+    try:
+        samples, errors, wall = asyncio.run(_drive(plan, concurrency))
+        service = {
+            "telemetry": telemetry.summary(),
+            "cache": llm.cache_stats(),
+            "admission": llm.admission.stats(),
+        }
+    finally:
+        llm._API_KEY, llm._provider, llm.admission = saved
+
+    ok = sum(len(v) for v in samples.values())
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "requests": requests,
+            "concurrency": concurrency,
+            "duplicates": duplicates,
+            "seed": seed,
+        },
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(ok / wall, 2) if wall else 0.0,
+        "succeeded": ok,
+        "errors": errors,
+        "latency": {path: _summarize(v) for path, v in samples.items() if v},
+        **service,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the LLM paths against the fake provider.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Fraction of requests repeating an earlier prompt")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--sigma", type=float, default=0.35)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--errors", default="timeout,429,500,malformed")
+    parser.add_argument("--rpm", type=int, help="Admission requests/minute (default: LLM_RPM)")
+    parser.add_argument("--tpm", type=int, help="Admission tokens/minute (default: LLM_TPM)")
+    parser.add_argument("--out", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    provider = llm._FakeProvider(
+        latency_ms=args.latency_ms,
+        sigma=args.sigma,
+        error_rate=args.error_rate,
+        errors=args.errors,
+        seed=args.seed,
+    )
+    admission_kwargs = {k: v for k, v in (("rpm", args.rpm), ("tpm", args.tpm)) if v}
+    report = run_load(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        duplicates=args.duplicates,
+        seed=args.seed,
+        provider=provider,
+        admission=AdmissionController(**admission_kwargs),
+    )
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
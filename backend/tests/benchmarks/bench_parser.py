@@ -0,0 +1,216 @@
+"""
+Resume parser benchmark harness.
+
+Runs ``parse_resume`` over the synthetic corpus and reports per-stage
+timing, throughput (single-process and pooled) and extraction accuracy
+as JSON. Pass ``--baseline`` with an earlier report to print deltas and
+fail on regressions.
+
+Usage:
+  python -m tests.benchmarks.bench_parser --out bench.json
+  python -m tests.benchmarks.bench_parser --baseline bench.json --out bench-new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from api.services.ai import (
+    _extract_text,
+    _parse_structured_data,
+    generate_summary,
+    parse_resume,
+)
+from tests.benchmarks.corpus import ResumeDoc, generate_corpus
+
+STAGES = ("extract", "parse", "summary", "total")
+
+# Regression thresholds used by --baseline
+MAX_THROUGHPUT_DROP = 0.20
+MAX_ACCURACY_DROP = 0.01
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  MEASUREMENT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _summarize(samples_ms: list[float]) -> dict:
+    return {
+        "mean_ms": round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(_percentile(samples_ms, 50), 3),
+        "p95_ms": round(_percentile(samples_ms, 95), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def time_stages(doc: ResumeDoc) -> tuple[dict, dict]:
+    """Run the parse pipeline stage by stage. Returns (timings_ms, profile)."""
+    t0 = time.perf_counter()
+    text = _extract_text(doc.filename, doc.content)
+    t1 = time.perf_counter()
+    profile = _parse_structured_data(text) if text.strip() else {}
+    t2 = time.perf_counter()
+    if profile:
+        generate_summary(
+            name=profile["name"],
+            skills=profile["skills"],
+            desired_roles=profile["desired_roles"],
+            experience_level=profile["experience_level"],
+            experience=profile["experience"],
+        )
+    t3 = time.perf_counter()
+    timings = {
+        "extract": (t1 - t0) * 1000,
+        "parse": (t2 - t1) * 1000,
+        "summary": (t3 - t2) * 1000,
+        "total": (t3 - t0) * 1000,
+    }
+    return timings, profile
+
+
+def score_accuracy(expected: dict, profile: dict) -> dict:
+    """Per-document accuracy against the corpus ground truth."""
+    found = set(profile.get("skills", []))
+    truth = set(expected["skills"])
+    hits = len(found & truth)
+    return {
+        "name": float(profile.get("name") == expected["name"]),
+        "email": float(profile.get("email") == expected["email"]),
+        "phone": float(profile.get("phone") == expected["phone"]),
+        "skill_precision": hits / len(found) if found else 0.0,
+        "skill_recall": hits / len(truth) if truth else 1.0,
+        "experience": float(len(profile.get("experience", [])) == expected["experience_count"]),
+        "education": float(len(profile.get("education", [])) == expected["education_count"]),
+    }
+
+
+def _parse_one(doc: tuple[str, bytes]) -> int:
+    result = parse_resume(doc[0], doc[1])
+    return len(result["profile"]["skills"])
+
+
+def measure_throughput(docs: list[ResumeDoc], workers: int) -> dict:
+    payload = [(d.filename, d.content) for d in docs]
+
+    t0 = time.perf_counter()
+    for item in payload:
+        _parse_one(item)
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_parse_one, payload, chunksize=max(1, len(payload) // (workers * 4))))
+    pooled = time.perf_counter() - t0
+
+    return {
+        "workers": workers,
+        "single_docs_per_sec": round(len(docs) / single, 2) if single else 0.0,
+        "pooled_docs_per_sec": round(len(docs) / pooled, 2) if pooled else 0.0,
+    }
+
+
+def run_benchmark(docs: list[ResumeDoc], workers: int = 0, pooled: bool = True) -> dict:
+    stage_samples: dict[str, list[float]] = {s: [] for s in STAGES}
+    by_group: dict[str, dict[str, list[float]]] = {}
+    accuracy_samples: dict[str, list[float]] = {}
+
+    for doc in docs:
+        timings, profile = time_stages(doc)
+        for stage, ms in timings.items():
+            stage_samples[stage].append(ms)
+        group = by_group.setdefault(f"{doc.fmt}/{doc.pages}p", {"total": []})
+        group["total"].append(timings["total"])
+        for metric, value in score_accuracy(doc.expected, profile).items():
+            accuracy_samples.setdefault(metric, []).append(value)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "documents": len(docs),
+        },
+        "stages": {stage: _summarize(samples) for stage, samples in stage_samples.items()},
+        "by_format_and_size": {k: _summarize(v["total"]) for k, v in sorted(by_group.items())},
+        "accuracy": {m: round(statistics.fmean(v), 4) for m, v in accuracy_samples.items()},
+    }
+    if pooled:
+        report["throughput"] = measure_throughput(docs, workers or os.cpu_count() or 2)
+    return report
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  COMPARISON
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def compare_reports(baseline: dict, current: dict) -> list[str]:
+    """Return a list of regression messages (empty when current is no worse)."""
+    problems = []
+    for key in ("single_docs_per_sec", "pooled_docs_per_sec"):
+        old = baseline.get("throughput", {}).get(key)
+        new = current.get("throughput", {}).get(key)
+        if old and new is not None and new < old * (1 - MAX_THROUGHPUT_DROP):
+            problems.append(f"throughput {key}: {old} -> {new}")
+    for metric, old in baseline.get("accuracy", {}).items():
+        new = current.get("accuracy", {}).get(metric)
+        if new is not None and new < old - MAX_ACCURACY_DROP:
+            problems.append(f"accuracy {metric}: {old} -> {new}")
+    return problems
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the resume parser.")
+    parser.add_argument("--per-combo", type=int, default=3, help="Resumes per format/layout/size combination")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--workers", type=int, default=0, help="Pool size (default: CPU count)")
+    parser.add_argument("--no-pool", action="store_true", help="Skip the pooled throughput run")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    docs = generate_corpus(per_combo=args.per_combo, seed=args.seed)
+    report = run_benchmark(docs, workers=args.workers, pooled=not args.no_pool)
+    report["meta"]["seed"] = args.seed
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare_reports(json.load(f), report)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
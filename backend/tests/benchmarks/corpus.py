@@ -0,0 +1,183 @@
+"""
+Synthetic resume corpus for parser benchmarks.
+
+Generates PDF and DOCX resumes of varying length and layout together with
+the ground truth the parser is expected to recover. Generation is seeded
+so two runs over the same parameters produce byte-identical documents.
+
+PDFs are written directly (single Helvetica font, one text object per
+page) so the benchmark needs nothing beyond the app's own dependencies.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+import zipfile
+from dataclasses import dataclass, field
+
+import docx
+
+from api.services.skills import SKILL_TAXONOMY
+
+
+FIRST_NAMES = ["Jane", "Omar", "Priya", "Lucas", "Mei", "Tomas", "Aisha", "Noah", "Elena", "Kofi"]
+LAST_NAMES = ["Doe", "Haddad", "Raman", "Silva", "Chen", "Novak", "Bello", "Fischer", "Rossi", "Mensah"]
+CITIES = ["Austin, TX", "Denver, CO", "Seattle, WA", "Boston, MA", "Chicago, IL"]
+TITLES = ["Software Engineer", "Senior Data Scientist", "Product Designer", "Backend Developer", "DevOps Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises"]
+DEGREES = ["B.S. Computer Science", "M.S. Data Science", "B.A. Design", "MBA", "Ph.D. Physics"]
+
+LAYOUTS = ("classic", "compact", "portfolio")
+PAGE_COUNTS = (1, 2, 4, 8)
+LINES_PER_PAGE = 48
+
+
+@dataclass
+class ResumeDoc:
+    """One generated resume and the fields the parser should extract."""
+    doc_id: str
+    filename: str
+    fmt: str
+    layout: str
+    pages: int
+    content: bytes
+    expected: dict = field(default_factory=dict)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  TEXT
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _resume_lines(rng: random.Random, layout: str, pages: int) -> tuple[list[str], dict]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}@example.com"
+    phone = f"({rng.randint(200, 989)}) {rng.randint(200, 989)}-{rng.randint(1000, 9999)}"
+    skills = rng.sample(SKILL_TAXONOMY, rng.randint(4, 10))
+    jobs = [
+        (rng.choice(TITLES), rng.choice(COMPANIES), 2010 + 3 * i, 2013 + 3 * i)
+        for i in range(rng.randint(1, 3))
+    ]
+    degree = rng.choice(DEGREES)
+    grad_year = rng.randint(2005, 2015)
+
+    lines = [name, email, phone, rng.choice(CITIES), ""]
+    if layout == "compact":
+        lines += [f"Skills: {', '.join(skills)}", ""]
+    else:
+        lines += ["Summary", "Engineer who ships reliable products.", "", "Skills", ", ".join(skills), ""]
+    lines.append("Experience")
+    for title, company, start, end in reversed(jobs):
+        lines.append(f"{title} at {company} | {start} - {end}")
+        lines.append("Built and operated production services.")
+    lines += ["", "Education", f"{degree} {grad_year}"]
+
+    # Pad with filler pages: publications / portfolio entries the parser should ignore
+    filler = 0
+    while len(lines) < pages * LINES_PER_PAGE:
+        filler += 1
+        heading = "Publications" if layout == "portfolio" else "Projects"
+        if filler == 1:
+            lines += ["", heading]
+        lines.append(f"{filler}. Item {filler}: notes on distributed systems and team practice.")
+
+    expected = {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "skills": sorted(skills),
+        "experience_count": len(jobs),
+        "education_count": 1,
+    }
+    return lines, expected
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  WRITERS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(lines: list[str]) -> bytes:
+    """Write a minimal multi-page PDF with one line of text per row."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects: list[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")  # placeholder, filled once the page tree exists
+    tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 760 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (tree, font, content)
+        ))
+    kids = b" ".join(b"%d 0 R" % p for p in page_ids)
+    objects[tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def build_docx(lines: list[str]) -> bytes:
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    # python-docx stamps each zip entry with the current time; pin it so the
+    # corpus is byte-for-byte reproducible
+    fixed = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(out.getvalue())) as src, zipfile.ZipFile(fixed, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            info = zipfile.ZipInfo(item.filename, date_time=(2024, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            dst.writestr(info, src.read(item))
+    return fixed.getvalue()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  CORPUS
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def generate_corpus(
+    per_combo: int = 2,
+    seed: int = 1234,
+    page_counts: tuple[int, ...] = PAGE_COUNTS,
+    formats: tuple[str, ...] = ("pdf", "docx"),
+) -> list[ResumeDoc]:
+    """Generate ``per_combo`` resumes for every (format, layout, page count) combination."""
+    rng = random.Random(seed)
+    docs: list[ResumeDoc] = []
+    for fmt in formats:
+        for layout in LAYOUTS:
+            for pages in page_counts:
+                for n in range(per_combo):
+                    lines, expected = _resume_lines(rng, layout, pages)
+                    content = build_pdf(lines) if fmt == "pdf" else build_docx(lines)
+                    doc_id = f"{fmt}-{layout}-{pages}p-{n}"
+                    docs.append(ResumeDoc(
+                        doc_id=doc_id, filename=f"{doc_id}.{fmt}", fmt=fmt,
+                        layout=layout, pages=pages, content=content, expected=expected,
+                    ))
+    return docs
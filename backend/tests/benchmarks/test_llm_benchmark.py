@@ -0,0 +1,29 @@
+"""
+Smoke tests for the LLM load harness (fake provider, no network).
+Full runs go through ``python -m tests.benchmarks.bench_llm``.
+"""
+
+import pytest
+
+import api.services.llm as llm
+from tests.benchmarks.bench_llm import run_load
+
+
+class TestLLMLoadHarness:
+
+    @pytest.mark.benchmark
+    def test_report_covers_paths_and_service_stats(self):
+        provider = llm._FakeProvider(latency_ms=1, ttft_ms=0, token_ms=0, seed=3)
+        report = run_load(requests=40, concurrency=10, duplicates=0.5, seed=3, provider=provider)
+        assert report["succeeded"] == 40
+        assert set(report["latency"]) <= {"analyze", "generate", "enrich", "draft"}
+        assert report["telemetry"]["analyze"]["calls"] > 0
+        assert report["admission"]["admitted"] > 0
+        # Repeated prompts are answered from cache or by coalescing
+        assert report["cache"]["hits"] + report["cache"]["coalesced"] > 0
+
+    @pytest.mark.benchmark
+    def test_restores_service_state(self):
+        before = (llm._provider, llm.admission)
+        run_load(requests=5, concurrency=2, provider=llm._FakeProvider(latency_ms=0, seed=1))
+        assert (llm._provider, llm.admission) == before
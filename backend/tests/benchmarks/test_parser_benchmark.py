@@ -0,0 +1,65 @@
+"""
+Smoke tests for the resume parser benchmark.
+
+Runs the harness over a small corpus so the benchmark itself can't rot,
+and pins accuracy floors so parser speedups don't silently break
+extraction. Full runs go through ``python -m tests.benchmarks.bench_parser``.
+"""
+
+import pytest
+
+from api.services.ai import _extract_text
+from tests.benchmarks.bench_parser import compare_reports, run_benchmark
+from tests.benchmarks.corpus import generate_corpus
+
+
+@pytest.fixture(scope="module")
+def small_corpus():
+    return generate_corpus(per_combo=1, page_counts=(1, 4))
+
+
+@pytest.fixture(scope="module")
+def report(small_corpus):
+    return run_benchmark(small_corpus, pooled=False)
+
+
+class TestCorpus:
+
+    @pytest.mark.benchmark
+    def test_corpus_is_deterministic(self):
+        a = generate_corpus(per_combo=1, page_counts=(1,))
+        b = generate_corpus(per_combo=1, page_counts=(1,))
+        assert [d.content for d in a] == [d.content for d in b]
+
+    @pytest.mark.benchmark
+    def test_generated_documents_are_readable(self, small_corpus):
+        for doc in small_corpus:
+            text = _extract_text(doc.filename, doc.content)
+            assert doc.expected["email"] in text, doc.doc_id
+
+
+class TestBenchmarkReport:
+
+    @pytest.mark.benchmark
+    def test_report_has_all_stages(self, report, small_corpus):
+        assert report["meta"]["documents"] == len(small_corpus)
+        assert set(report["stages"]) == {"extract", "parse", "summary", "total"}
+        assert report["stages"]["total"]["p50_ms"] > 0
+
+    @pytest.mark.benchmark
+    def test_accuracy_floors(self, report):
+        acc = report["accuracy"]
+        assert acc["email"] == 1.0
+        assert acc["phone"] == 1.0
+        assert acc["name"] >= 0.95
+        assert acc["skill_recall"] >= 0.95
+        assert acc["skill_precision"] >= 0.95
+        assert acc["experience"] >= 0.9
+
+    @pytest.mark.benchmark
+    def test_compare_flags_regressions(self):
+        baseline = {"throughput": {"single_docs_per_sec": 100.0}, "accuracy": {"email": 1.0}}
+        current = {"throughput": {"single_docs_per_sec": 50.0}, "accuracy": {"email": 0.9}}
+        problems = compare_reports(baseline, current)
+        assert len(problems) == 2
+        assert compare_reports(baseline, baseline) == []
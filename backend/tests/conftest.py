@@ -5,6 +5,7 @@ Mocks the Supabase client so that all tests run against an in-memory
 dict-backed store — no real database needed.
 """
 
+import operator
 import os
 import pytest
 from unittest.mock import MagicMock
@@ -28,20 +29,21 @@ class FakeTable:
         self._table = table_name
         self._filters = []
         self._select_cols = "*"
-        self._order_col = None
-        self._order_desc = False
+        self._orders = []
         self._limit_n = None
         self._count_mode = None
         self._maybe_single_flag = False
 
-    def _rows(self):
+    def _rows(self, limited=True):
         rows = list(self._store.get(self._table, {}).values())
         for f in self._filters:
             rows = [r for r in rows if f(r)]
-        if self._order_col:
-            rows.sort(key=lambda r: str(r.get(self._order_col, "")), reverse=self._order_desc)
-        if self._limit_n:
-            rows = rows[: self._limit_n]
+        # Later .order() calls break ties of earlier ones, as in PostgREST
+        for col, desc in reversed(self._orders):
+            rows.sort(key=lambda r, c=col: str(r.get(c, "")), reverse=desc)
+        if limited:
+            offset = getattr(self, "_offset", 0)
+            rows = rows[offset: offset + self._limit_n] if self._limit_n else rows[offset:]
         return rows
 
     def select(self, cols="*", count=None):
@@ -61,15 +63,35 @@ class FakeTable:
         self._filters.append(lambda r, c=col, vs=vals: r.get(c) in vs)
         return self
 
+    def _compare(self, col, val, op):
+        self._filters.append(lambda r, c=col, v=val: r.get(c) is not None and op(r.get(c), v))
+        return self
+
+    def gt(self, col, val):
+        return self._compare(col, val, operator.gt)
+
+    def gte(self, col, val):
+        return self._compare(col, val, operator.ge)
+
+    def lt(self, col, val):
+        return self._compare(col, val, operator.lt)
+
+    def lte(self, col, val):
+        return self._compare(col, val, operator.le)
+
     def order(self, col, desc=False):
-        self._order_col = col
-        self._order_desc = desc
+        self._orders.append((col, desc))
         return self
 
     def limit(self, n):
         self._limit_n = n
         return self
 
+    def range(self, start, end):
+        self._offset = start
+        self._limit_n = end - start + 1
+        return self
+
     def maybe_single(self):
         self._maybe_single_flag = True
         return self
@@ -78,6 +100,24 @@ class FakeTable:
         self._insert_data = data if isinstance(data, list) else [data]
         return self
 
+    def upsert(self, data, on_conflict=None, ignore_duplicates=False):
+        # Conflicts are resolved by id, or by the on_conflict columns when
+        # given; like ON CONFLICT DO UPDATE, columns missing from the payload
+        # keep their stored values (DO NOTHING with ignore_duplicates)
+        self._upsert = True
+        self._conflict_cols = [c.strip() for c in on_conflict.split(",")] if on_conflict else None
+        self._ignore_duplicates = ignore_duplicates
+        return self.insert(data)
+
+    def _conflicting_key(self, tbl, row):
+        cols = getattr(self, "_conflict_cols", None)
+        if not cols or cols == ["id"]:
+            return row.get("id") if row.get("id") in tbl else None
+        for key, existing in tbl.items():
+            if all(existing.get(c) == row.get(c) for c in cols):
+                return key
+        return None
+
     def update(self, data):
         self._update_data = data
         return self
@@ -95,8 +135,13 @@ class FakeTable:
             inserted = []
             for row in self._insert_data:
                 row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
-                key = row.get("id") or str(uuid4())
+                existing = self._conflicting_key(tbl, row) if getattr(self, "_upsert", False) else None
+                if existing is not None and self._ignore_duplicates:
+                    continue
+                key = existing or row.get("id") or str(uuid4())
                 row.setdefault("id", key)
+                if existing is not None:
+                    row = {**tbl[key], **row, "id": key, "created_at": tbl[key].get("created_at", row["created_at"])}
                 tbl[key] = {**row}
                 inserted.append({**row})
             result.data = inserted
@@ -130,7 +175,11 @@ class FakeTable:
             result.data = rows[0] if rows else None
         else:
             result.data = rows
-        result.count = len(rows) if not self._maybe_single_flag else (1 if rows else 0)
+        if self._count_mode and self._limit_n:
+            # count="exact" counts every matching row, not just the page
+            result.count = len(self._rows(limited=False))
+        else:
+            result.count = len(rows) if not self._maybe_single_flag else (1 if rows else 0)
         return result
 
 
@@ -143,6 +192,42 @@ class FakeSupabaseClient:
     def table(self, name: str) -> FakeTable:
         return FakeTable(self.store, name)
 
+    def rpc(self, name: str, params: dict):
+        """Emulate the SQL functions the app calls through supabase.rpc()."""
+        fn = getattr(self, f"_rpc_{name}")
+        result = MagicMock()
+        result.data = fn(**params)
+        mock = MagicMock()
+        mock.execute.return_value = result
+        return mock
+
+    def _rpc_claim_tasks(self, p_worker, p_limit=1, p_visibility_seconds=300):
+        """Python port of claim_tasks() in 007_tasks.sql."""
+        from datetime import timedelta
+        now = datetime.now(timezone.utc)
+        tasks = self.store.setdefault("tasks", {})
+
+        def expired(t):
+            return t["status"] == "running" and datetime.fromisoformat(t["locked_until"]) < now
+
+        for t in tasks.values():
+            if expired(t) and t["attempts"] >= t["max_attempts"]:
+                t.update(status="dead", locked_by=None, locked_until=None,
+                         last_error=t.get("last_error") or "visibility timeout expired on final attempt")
+        runnable = [
+            t for t in tasks.values()
+            if (t["status"] == "queued" and datetime.fromisoformat(t["run_after"]) <= now) or expired(t)
+        ]
+        runnable.sort(key=lambda t: t["run_after"])
+        claimed = []
+        for t in runnable[:p_limit]:
+            t.update(
+                status="running", attempts=t["attempts"] + 1, locked_by=p_worker,
+                locked_until=(now + timedelta(seconds=p_visibility_seconds)).isoformat(),
+            )
+            claimed.append({**t})
+        return claimed
+
     def reset(self):
         self.store.clear()
 
@@ -160,6 +245,52 @@ def mock_supabase(monkeypatch):
     fake.reset()
 
 
+@pytest.fixture(autouse=True)
+def reset_llm_cache():
+    """Keep cached LLM responses from leaking between tests."""
+    from api.services.llm_cache import llm_cache
+    llm_cache.clear()
+    yield
+    llm_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_jsearch_cache():
+    """Keep cached external search results from leaking between tests."""
+    from api.services.jobs_api import search_cache
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_feature_board():
+    """Keep cached feature boards and vote sets from leaking between tests."""
+    from api.services.feature_board import feature_board
+    feature_board.clear()
+    yield
+    feature_board.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_telemetry():
+    """Start each test with empty LLM call metrics."""
+    from api.services.llm_telemetry import telemetry
+    telemetry.clear()
+    yield
+    telemetry.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_admission(monkeypatch):
+    """Give each test fresh LLM rate-limit buckets."""
+    import api.services.llm as llm_mod
+    from api.services.rate_limit import AdmissionController
+    controller = AdmissionController()
+    monkeypatch.setattr(llm_mod, "admission", controller)
+    return controller
+
+
 @pytest.fixture
 def seed_db(mock_supabase):
     """Seed the fake DB with demo data (companies, jobs, recruiter)."""
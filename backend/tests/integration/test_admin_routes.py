@@ -0,0 +1,57 @@
+"""
+Integration tests for /api/admin endpoints.
+"""
+
+import pytest
+
+from api.services.llm_telemetry import LLMCall, telemetry
+from tests.conftest import auth_header, register_user
+
+
+@pytest.fixture
+def admin_auth(client):
+    token, _ = register_user(client, email="admin@hireflow.com", name="Admin")
+    return auth_header(token)
+
+
+class TestLLMTelemetryEndpoint:
+
+    @pytest.mark.integration
+    def test_requires_auth(self, client):
+        assert client.get("/api/admin/llm/telemetry").status_code == 401
+
+    @pytest.mark.integration
+    def test_non_admin_forbidden(self, client):
+        token, _ = register_user(client, email="someone@example.com")
+        resp = client.get("/api/admin/llm/telemetry", headers=auth_header(token))
+        assert resp.status_code == 403
+
+    @pytest.mark.integration
+    def test_summary_per_prompt_type(self, client, admin_auth):
+        telemetry.record(LLMCall("analyze", "openai", "gpt-4o-mini", latency_ms=420, input_tokens=900, output_tokens=150))
+        telemetry.record(LLMCall("analyze", "openai", "gpt-4o-mini", latency_ms=0.2, cache_hit=True))
+        resp = client.get("/api/admin/llm/telemetry?recent=5", headers=admin_auth)
+        assert resp.status_code == 200, resp.text
+        data = resp.json()
+        analyze = data["by_prompt_type"]["analyze"]
+        assert analyze["calls"] == 2
+        assert analyze["latency_ms"]["p95"] == 420
+        assert analyze["cost_usd"] > 0
+        assert len(data["recent"]) == 2
+        assert {"cache", "admission", "prompt_compaction"} <= data.keys()
+
+
+class TestMetricsEndpoint:
+
+    @pytest.mark.integration
+    def test_admin_only(self, client):
+        assert client.get("/api/admin/metrics").status_code == 401
+        token, _ = register_user(client, email="someone@example.com")
+        assert client.get("/api/admin/metrics", headers=auth_header(token)).status_code == 403
+
+    @pytest.mark.integration
+    def test_service_stats_moved_off_health(self, client, admin_auth):
+        resp = client.get("/api/admin/metrics", headers=admin_auth)
+        assert resp.status_code == 200, resp.text
+        assert {"llm_cache", "llm_admission", "jsearch_cache", "chat_pubsub"} <= resp.json().keys()
+        assert "llm_admission" not in client.get("/api/health").json()
@@ -233,6 +233,22 @@ class TestApplicationRoutes:
         resp = seeded_client.post("/api/jobs/job_1/apply", json={"job_id": "job_1"}, headers=auth_header(token))
         assert resp.status_code == 409
 
+    def test_external_postings_point_to_apply_link(self, seeded_client, seed_db):
+        seed_db.store["jobs"]["ext_1"] = {
+            **seed_db.store["jobs"]["job_1"], "id": "ext_1", "company_id": None,
+            "source": "jsearch", "apply_link": "https://example.com/apply/1",
+        }
+        token, _ = register_user(seeded_client, email="ext@test.com", role="seeker")
+        resp = seeded_client.post("/api/jobs/ext_1/apply", json={"job_id": "ext_1"}, headers=auth_header(token))
+        assert resp.status_code == 400
+        assert "https://example.com/apply/1" in resp.json()["detail"]
+        assert "applications" not in seed_db.store or not seed_db.store["applications"]
+
+        company, _ = register_user(seeded_client, email="extco@test.com", role="company", company_name="ExtCo")
+        for method, path in (("get", "/api/jobs/ext_1/applications"), ("delete", "/api/jobs/ext_1")):
+            resp = getattr(seeded_client, method)(path, headers=auth_header(company))
+            assert resp.status_code == 400, path
+
     def test_get_my_applications(self, seeded_client):
         token, _ = register_user(seeded_client, email="myapps@test.com", role="seeker")
         seeded_client.post("/api/jobs/job_1/apply", json={"job_id": "job_1"}, headers=auth_header(token))
@@ -0,0 +1,99 @@
+"""
+Integration tests for /api/features endpoints.
+"""
+
+import pytest
+
+import api.routes.features as features_routes
+from tests.conftest import auth_header, register_user
+
+FEATURE = {
+    "title": "Dark mode for the dashboard",
+    "description": "Please add a dark theme to every dashboard page.",
+    "category": "General",
+}
+
+
+class TestFeatureAuthors:
+
+    @pytest.mark.integration
+    def test_author_stored_on_feature_and_comment(self, client, mock_supabase):
+        token, _ = register_user(client, email="fa@test.com", role="recruiter", name="Rita")
+        feature = client.post("/api/features", json=FEATURE, headers=auth_header(token)).json()
+        assert (feature["user_name"], feature["user_role"]) == ("Rita", "recruiter")
+        row = mock_supabase.store["feature_requests"][feature["id"]]
+        assert (row["author_name"], row["author_role"]) == ("Rita", "recruiter")
+
+        resp = client.post(f"/api/features/{feature['id']}/comments", json={"content": "+1"},
+                           headers=auth_header(token))
+        assert resp.status_code == 201
+        assert resp.json()["user_name"] == "Rita"
+
+    @pytest.mark.integration
+    def test_board_renders_without_author_lookups(self, client, monkeypatch):
+        token_s, _ = register_user(client, email="fs@test.com", role="seeker", name="Sam")
+        token_r, _ = register_user(client, email="fr@test.com", role="recruiter", name="Rita")
+        for token in (token_s, token_r):
+            client.post("/api/features", json=FEATURE, headers=auth_header(token))
+
+        def no_lookup(_):
+            raise AssertionError("author looked up per row")
+
+        monkeypatch.setattr("api.core.database.get_user_by_id", no_lookup)
+        monkeypatch.setattr(features_routes, "get_user_by_id", no_lookup, raising=False)
+        board = client.get("/api/features").json()
+        assert {f["user_name"] for f in board} == {"Sam", "Rita"}
+
+        recruiters = client.get("/api/features?role=recruiter&limit=1").json()
+        assert [f["user_name"] for f in recruiters] == ["Rita"]
+
+
+class TestBoardCache:
+
+    @pytest.mark.integration
+    def test_anonymous_repeat_views_skip_the_database(self, client, monkeypatch):
+        token, _ = register_user(client, email="bc@test.com", name="Bea")
+        client.post("/api/features", json=FEATURE, headers=auth_header(token))
+        assert len(client.get("/api/features").json()) == 1
+
+        def no_query(*args, **kwargs):
+            raise AssertionError("board read from the database")
+
+        monkeypatch.setattr(features_routes, "get_feature_requests", no_query)
+        monkeypatch.setattr(features_routes, "get_comment_counts", no_query)
+        assert len(client.get("/api/features").json()) == 1
+
+    @pytest.mark.integration
+    def test_writes_update_cached_board_and_vote_overlay(self, client):
+        token_a, _ = register_user(client, email="bv_a@test.com", name="Ann")
+        token_b, _ = register_user(client, email="bv_b@test.com", name="Ben")
+        first = client.post("/api/features", json=FEATURE, headers=auth_header(token_a)).json()
+        client.get("/api/features")  # warm the board
+        second = client.post("/api/features", json={**FEATURE, "title": "Saved searches"},
+                             headers=auth_header(token_a)).json()
+
+        client.post(f"/api/features/{second['id']}/vote", headers=auth_header(token_b))
+        client.post(f"/api/features/{first['id']}/comments", json={"content": "Yes please"},
+                    headers=auth_header(token_b))
+
+        board = client.get("/api/features", headers=auth_header(token_b)).json()
+        assert [(f["id"], f["vote_count"], f["user_has_voted"]) for f in board] == [
+            (second["id"], 1, True), (first["id"], 0, False),
+        ]
+        assert board[1]["comment_count"] == 1
+        assert not any(f["user_has_voted"] for f in client.get("/api/features").json())
+
+
+class TestStatusUpdate:
+
+    @pytest.mark.integration
+    def test_admin_check_matches_admin_routes(self, client):
+        author, _ = register_user(client, email="su_author@test.com")
+        admin, _ = register_user(client, email="Admin@HireFlow.com", name="Admin")
+        feature = client.post("/api/features", json=FEATURE, headers=auth_header(author)).json()
+
+        url = f"/api/features/{feature['id']}/status"
+        assert client.patch(url, json={"status": "planned"}, headers=auth_header(author)).status_code == 403
+        resp = client.patch(url, json={"status": "planned"}, headers=auth_header(admin))
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["status"] == "planned"
@@ -0,0 +1,121 @@
+"""
+Integration tests for conditional GETs on public read endpoints.
+"""
+
+import pytest
+
+import api.core.database as db
+import api.routes.jobs as jobs_routes
+from tests.conftest import auth_header, register_user
+
+POST = {
+    "slug": "hiring-in-2026",
+    "title": "Hiring in 2026",
+    "body_markdown": "Some thoughts on hiring.",
+    "body_html": "<p>Some thoughts on hiring.</p>",
+    "author_name": "Editor",
+    "category": "hiring-signals",
+    "status": "published",
+}
+
+
+def _revalidate(client, url, resp, **kwargs):
+    return client.get(url, headers={"If-None-Match": resp.headers["etag"], **kwargs.pop("headers", {})}, **kwargs)
+
+
+class TestJobsCaching:
+
+    @pytest.mark.integration
+    def test_list_revalidates_until_a_job_changes(self, seeded_client):
+        first = seeded_client.get("/api/jobs")
+        assert first.status_code == 200
+        assert first.headers["cache-control"].startswith("public")
+        again = _revalidate(seeded_client, "/api/jobs", first)
+        assert again.status_code == 304
+        assert again.content == b""
+
+        db.close_job("job_3")
+        assert _revalidate(seeded_client, "/api/jobs", first).status_code == 200
+
+    @pytest.mark.integration
+    def test_list_304_skips_the_listing_queries(self, seeded_client, monkeypatch):
+        first = seeded_client.get("/api/jobs")
+
+        def no_query(*args, **kwargs):
+            raise AssertionError("listing queried on a 304")
+
+        monkeypatch.setattr(jobs_routes, "search_jobs", no_query)
+        monkeypatch.setattr(jobs_routes, "get_job_company_names", no_query)
+        assert _revalidate(seeded_client, "/api/jobs", first).status_code == 304
+
+    @pytest.mark.integration
+    def test_item_304_skips_building_the_response(self, seeded_client, monkeypatch):
+        first = seeded_client.get("/api/jobs/job_1")
+        assert first.status_code == 200 and "last-modified" in first.headers
+
+        built = []
+        real_format = jobs_routes._format_job
+        monkeypatch.setattr(jobs_routes, "_format_job", lambda job, *a: built.append(job["id"]) or real_format(job, *a))
+        assert _revalidate(seeded_client, "/api/jobs/job_1", first).status_code == 304
+        assert built == []
+
+        db.update_job("job_1", {"title": "Staff React Developer"})
+        changed = _revalidate(seeded_client, "/api/jobs/job_1", first)
+        assert changed.status_code == 200
+        assert changed.json()["title"] == "Staff React Developer"
+
+    @pytest.mark.integration
+    def test_employer_rename_changes_etags(self, seeded_client):
+        item = seeded_client.get("/api/jobs/job_1")
+        listing = seeded_client.get("/api/jobs")
+        db.update_user("comp_1", {"company_name": "TechVault Labs"})
+
+        item_again = _revalidate(seeded_client, "/api/jobs/job_1", item)
+        assert item_again.status_code == 200
+        assert item_again.json()["company_name"] == "TechVault Labs"
+        listing_again = _revalidate(seeded_client, "/api/jobs", listing)
+        assert listing_again.status_code == 200
+        assert "TechVault Labs" in {j["company_name"] for j in listing_again.json()}
+
+
+class TestBlogCaching:
+
+    @pytest.mark.integration
+    def test_post_and_listings(self, client):
+        token, _ = register_user(client, email="editor@test.com", name="Editor")
+        assert client.post("/api/blog/admin/posts", json=POST, headers=auth_header(token)).status_code == 201
+
+        for url in ("/api/blog", "/api/blog/categories", f"/api/blog/{POST['slug']}"):
+            first = client.get(url)
+            assert first.status_code == 200, url
+            assert _revalidate(client, url, first).status_code == 304, url
+
+        # View counting does not invalidate cached copies of the post
+        post = client.get(f"/api/blog/{POST['slug']}")
+        assert _revalidate(client, f"/api/blog/{POST['slug']}", post).status_code == 304
+
+        listing = client.get("/api/blog")
+        client.delete(f"/api/blog/admin/posts/{POST['slug']}", headers=auth_header(token))
+        assert _revalidate(client, "/api/blog", listing).status_code == 200
+
+
+class TestFeaturesCaching:
+
+    @pytest.mark.integration
+    def test_board_revalidates_per_viewer(self, client):
+        token, _ = register_user(client, email="fv@test.com", name="Voter")
+        feature = client.post("/api/features", json={
+            "title": "Dark mode please", "description": "A dark theme for every page.", "category": "General",
+        }, headers=auth_header(token)).json()
+
+        anon = client.get("/api/features")
+        assert anon.headers["cache-control"].startswith("public")
+        assert _revalidate(client, "/api/features", anon).status_code == 304
+
+        mine = client.get("/api/features", headers=auth_header(token))
+        assert mine.headers["cache-control"].startswith("private")
+        assert "Authorization" in mine.headers["vary"]
+
+        client.post(f"/api/features/{feature['id']}/vote", headers=auth_header(token))
+        assert _revalidate(client, "/api/features", anon).status_code == 200
+        assert _revalidate(client, "/api/features", mine, headers=auth_header(token)).status_code == 200
@@ -0,0 +1,384 @@
+"""
+Integration tests for /api/matcher endpoints.
+
+The LLM provider is replaced by an in-process fake so the routes run
+end-to-end against the mocked DB without network access.
+"""
+
+import json
+
+import pytest
+
+import api.services.llm as llm
+
+
+class FakeProvider(llm._Provider):
+    name = "fake-test"
+    default_model = "fake-model"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def complete(self, system, user, json_mode):
+        self.calls += 1
+        if json_mode:
+            return '{"overall_score": 81, "summary": "Strong fit.", "keyword_matches": ["React"]}'
+        return "Dear hiring manager, I am excited to apply."
+
+    async def stream(self, system, user):
+        self.calls += 1
+        for word in ["Dear ", "hiring ", "manager."]:
+            yield word
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(llm, "_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_provider", provider)
+    return provider
+
+
+EXTERNAL_JD = "Senior React Developer. Requirements: React, TypeScript, 5+ years experience."
+
+
+class TestMatcherAnalyze:
+
+    @pytest.mark.integration
+    def test_analyze_with_profile_resume(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 200, resp.text
+        data = resp.json()
+        assert data["id"].startswith("ma_")
+        assert data["status"] == "complete"
+        assert data["analysis"]["overall_score"] == 81
+        assert data["analysis"]["source"] == "llm"
+
+    @pytest.mark.integration
+    def test_instant_returns_local_estimate(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 200, resp.text
+        data = resp.json()
+        # Local estimate; the LLM analysis refines it in the background
+        assert data["status"] == "pending"
+        assert data["analysis"]["source"] == "local"
+        assert "React" in data["analysis"]["keyword_matches"]
+        assert "TypeScript" in data["analysis"]["keyword_matches"]
+
+    @pytest.mark.integration
+    def test_instant_estimate_uses_internal_job_skills(self, client, seed_db, seeker_with_profile, monkeypatch):
+        import api.services.ai as ai
+        jobs = []
+        real = ai.local_match_analysis
+
+        def spy(resume_text, jd_text, job=None):
+            jobs.append(job and job["id"])
+            return real(resume_text, jd_text, job=job)
+
+        monkeypatch.setattr(ai, "local_match_analysis", spy)
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "upload", "resume_text": "React and Redux developer, 7 years",
+            "jd_source": "internal", "job_id": "job_1",
+        })
+        assert resp.status_code == 200, resp.text
+        assert jobs == ["job_1"]
+        analysis = resp.json()["analysis"]
+        assert analysis["keyword_matches"] == ["React", "Redux"]
+        # Only the posting's required skills are reported as gaps
+        assert analysis["gaps"] == ["No mention of TypeScript", "No mention of JavaScript"]
+
+    @pytest.mark.integration
+    def test_analysis_persisted_in_history(self, client, seeker_with_profile, fake_llm):
+        r = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "upload", "resume_text": "React dev",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        analysis_id = r.json()["id"]
+        resp = client.get(f"/api/matcher/history/{analysis_id}", headers=seeker_with_profile)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["status"] == "complete"
+        assert data["analysis"]["summary"] == "Strong fit."
+        assert data["analysis"]["overall_score"] == 81
+        assert data["analysis"]["source"] == "llm"
+
+    @pytest.mark.integration
+    def test_llm_failure_keeps_local_estimate(self, client, seeker_with_profile, monkeypatch):
+        class BrokenProvider(FakeProvider):
+            async def complete(self, system, user, json_mode):
+                raise ValueError("provider exploded")
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", BrokenProvider())
+        r = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        saved = client.get(f"/api/matcher/history/{r.json()['id']}", headers=seeker_with_profile).json()
+        assert saved["status"] == "failed"
+        assert saved["analysis"] == r.json()["analysis"]
+
+        history = client.get("/api/matcher/history", headers=seeker_with_profile).json()
+        assert history[0]["status"] == "failed"
+
+    @pytest.mark.integration
+    def test_llm_failure_is_502(self, client, seeker_with_profile, monkeypatch):
+        class BrokenProvider(FakeProvider):
+            async def complete(self, system, user, json_mode):
+                raise ValueError("provider exploded")
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", BrokenProvider())
+        resp = client.post("/api/matcher/analyze", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 502
+
+    @pytest.mark.integration
+    def test_missing_api_key_is_503(self, client, seeker_with_profile, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/analyze", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "upload", "resume_text": "React dev",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 503
+
+    @pytest.mark.integration
+    def test_missing_api_key_returns_local_analysis_when_instant(self, client, seeker_with_profile, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "upload", "resume_text": "React dev",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["status"] == "complete"
+        assert data["analysis"]["source"] == "local"
+        assert data["analysis"]["keyword_misses"] == ["TypeScript"]
+
+    @pytest.mark.integration
+    def test_generate_without_api_key_is_503(self, client, seeker_with_profile, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/generate", headers=seeker_with_profile, json={
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 503
+
+
+class TestMatcherGenerate:
+
+    @pytest.mark.integration
+    def test_generate_cover_letter(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/generate", headers=seeker_with_profile, json={
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["generated_cover_letter"].startswith("Dear hiring manager")
+
+    @pytest.mark.integration
+    def test_improve_requires_cover_letter(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/generate", headers=seeker_with_profile, json={
+            "mode": "improve", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 400
+
+
+class TestMatcherCaching:
+
+    @pytest.mark.integration
+    def test_repeat_analysis_hits_cache(self, client, seeker_with_profile, fake_llm):
+        body = {
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        }
+        r1 = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json=body)
+        r2 = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json=body)
+        assert r1.json()["status"] == "pending"
+        # The cached LLM analysis is returned directly, with no background work
+        assert r2.json()["status"] == "complete"
+        assert r2.json()["analysis"]["overall_score"] == 81
+        assert r1.json()["id"] != r2.json()["id"]
+        assert fake_llm.calls == 1
+
+    @pytest.mark.integration
+    def test_refresh_bypasses_cache(self, client, seeker_with_profile, fake_llm):
+        body = {
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        }
+        client.post("/api/matcher/analyze", headers=seeker_with_profile, json=body)
+        client.post("/api/matcher/analyze", headers=seeker_with_profile, json={**body, "refresh": True})
+        assert fake_llm.calls == 2
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestMatcherStreaming:
+
+    @pytest.mark.integration
+    def test_stream_relays_tokens_and_persists(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/generate/stream", headers=seeker_with_profile, json={
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(resp.text)
+        assert events[0][0] == "start"
+        assert [d["text"] for e, d in events if e == "token"] == ["Dear ", "hiring ", "manager."]
+        done = events[-1]
+        assert done[0] == "done"
+        assert done[1]["generated_cover_letter"] == "Dear hiring manager."
+
+        saved = client.get(f"/api/matcher/history/{done[1]['id']}", headers=seeker_with_profile)
+        assert saved.json()["generated_cover_letter"] == "Dear hiring manager."
+
+    @pytest.mark.integration
+    def test_stream_validates_before_streaming(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/generate/stream", headers=seeker_with_profile, json={
+            "mode": "improve", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 400
+        assert fake_llm.calls == 0
+
+    @pytest.mark.integration
+    def test_stream_reports_provider_errors(self, client, seeker_with_profile, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/generate/stream", headers=seeker_with_profile, json={
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        events = _parse_sse(resp.text)
+        assert events[-1][0] == "error"
+        assert events[-1][1]["status"] == 503
+
+
+class TestMatcherBatch:
+
+    @pytest.mark.integration
+    def test_batch_streams_and_persists_each_result(self, client, seed_db, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile",
+            "job_ids": ["job_1", "job_2"],
+            "jd_texts": [EXTERNAL_JD + " Remote."],
+            "refresh": True,
+        })
+        assert resp.status_code == 200, resp.text
+        events = _parse_sse(resp.text)
+        assert events[0] == ("start", {"total": 3})
+        results = [d for e, d in events if e == "result"]
+        assert sorted(r["index"] for r in results) == [0, 1, 2]
+        assert {r["job_id"] for r in results} == {"job_1", "job_2", None}
+        assert events[-1] == ("done", {"completed": 3, "failed": 0})
+        assert fake_llm.calls == 3
+
+        history = client.get("/api/matcher/history", headers=seeker_with_profile).json()
+        assert len(history) == 3
+
+    @pytest.mark.integration
+    def test_missing_job_is_reported_per_item(self, client, seed_db, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile", "job_ids": ["job_1", "job_missing"],
+        })
+        events = _parse_sse(resp.text)
+        errors = [d for e, d in events if e == "error"]
+        assert errors == [{"index": 1, "job_id": "job_missing", "status": 404, "detail": "Job not found."}]
+        assert events[-1] == ("done", {"completed": 1, "failed": 1})
+
+    @pytest.mark.integration
+    def test_batch_resolves_profile_and_jobs_once(self, client, seed_db, seeker_with_profile, fake_llm, monkeypatch):
+        import api.routes.matcher as matcher
+        lookups = {"user": 0, "jobs": 0}
+        real_user, real_jobs = matcher.get_user_by_id, matcher.get_jobs_by_ids
+
+        def count_user(uid):
+            lookups["user"] += 1
+            return real_user(uid)
+
+        def count_jobs(ids):
+            lookups["jobs"] += 1
+            return real_jobs(ids)
+
+        monkeypatch.setattr(matcher, "get_user_by_id", count_user)
+        monkeypatch.setattr(matcher, "get_jobs_by_ids", count_jobs)
+        client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile", "job_ids": ["job_1", "job_2", "job_3"],
+        })
+        assert lookups == {"user": 1, "jobs": 1}
+
+    @pytest.mark.integration
+    def test_batch_size_is_validated(self, client, seeker_with_profile, fake_llm):
+        empty = client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile",
+        })
+        assert empty.status_code == 400
+        too_many = client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile", "jd_texts": [EXTERNAL_JD] * 26,
+        })
+        assert too_many.status_code == 422
+        too_long = client.post("/api/matcher/analyze/batch", headers=seeker_with_profile, json={
+            "resume_source": "profile", "jd_texts": [EXTERNAL_JD, "x" * 8001],
+        })
+        assert too_long.status_code == 422
+        assert fake_llm.calls == 0
+
+
+class TestMatcherRateLimiting:
+
+    @pytest.mark.integration
+    def test_exhausted_quota_returns_429_with_retry_after(self, client, seeker_with_profile, fake_llm, monkeypatch):
+        from api.services.rate_limit import AdmissionController
+        monkeypatch.setattr(llm, "admission", AdmissionController(rpm=1, tpm=100_000, queue_timeout=1))
+        body = {
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        }
+        assert client.post("/api/matcher/generate", headers=seeker_with_profile, json=body).status_code == 200
+        resp = client.post("/api/matcher/generate", headers=seeker_with_profile, json=body)
+        assert resp.status_code == 429
+        assert int(resp.headers["Retry-After"]) >= 1
+        assert fake_llm.calls == 1
+
+    @pytest.mark.integration
+    def test_shed_background_analysis_is_marked_failed(self, client, seeker_with_profile, fake_llm, monkeypatch):
+        from api.services.rate_limit import AdmissionController
+        monkeypatch.setattr(llm, "admission", AdmissionController(rpm=1, tpm=100_000, queue_timeout=1))
+        body = {
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD, "refresh": True,
+        }
+        client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json=body)
+        r2 = client.post("/api/matcher/analyze?instant=true", headers=seeker_with_profile, json=body)
+        assert r2.status_code == 200
+        saved = client.get(f"/api/matcher/history/{r2.json()['id']}", headers=seeker_with_profile).json()
+        assert saved["status"] == "failed"
+        assert fake_llm.calls == 1
+
+    @pytest.mark.integration
+    def test_cache_hits_do_not_consume_quota(self, client, seeker_with_profile, fake_llm, reset_llm_admission):
+        body = {
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        }
+        for _ in range(3):
+            client.post("/api/matcher/analyze", headers=seeker_with_profile, json=body)
+        assert reset_llm_admission.stats()["admitted"] == 1
@@ -0,0 +1,104 @@
+"""
+Integration tests for the 202 + polling task endpoints.
+
+Tasks are executed by calling task_queue.drain() directly, standing in
+for a separate `python -m tools.worker` process.
+"""
+
+import asyncio
+
+import pytest
+
+import api.services.llm as llm
+from api.services import task_queue
+from tests.conftest import auth_header, register_user
+from tests.integration.test_matcher_routes import EXTERNAL_JD, FakeProvider
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(llm, "_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_provider", provider)
+    return provider
+
+
+def _drain():
+    asyncio.run(task_queue.drain())
+
+
+class TestMatcherTasks:
+
+    @pytest.mark.integration
+    def test_analyze_async_returns_202_then_result(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze/async", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 202, resp.text
+        accepted = resp.json()
+        assert resp.headers["Location"] == accepted["status_url"]
+        assert fake_llm.calls == 0  # nothing ran inside the request
+
+        queued = client.get(accepted["status_url"], headers=seeker_with_profile).json()
+        assert queued["status"] == "queued"
+        assert queued["result"] is None
+
+        _drain()
+        done = client.get(accepted["status_url"], headers=seeker_with_profile).json()
+        assert done["status"] == "succeeded"
+        assert done["result"]["analysis"]["overall_score"] == 81
+
+        saved = client.get(f"/api/matcher/history/{done['result']['id']}", headers=seeker_with_profile)
+        assert saved.json()["analysis"]["summary"] == "Strong fit."
+
+    @pytest.mark.integration
+    def test_generate_async_validates_up_front(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/generate/async", headers=seeker_with_profile, json={
+            "mode": "improve", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        assert resp.status_code == 400
+
+    @pytest.mark.integration
+    def test_missing_api_key_dead_letters(self, client, seeker_with_profile, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        resp = client.post("/api/matcher/generate/async", headers=seeker_with_profile, json={
+            "mode": "generate", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        _drain()
+        task = client.get(resp.json()["status_url"], headers=seeker_with_profile).json()
+        assert task["status"] == "dead"
+        assert "LLM_API_KEY" in task["error"]
+
+    @pytest.mark.integration
+    def test_task_status_is_owner_only(self, client, seeker_with_profile, fake_llm):
+        resp = client.post("/api/matcher/analyze/async", headers=seeker_with_profile, json={
+            "mode": "analyze", "resume_source": "profile",
+            "jd_source": "external", "jd_text": EXTERNAL_JD,
+        })
+        other, _ = register_user(client, email="other@test.com", role="seeker", name="Other")
+        assert client.get(resp.json()["status_url"], headers=auth_header(other)).status_code == 403
+        assert client.get("/api/tasks/task_missing", headers=seeker_with_profile).status_code == 404
+
+
+class TestBlogEnrichTasks:
+
+    @pytest.mark.integration
+    def test_enrich_async(self, client, seeker_with_profile, monkeypatch):
+        class EnrichProvider(FakeProvider):
+            async def complete(self, system, user, json_mode):
+                return '{"excerpt": "Short.", "seo_title": "T", "related_skills": ["SQL"]}'
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", EnrichProvider())
+        resp = client.post("/api/blog/admin/enrich/async", headers=seeker_with_profile, json={
+            "title": "Nailing the interview", "body_markdown": "Some body text here",
+            "category": "career-playbook",
+        })
+        assert resp.status_code == 202
+        _drain()
+        task = client.get(resp.json()["status_url"], headers=seeker_with_profile).json()
+        assert task["status"] == "succeeded"
+        assert task["result"]["excerpt"] == "Short."
@@ -2,6 +2,9 @@
 Integration tests for /api/chat endpoints.
 """
 
+import asyncio
+import json
+
 import pytest
 from tests.conftest import register_user, auth_header
 
@@ -95,3 +98,269 @@ class TestConversations:
         token_b, _ = register_user(seeded_client, email="b@test.com", role="seeker", name="B")
         resp = seeded_client.get(f"/api/chat/conversations/{conv_id}/messages", headers=auth_header(token_b))
         assert resp.status_code == 403
+
+
+class TestRealtime:
+
+    @staticmethod
+    def _next(ws, kind):
+        while True:
+            event = ws.receive_json()
+            if event["type"] == kind:
+                return event
+
+    @pytest.mark.integration
+    def test_rejects_missing_or_bad_token(self, client):
+        from starlette.websockets import WebSocketDisconnect
+        for url in ("/api/chat/ws", "/api/chat/ws?token=not-a-jwt"):
+            with pytest.raises(WebSocketDisconnect) as exc:
+                with client.websocket_connect(url):
+                    pass
+            assert exc.value.code == 1008
+
+    @pytest.mark.integration
+    def test_new_message_pushed_to_recipient(self, client):
+        token_a, user_a = register_user(client, email="ws_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="ws_b@test.com", name="Bob")
+        with client.websocket_connect(f"/api/chat/ws?token={token_b}") as ws:
+            ready = ws.receive_json()
+            assert ready == {"type": "ready", "user_id": user_b["id"], "conversations": []}
+            client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": "Hi Bob",
+            }, headers=auth_header(token_a))
+            event = self._next(ws, "message")
+        assert event["message"]["content"] == "Hi Bob"
+        assert event["message"]["sender_name"] == "Alice"
+
+    @pytest.mark.integration
+    def test_header_auth_and_read_receipt(self, client):
+        token_a, user_a = register_user(client, email="rr_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="rr_b@test.com", name="Bob")
+        conv_id = client.post("/api/chat/messages", json={
+            "recipient_id": user_b["id"], "content": "Seen?",
+        }, headers=auth_header(token_a)).json()["conversation_id"]
+
+        with client.websocket_connect("/api/chat/ws", headers=auth_header(token_a)) as ws:
+            assert ws.receive_json()["conversations"] == [conv_id]
+            client.get(f"/api/chat/conversations/{conv_id}/messages", headers=auth_header(token_b))
+            event = self._next(ws, "read")
+        assert event["reader_id"] == user_b["id"]
+        assert event["last_read_message_id"]
+
+    @pytest.mark.integration
+    def test_typing_relayed_to_other_participant(self, client):
+        token_a, user_a = register_user(client, email="ty_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="ty_b@test.com", name="Bob")
+        conv_id = client.post("/api/chat/messages", json={
+            "recipient_id": user_b["id"], "content": "Hello",
+        }, headers=auth_header(token_a)).json()["conversation_id"]
+
+        with client.websocket_connect(f"/api/chat/ws?token={token_a}") as ws_a, \
+                client.websocket_connect(f"/api/chat/ws?token={token_b}") as ws_b:
+            ws_a.receive_json()
+            ws_b.receive_json()
+            ws_a.send_json({"type": "typing", "conversation_id": conv_id})
+            ws_a.send_json({"type": "ping"})
+            assert ws_a.receive_json() == {"type": "pong"}  # no typing echo to the sender
+            event = ws_b.receive_json()
+        assert event == {"type": "typing", "conversation_id": conv_id, "user_id": user_a["id"], "name": "Alice"}
+
+    @pytest.mark.integration
+    def test_frames_for_foreign_conversation_refused(self, client):
+        token_a, _ = register_user(client, email="fo_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="fo_b@test.com", name="Bob")
+        token_c, _ = register_user(client, email="fo_c@test.com", name="Eve")
+        conv_id = client.post("/api/chat/messages", json={
+            "recipient_id": user_b["id"], "content": "Private",
+        }, headers=auth_header(token_a)).json()["conversation_id"]
+
+        with client.websocket_connect(f"/api/chat/ws?token={token_c}") as ws:
+            ws.receive_json()
+            ws.send_json({"type": "read", "conversation_id": conv_id})
+            assert ws.receive_json()["detail"] == "Not a participant"
+
+
+class TestMessagePaging:
+
+    @staticmethod
+    def _thread(client, n):
+        token_a, _ = register_user(client, email="page_a@test.com", name="Alice")
+        _, user_b = register_user(client, email="page_b@test.com", name="Bob")
+        conv_id = None
+        for i in range(n):
+            conv_id = client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": f"m{i}",
+            }, headers=auth_header(token_a)).json()["conversation_id"]
+        return token_a, conv_id
+
+    @pytest.mark.integration
+    def test_newest_page_then_since_and_before(self, client):
+        token, conv_id = self._thread(client, 7)
+        url = f"/api/chat/conversations/{conv_id}/messages"
+
+        latest = client.get(f"{url}?limit=3", headers=auth_header(token)).json()
+        assert [m["content"] for m in latest] == ["m4", "m5", "m6"]
+        assert latest[0]["sender_name"] == "Alice"
+
+        older = client.get(f"{url}?limit=3&before={latest[0]['cursor']}", headers=auth_header(token)).json()
+        assert [m["content"] for m in older] == ["m1", "m2", "m3"]
+
+        newer = client.get(f"{url}?since={older[-1]['cursor']}", headers=auth_header(token)).json()
+        assert [m["content"] for m in newer] == ["m4", "m5", "m6"]
+        assert client.get(f"{url}?since={newer[-1]['cursor']}", headers=auth_header(token)).json() == []
+
+    @pytest.mark.integration
+    def test_full_history_without_cursor_or_limit(self, client, monkeypatch):
+        import api.routes.chat as chat_routes
+        monkeypatch.setattr(chat_routes, "_PAGE_SIZE", 2)
+        token, conv_id = self._thread(client, 5)
+        url = f"/api/chat/conversations/{conv_id}/messages"
+        history = client.get(url, headers=auth_header(token)).json()
+        assert [m["content"] for m in history] == ["m0", "m1", "m2", "m3", "m4"]
+        # Cursor reads stay paged
+        older = client.get(f"{url}?before={history[-1]['cursor']}", headers=auth_header(token)).json()
+        assert [m["content"] for m in older] == ["m2", "m3"]
+
+    @pytest.mark.integration
+    def test_sender_names_resolved_once_per_page(self, client, monkeypatch):
+        import api.routes.chat as chat_routes
+        token, conv_id = self._thread(client, 5)
+        lookups = []
+        real = chat_routes.get_user_names
+        monkeypatch.setattr(chat_routes, "get_user_names", lambda ids: lookups.append(ids) or real(ids))
+        resp = client.get(f"/api/chat/conversations/{conv_id}/messages", headers=auth_header(token))
+        assert len(resp.json()) == 5
+        assert len(lookups) == 1
+
+    @pytest.mark.integration
+    def test_invalid_cursor_rejected(self, client):
+        token, conv_id = self._thread(client, 1)
+        resp = client.get(f"/api/chat/conversations/{conv_id}/messages?since=bm9wZQ", headers=auth_header(token))
+        assert resp.status_code == 400
+
+
+class TestReadState:
+
+    @pytest.mark.integration
+    def test_unread_count_past_twenty_and_read_flags(self, client):
+        token_a, _ = register_user(client, email="un_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="un_b@test.com", name="Bob")
+        for i in range(25):
+            conv_id = client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": f"m{i}",
+            }, headers=auth_header(token_a)).json()["conversation_id"]
+
+        [conv] = client.get("/api/chat/conversations", headers=auth_header(token_b)).json()
+        assert conv["unread_count"] == 25
+        url = f"/api/chat/conversations/{conv_id}/messages"
+        assert not any(m["read"] for m in client.get(url, headers=auth_header(token_a)).json())
+
+        client.get(f"{url}?limit=1", headers=auth_header(token_b))
+        [conv] = client.get("/api/chat/conversations", headers=auth_header(token_b)).json()
+        assert conv["unread_count"] == 0
+        assert all(m["read"] for m in client.get(url, headers=auth_header(token_a)).json())
+
+    @pytest.mark.integration
+    def test_read_only_up_to_returned_page(self, client):
+        token_a, _ = register_user(client, email="rp_a@test.com", name="Alice")
+        token_b, user_b = register_user(client, email="rp_b@test.com", name="Bob")
+        sent = [
+            client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": f"m{i}",
+            }, headers=auth_header(token_a)).json()
+            for i in range(5)
+        ]
+        url = f"/api/chat/conversations/{sent[0]['conversation_id']}/messages"
+
+        page = client.get(f"{url}?since={sent[0]['cursor']}&limit=2", headers=auth_header(token_b)).json()
+        assert [m["content"] for m in page] == ["m1", "m2"]
+        [conv] = client.get("/api/chat/conversations", headers=auth_header(token_b)).json()
+        assert conv["unread_count"] == 2
+
+        # Scrolling back never moves the watermark backwards
+        client.get(f"{url}?before={sent[1]['cursor']}", headers=auth_header(token_b))
+        [conv] = client.get("/api/chat/conversations", headers=auth_header(token_b)).json()
+        assert conv["unread_count"] == 2
+
+
+class TestInboxStream:
+
+    @staticmethod
+    def _parse(frame):
+        fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+        return fields.get("id"), fields["event"], json.loads(fields["data"])
+
+    @classmethod
+    def _collect(cls, user, n, last_event_id=None, during=None):
+        from api.routes.chat import inbox_events
+
+        async def run():
+            stream = inbox_events(user, last_event_id)
+            frames = [cls._parse(await stream.__anext__())]
+            if during:
+                during()
+            while len(frames) < n:
+                frames.append(cls._parse(await asyncio.wait_for(stream.__anext__(), 2)))
+            await stream.aclose()
+            return frames
+
+        return asyncio.run(run())
+
+    @pytest.mark.integration
+    def test_requires_auth(self, client):
+        assert client.get("/api/chat/inbox/stream").status_code == 401
+        assert client.get("/api/chat/inbox/stream?token=not-a-jwt").status_code == 401
+
+    @pytest.mark.integration
+    def test_live_deltas_for_new_conversation(self, client):
+        token_a, user_a = register_user(client, email="ib_a@test.com", name="Alice")
+        _, user_b = register_user(client, email="ib_b@test.com", name="Bob")
+
+        def send():
+            client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": "Hi Bob",
+            }, headers=auth_header(token_a))
+
+        frames = self._collect(user_b, 4, during=send)
+        assert [f[1] for f in frames] == ["ready", "conversation", "message", "unread"]
+        assert frames[1][2]["participant_names"] == {user_a["id"]: "Alice", user_b["id"]: "Bob"}
+        assert frames[2][0] == frames[2][2]["message"]["cursor"]
+        assert frames[3][2]["unread_count"] == 1
+
+    @pytest.mark.integration
+    def test_resume_replays_missed_messages(self, client):
+        token_a, _ = register_user(client, email="rs_a@test.com", name="Alice")
+        _, user_b = register_user(client, email="rs_b@test.com", name="Bob")
+        sent = [
+            client.post("/api/chat/messages", json={
+                "recipient_id": user_b["id"], "content": f"m{i}",
+            }, headers=auth_header(token_a)).json()
+            for i in range(3)
+        ]
+        frames = self._collect(user_b, 4, last_event_id=sent[0]["cursor"])
+        assert [f[1] for f in frames] == ["ready", "message", "message", "unread"]
+        assert [f[2]["message"]["content"] for f in frames[1:3]] == ["m1", "m2"]
+        assert frames[3][2]["unread_count"] == 3
+
+    @pytest.mark.integration
+    def test_resume_after_long_gap_resyncs_without_scanning(self, client, monkeypatch):
+        import api.routes.chat as chat_routes
+        token_a, _ = register_user(client, email="rs_old_a@test.com", name="Alice")
+        _, user_b = register_user(client, email="rs_old_b@test.com", name="Bob")
+        sent = client.post("/api/chat/messages", json={
+            "recipient_id": user_b["id"], "content": "long ago",
+        }, headers=auth_header(token_a)).json()
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError("replay scanned messages")
+
+        monkeypatch.setattr(chat_routes, "_RESUME_MAX_AGE", 0)
+        monkeypatch.setattr(chat_routes, "get_messages_for_conversations", no_scan)
+        frames = self._collect(user_b, 2, last_event_id=sent["cursor"])
+        assert frames[1][1] == "resync"
+
+    @pytest.mark.integration
+    def test_resume_with_bad_id_asks_for_resync(self, client):
+        _, user = register_user(client, email="rs_bad@test.com", name="Lost")
+        frames = self._collect(user, 2, last_event_id="not-a-cursor")
+        assert frames[1][1] == "resync"
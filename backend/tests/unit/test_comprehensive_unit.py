@@ -376,21 +376,18 @@ class TestDatabaseChatOps:
         msgs = get_messages("c1")
         assert len(msgs) == 2
 
-    def test_mark_messages_read(self, mock_supabase):
+    def test_mark_conversation_read(self, mock_supabase):
         from api.core.database import (
-            create_conversation, create_message, mark_messages_read, get_messages,
+            create_conversation, create_message, mark_conversation_read, get_read_watermarks,
         )
         create_conversation("c1", ["u1", "u2"])
-        create_message({"id": "m1", "conversation_id": "c1", "sender_id": "u1", "content": "Hello", "read": False})
-        create_message({"id": "m2", "conversation_id": "c1", "sender_id": "u2", "content": "Hi!", "read": False})
-        mark_messages_read("c1", "u2")  # u2 reads u1's messages
-        msgs = get_messages("c1")
-        # m1 (sent by u1) should now be read
-        m1 = next(m for m in msgs if m["id"] == "m1")
-        assert m1["read"] is True
-        # m2 (sent by u2) should still be unread (sender can't mark own as read)
-        m2 = next(m for m in msgs if m["id"] == "m2")
-        assert m2["read"] is False
+        create_message({"id": "m1", "conversation_id": "c1", "sender_id": "u1", "content": "Hello"})
+        create_message({"id": "m2", "conversation_id": "c1", "sender_id": "u2", "content": "Hi!"})
+        mark_conversation_read("c1", "u2")  # u2 reads up to the newest message
+        marks = get_read_watermarks("c1")
+        assert marks["u2"][1] == "m2"
+        # u1 hasn't read anything yet
+        assert marks["u1"] is None
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
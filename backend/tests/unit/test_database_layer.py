@@ -294,25 +294,46 @@ class TestConversationCRUD:
         msgs = db.get_messages("conv_msg")
         assert len(msgs) == 2
 
-    def test_mark_messages_read(self, mock_supabase):
+    def test_mark_conversation_read(self, mock_supabase):
         import api.core.database as db
         db.create_conversation("conv_read", ["u1", "u2"])
         db.create_message({
             "id": "mr1", "conversation_id": "conv_read",
-            "sender_id": "u1", "content": "Msg 1", "read": False,
+            "sender_id": "u1", "content": "Msg 1", "created_at": "2026-01-01T00:00:01+00:00",
         })
         db.create_message({
             "id": "mr2", "conversation_id": "conv_read",
-            "sender_id": "u2", "content": "Msg 2", "read": False,
+            "sender_id": "u1", "content": "Msg 2", "created_at": "2026-01-01T00:00:02+00:00",
         })
+        assert db.get_conversations_for_user("u2")[0]["unread_count"] == 2
 
-        # u2 marks messages as read — should only mark u1's messages
-        db.mark_messages_read("conv_read", "u2")
-        msgs = db.get_messages("conv_read")
-        for m in msgs:
-            if m["sender_id"] == "u1":
-                assert m["read"] is True
-            # u2's own message stays unread (neq sender_id filter)
+        # u2 reads: one watermark write, then u1's messages no longer count
+        mark = db.mark_conversation_read("conv_read", "u2")
+        assert mark == ("2026-01-01T00:00:02+00:00", "mr2")
+        assert db.get_read_watermarks("conv_read") == {"u1": None, "u2": mark}
+        assert db.get_conversations_for_user("u2")[0]["unread_count"] == 0
+        # Nothing new: no write
+        assert db.mark_conversation_read("conv_read", "u2", current=mark) is None
+
+        db.create_message({
+            "id": "mr3", "conversation_id": "conv_read",
+            "sender_id": "u1", "content": "Msg 3", "created_at": "2026-01-01T00:00:03+00:00",
+        })
+        assert db.get_conversations_for_user("u2")[0]["unread_count"] == 1
+
+    def test_unread_after_watermark_with_shared_timestamp(self, mock_supabase):
+        import api.core.database as db
+        db.create_conversation("conv_tie", ["u1", "u2"])
+        ts = "2026-01-01T00:00:01+00:00"
+        for msg_id in ("mt1", "mt2", "mt3"):
+            db.create_message({
+                "id": msg_id, "conversation_id": "conv_tie",
+                "sender_id": "u1", "content": msg_id, "created_at": ts,
+            })
+        # Read up to mt2: mt3 shares its timestamp but is still unread
+        db.mark_conversation_read("conv_tie", "u2", upto=(ts, "mt2"))
+        assert db.count_unread("conv_tie", "u2", (ts, "mt2")) == 1
+        assert db.get_conversations_for_user("u2")[0]["unread_count"] == 1
 
     def test_empty_conversations_for_new_user(self, mock_supabase):
         import api.core.database as db
@@ -366,3 +387,57 @@ class TestJsonbHelpers:
     def test_parse_none(self):
         from api.core.database import _parse_jsonb_fields_user
         assert _parse_jsonb_fields_user(None) is None
+
+
+class TestMessageCursors:
+
+    @pytest.mark.unit
+    def test_cursor_breaks_timestamp_ties_by_id(self, mock_supabase):
+        import api.core.database as db
+        db.create_conversation("conv_tie", ["u1", "u2"])
+        ts = "2026-01-01T00:00:00+00:00"
+        for msg_id in ("msg_a", "msg_b", "msg_c"):
+            db.create_message({"id": msg_id, "conversation_id": "conv_tie", "sender_id": "u1",
+                               "content": msg_id, "created_at": ts})
+        db.create_message({"id": "msg_0", "conversation_id": "conv_tie", "sender_id": "u1",
+                           "content": "later", "created_at": "2026-01-01T00:00:01+00:00"})
+
+        assert [m["id"] for m in db.get_messages("conv_tie", since=(ts, "msg_a"), limit=2)] == ["msg_b", "msg_c"]
+        assert [m["id"] for m in db.get_messages("conv_tie", since=(ts, "msg_b"))] == ["msg_c", "msg_0"]
+        assert [m["id"] for m in db.get_messages("conv_tie", before=(ts, "msg_c"))] == ["msg_a", "msg_b"]
+        assert [m["id"] for m in db.get_messages("conv_tie", limit=2)] == ["msg_c", "msg_0"]
+
+
+class TestDirectConversations:
+
+    @pytest.mark.unit
+    def test_pair_key_is_order_independent(self):
+        import api.core.database as db
+        assert db.direct_pair_key("ub", "ua") == db.direct_pair_key("ua", "ub") == "ua:ub"
+
+    @pytest.mark.unit
+    def test_find_or_create_reuses_conversation(self, mock_supabase):
+        import api.core.database as db
+        first = db.get_or_create_direct_conversation("ua", "ub", "conv_1")
+        second = db.get_or_create_direct_conversation("ub", "ua", "conv_2")
+        assert first == second == "conv_1"
+        assert sorted(db.get_conversation_participants("conv_1")) == ["ua", "ub"]
+
+    @pytest.mark.unit
+    def test_losing_a_creation_race_joins_the_winner(self, mock_supabase, monkeypatch):
+        import api.core.database as db
+        real_lookup = db.get_conversation_between
+        calls = []
+
+        def racing_lookup(a, b):
+            calls.append(1)
+            if len(calls) == 1:
+                # Another request creates the conversation between our lookup and insert
+                db.create_conversation("conv_winner", [a, b])
+                return None
+            return real_lookup(a, b)
+
+        monkeypatch.setattr(db, "get_conversation_between", racing_lookup)
+        assert db.get_or_create_direct_conversation("ua", "ub", "conv_loser") == "conv_winner"
+        assert list(mock_supabase.store["conversations"]) == ["conv_winner"]
+        assert len(mock_supabase.store["conversation_participants"]) == 2
@@ -15,7 +15,7 @@ from api.models.schemas import (
 )
 from api.services.ai import (
     compute_job_match, compute_candidate_match, parse_resume,
-    generate_summary, generate_headline, suggest_skills,
+    generate_summary, generate_headline, suggest_skills, local_match_analysis,
 )
 
 
@@ -356,3 +356,48 @@ class TestSuggestSkillsExtended:
     def test_case_insensitive_dedup(self):
         suggestions = suggest_skills(["react", "typescript"])
         assert "React" not in [s.lower() for s in suggestions]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  LOCAL MATCH ANALYSIS (instant matcher pre-score)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class TestLocalMatchAnalysis:
+    RESUME = "Jane Doe\nSenior React Developer\nSkills: React, TypeScript, Node.js\n6 years experience"
+    JD = (
+        "Senior React Developer\nRequirements: React, TypeScript, GraphQL.\n"
+        "Nice to have: Docker, AWS"
+    )
+
+    def test_keyword_matches_and_misses(self):
+        result = local_match_analysis(self.RESUME, self.JD)
+        assert result["keyword_matches"] == ["React", "TypeScript"]
+        assert set(result["keyword_misses"]) == {"GraphQL", "Docker", "AWS"}
+        # Only missing required skills are listed as gaps
+        assert result["gaps"] == ["No mention of GraphQL"]
+
+    def test_same_shape_as_llm_analysis(self):
+        result = local_match_analysis(self.RESUME, self.JD)
+        assert set(result) == {
+            "overall_score", "summary", "strengths", "gaps", "keyword_matches",
+            "keyword_misses", "cover_letter_score", "cover_letter_feedback",
+        }
+        assert 0 <= result["overall_score"] <= 99
+
+    def test_deterministic(self):
+        assert local_match_analysis(self.RESUME, self.JD) == local_match_analysis(self.RESUME, self.JD)
+
+    def test_better_resume_scores_higher(self):
+        weak = local_match_analysis("John\nBarista\nLatte art", self.JD)
+        strong = local_match_analysis(self.RESUME, self.JD)
+        assert strong["overall_score"] > weak["overall_score"]
+
+    def test_internal_job_uses_posted_skills(self):
+        job = {"title": "ML Engineer", "required_skills": ["Python", "PyTorch"], "nice_skills": ["AWS"]}
+        result = local_match_analysis("Skills: Python, AWS", "unused", job=job)
+        assert result["keyword_matches"] == ["Python", "AWS"]
+        assert result["keyword_misses"] == ["PyTorch"]
+
+    def test_jd_without_known_skills(self):
+        result = local_match_analysis(self.RESUME, "Barista wanted. Must love coffee.")
+        assert result["overall_score"] == 0
+        assert result["keyword_misses"] == []
@@ -0,0 +1,34 @@
+"""
+Unit tests for api/services/fanout.py
+"""
+
+import asyncio
+
+import pytest
+
+from api.services.fanout import FanoutLimiter
+
+
+class TestFanoutLimiter:
+
+    @pytest.mark.unit
+    def test_per_user_and_global_limits(self):
+        limiter = FanoutLimiter(global_limit=3, per_user_limit=2)
+        active = {"alice": 0, "bob": 0, "carol": 0}
+        peaks = {"alice": 0, "total": 0}
+
+        async def job(user):
+            async with limiter.slot(user):
+                active[user] += 1
+                peaks["alice"] = max(peaks["alice"], active["alice"])
+                peaks["total"] = max(peaks["total"], sum(active.values()))
+                await asyncio.sleep(0.01)
+                active[user] -= 1
+
+        async def main():
+            await asyncio.gather(*(job(u) for u in ["alice"] * 6 + ["bob"] * 3 + ["carol"] * 3))
+
+        asyncio.run(main())
+        assert peaks["alice"] == 2
+        assert peaks["total"] == 3
+        assert limiter.active_users() == 0
@@ -0,0 +1,150 @@
+"""
+Unit tests for api/services/feature_board.py.
+"""
+
+import pytest
+
+from api.models.schemas import FeatureRequestResponse
+from api.services.feature_board import BoardKey, FeatureBoardCache
+
+
+def _feature(fid, votes=0, status="submitted", created_at=None):
+    return FeatureRequestResponse(
+        id=fid, user_id="u1", user_name="U", user_role="seeker",
+        title=f"Feature {fid}", description="Something useful to build.",
+        category="General", status=status, vote_count=votes,
+        created_at=created_at or f"2026-01-01T00:00:0{fid[-1]}+00:00",
+    )
+
+
+class _Loader:
+    """Ranks a fixed set of features like the database query would."""
+
+    def __init__(self, features):
+        self.features = features
+        self.calls = 0
+
+    def __call__(self, key, size):
+        self.calls += 1
+        rows = sorted((f for f in self.features if key.matches(f)), key=key.rank, reverse=True)
+        return rows[:size]
+
+
+class TestFeatureBoardCache:
+
+    @pytest.mark.unit
+    def test_hit_after_first_load(self):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        load = _Loader([_feature("f1", 2), _feature("f2", 5)])
+        key = BoardKey.of()
+        assert [f.id for f in cache.board(key, load)] == ["f2", "f1"]
+        assert [f.id for f in cache.board(key, load)] == ["f2", "f1"]
+        assert load.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_vote_reranks_in_place(self):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        load = _Loader([_feature("f1", 2), _feature("f2", 5)])
+        key = BoardKey.of()
+        cache.board(key, load)
+        cache.apply(_feature("f1", 6))
+        assert [(f.id, f.vote_count) for f in cache.board(key, load)] == [("f1", 6), ("f2", 5)]
+        assert load.calls == 1
+
+    @pytest.mark.unit
+    def test_new_and_retired_features_follow_filters(self):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        load = _Loader([_feature("f1", 1)])
+        submitted = BoardKey.of(status="submitted", sort="newest")
+        cache.board(submitted, load)
+        cache.apply(_feature("f2"))
+        assert [f.id for f in cache.board(submitted, load)] == ["f2", "f1"]
+        cache.apply(_feature("f1", 1, status="shipped"))
+        assert [f.id for f in cache.board(submitted, load)] == ["f2"]
+        assert load.calls == 1
+
+    @pytest.mark.unit
+    def test_truncated_board_reloads_when_its_tail_is_unknown(self):
+        cache = FeatureBoardCache(ttl=60, size=2)
+        load = _Loader([_feature("f1", 9), _feature("f2", 8), _feature("f3", 7)])
+        key = BoardKey.of()
+        cache.board(key, load)
+        # f1 drops below f2 to the last cached slot; f3 might outrank it now
+        cache.apply(_feature("f1", 1))
+        load.features[0] = _feature("f1", 1)
+        assert [f.id for f in cache.board(key, load)] == ["f2", "f3"]
+        assert load.calls == 2
+        assert cache.stats()["invalidations"] == 1
+
+    @pytest.mark.unit
+    def test_comment_counts_patched(self):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        load = _Loader([_feature("f1")])
+        cache.board(BoardKey.of(), load)
+        cache.add_comment("f1")
+        assert cache.board(BoardKey.of(), load)[0].comment_count == 1
+
+    @pytest.mark.unit
+    def test_vote_sets_cached_and_updated(self):
+        cache = FeatureBoardCache(ttl=60, size=10, max_voters=1)
+        loads = []
+
+        def load(uid):
+            loads.append(uid)
+            return {"f1"}
+
+        assert cache.user_votes("u1", load) == {"f1"}
+        cache.record_vote("u1", "f2", voted=True)
+        cache.record_vote("u1", "f1", voted=False)
+        assert cache.user_votes("u1", load) == {"f2"}
+        cache.user_votes("u2", load)  # evicts u1
+        cache.user_votes("u1", load)
+        assert loads == ["u1", "u2", "u1"]
+
+    @pytest.mark.unit
+    def test_vote_sets_expire_with_ttl(self, monkeypatch):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        clock = [1000.0]
+        monkeypatch.setattr("api.services.feature_board.time.monotonic", lambda: clock[0])
+        loads = []
+
+        def load(uid):
+            loads.append(uid)
+            return {"f1"}
+
+        cache.user_votes("u1", load)
+        cache.user_votes("u1", load)
+        clock[0] += 61
+        cache.user_votes("u1", load)
+        assert loads == ["u1", "u1"]
+
+    @pytest.mark.unit
+    def test_load_overlapping_a_write_is_not_cached(self):
+        cache = FeatureBoardCache(ttl=60, size=10)
+        features = [_feature("f1", 2)]
+
+        def load(key, size):
+            rows = list(features)  # read before the vote lands
+            cache.apply(_feature("f1", 3))
+            features[0] = _feature("f1", 3)
+            return rows
+
+        key = BoardKey.of()
+        assert cache.board(key, load)[0].vote_count == 2
+        assert cache.board(key, _Loader(features))[0].vote_count == 3
+
+        def load_votes(uid):
+            cache.record_vote(uid, "f1", voted=True)
+            return set()
+
+        assert cache.user_votes("u1", load_votes) == set()
+        assert cache.user_votes("u1", lambda uid: {"f1"}) == {"f1"}
+
+    @pytest.mark.unit
+    def test_disabled_always_loads(self):
+        cache = FeatureBoardCache(ttl=0, size=10)
+        load = _Loader([_feature("f1")])
+        cache.board(BoardKey.of(), load)
+        cache.board(BoardKey.of(), load)
+        assert load.calls == 2
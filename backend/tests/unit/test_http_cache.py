@@ -0,0 +1,58 @@
+"""
+Unit tests for api/core/http_cache.py.
+"""
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from api.core.http_cache import ITEM_CACHE, conditional, make_etag
+
+
+def _request(**headers):
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+
+
+class TestMakeEtag:
+
+    @pytest.mark.unit
+    def test_stable_and_quoted(self):
+        assert make_etag("job", {"b": 1, "a": 2}) == make_etag("job", {"a": 2, "b": 1})
+        assert make_etag("job", 1) != make_etag("job", 2)
+        assert make_etag("x").startswith('"') and make_etag("x").endswith('"')
+
+
+class TestConditional:
+
+    @pytest.mark.unit
+    def test_sets_validators_on_full_response(self):
+        resp = Response()
+        etag = make_etag("v1")
+        assert conditional(_request(), resp, etag, last_modified="2026-03-01T10:00:00.123+00:00",
+                           cache_control=ITEM_CACHE) is None
+        assert resp.headers["etag"] == etag
+        assert resp.headers["cache-control"] == ITEM_CACHE
+        assert resp.headers["last-modified"] == "Sun, 01 Mar 2026 10:00:00 GMT"
+
+    @pytest.mark.unit
+    def test_if_none_match(self):
+        etag = make_etag("v1")
+        for header in (etag, f'"other", W/{etag}', "*"):
+            not_modified = conditional(_request(if_none_match=header), Response(), etag)
+            assert not_modified.status_code == 304
+            assert not_modified.headers["etag"] == etag
+        assert conditional(_request(if_none_match=make_etag("v0")), Response(), etag) is None
+
+    @pytest.mark.unit
+    def test_if_modified_since_only_without_if_none_match(self):
+        etag = make_etag("v1")
+        modified = "2026-03-01T10:00:00.900+00:00"
+        same = "Sun, 01 Mar 2026 10:00:00 GMT"
+        earlier = "Sun, 01 Mar 2026 09:59:59 GMT"
+        assert conditional(_request(if_modified_since=same), Response(), etag, last_modified=modified).status_code == 304
+        assert conditional(_request(if_modified_since=earlier), Response(), etag, last_modified=modified) is None
+        # A changed ETag wins over an unchanged date
+        assert conditional(_request(if_modified_since=same, if_none_match=make_etag("v0")), Response(), etag,
+                           last_modified=modified) is None
+        assert conditional(_request(if_modified_since="garbage"), Response(), etag, last_modified=modified) is None
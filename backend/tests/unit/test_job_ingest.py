@@ -0,0 +1,142 @@
+"""
+Unit tests for api/services/job_ingest.py against the in-memory DB.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import api.services.job_ingest as job_ingest
+from api.services.job_ingest import IngestQuery, external_job_id, ingest
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def posting(external_id, title="Backend Engineer", company="Acme", **extra):
+    return {
+        "id": external_id, "title": title, "company": company, "company_logo": None,
+        "location": "Austin, TX", "remote": False, "description": "Python and SQL.",
+        "employment_type": "FULLTIME", "posted_at": "2026-02-28T00:00:00Z",
+        "apply_link": f"https://example.com/{external_id}", "salary_min": 120000.0,
+        "salary_max": None, "required_skills": ["Python", "SQL"], "nice_skills": [],
+        "experience_level": "", "source": "jsearch", **extra,
+    }
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """What each query returns; set feed[query] = [...postings] or an exception."""
+    results = {}
+    writes = []
+
+    async def fake_pages(query, location, remote_only, start_page, pages, api_key="", fresh=False):
+        assert fresh, "ingestion must not read the search cache"
+        r = results[query]
+        if isinstance(r, Exception):
+            raise r
+        return [dict(p) for p in r]
+
+    real_upsert = job_ingest.upsert_jobs
+
+    def counting_upsert(rows, batch_size=100):
+        writes.append([r["external_id"] for r in rows])
+        return real_upsert(rows, batch_size)
+
+    monkeypatch.setattr(job_ingest, "search_jsearch_pages", fake_pages)
+    monkeypatch.setattr(job_ingest, "upsert_jobs", counting_upsert)
+    results["writes"] = writes
+    return results
+
+
+def jobs_table(mock_supabase):
+    return mock_supabase.store.get("jobs", {})
+
+
+class TestIngest:
+
+    @pytest.mark.unit
+    def test_inserts_normalized_rows(self, feed, mock_supabase):
+        feed["python"] = [posting("a"), posting("b", title="Data Engineer")]
+        stats = asyncio.run(ingest([IngestQuery("python")], "k", now=NOW))
+        assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (2, 0, 0)
+        row = jobs_table(mock_supabase)[external_job_id("a")]
+        assert row["source"] == "jsearch"
+        assert row["company_id"] is None
+        assert row["company_name"] == "Acme"
+        assert row["type"] == "full-time"
+        assert row["salary_min"] == 120000
+        assert row["status"] == "active"
+
+    @pytest.mark.unit
+    def test_dedupes_across_queries(self, feed):
+        feed["python"] = [posting("a")]
+        feed["backend"] = [posting("a"), posting("c", title="Backend Engineer", company="ACME ")]
+        stats = asyncio.run(ingest([IngestQuery("python"), IngestQuery("backend")], "k", now=NOW))
+        assert stats["fetched"] == 1
+
+    @pytest.mark.unit
+    def test_unchanged_postings_not_rewritten(self, feed, mock_supabase):
+        feed["python"] = [posting("a"), posting("b", title="Data Engineer")]
+        asyncio.run(ingest([IngestQuery("python")], "k", now=NOW))
+        feed["python"] = [posting("a"), posting("b", title="Senior Data Engineer")]
+        later = NOW + timedelta(hours=1)
+        stats = asyncio.run(ingest([IngestQuery("python")], "k", now=later))
+        assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 1, 1)
+        assert feed["writes"][-1] == ["b"]
+        # Unchanged rows still get their last-seen time refreshed
+        assert jobs_table(mock_supabase)[external_job_id("a")]["last_seen_at"] == later.isoformat()
+
+    @pytest.mark.unit
+    def test_stale_postings_expire(self, feed, mock_supabase):
+        feed["python"] = [posting("a"), posting("b", title="Data Engineer")]
+        asyncio.run(ingest([IngestQuery("python")], "k", now=NOW, ttl_hours=24))
+        feed["python"] = [posting("a")]
+        stats = asyncio.run(ingest([IngestQuery("python")], "k", now=NOW + timedelta(hours=25), ttl_hours=24))
+        assert stats["expired"] == 1
+        table = jobs_table(mock_supabase)
+        assert table[external_job_id("a")]["status"] == "active"
+        assert table[external_job_id("b")]["status"] == "closed"
+
+    @pytest.mark.unit
+    def test_failed_query_blocks_expiry(self, feed, mock_supabase):
+        feed["python"] = [posting("a")]
+        asyncio.run(ingest([IngestQuery("python")], "k", now=NOW, ttl_hours=1))
+        feed["python"] = RuntimeError("upstream down")
+        stats = asyncio.run(ingest([IngestQuery("python")], "k", now=NOW + timedelta(hours=2), ttl_hours=1))
+        assert stats["expired"] == 0
+        assert stats["errors"]
+        assert jobs_table(mock_supabase)[external_job_id("a")]["status"] == "active"
+
+    @pytest.mark.unit
+    def test_native_jobs_untouched(self, feed, seed_db):
+        feed["python"] = [posting("a")]
+        asyncio.run(ingest([IngestQuery("python")], "k", now=NOW, ttl_hours=0))
+        assert seed_db.store["jobs"]["job_1"]["status"] == "active"
+
+
+class TestServingIngestedJobs:
+
+    @pytest.mark.integration
+    def test_listed_with_employer_and_source(self, feed, client):
+        feed["python"] = [posting("a", company="Globex")]
+        asyncio.run(ingest([IngestQuery("python")], "k", now=datetime.now(timezone.utc)))
+        resp = client.get("/api/jobs?source=jsearch")
+        assert resp.status_code == 200, resp.text
+        [job] = resp.json()
+        assert job["company_name"] == "Globex"
+        assert job["company_id"] == ""
+        assert job["source"] == "jsearch"
+        assert job["apply_link"] == "https://example.com/a"
+
+    @pytest.mark.integration
+    def test_unchanged_ingest_keeps_etags(self, feed, client):
+        feed["python"] = [posting("a")]
+        first_run = datetime.now(timezone.utc)
+        asyncio.run(ingest([IngestQuery("python")], "k", now=first_run))
+        url = f"/api/jobs/{external_job_id('a')}"
+        item, listing = client.get(url), client.get("/api/jobs")
+
+        asyncio.run(ingest([IngestQuery("python")], "k", now=first_run + timedelta(hours=1)))
+        assert client.get(url, headers={"If-None-Match": item.headers["etag"]}).status_code == 304
+        assert client.get("/api/jobs", headers={"If-None-Match": listing.headers["etag"]}).status_code == 304
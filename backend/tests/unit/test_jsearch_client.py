@@ -0,0 +1,318 @@
+"""
+Unit tests for the pooled JSearch client and its response cache
+(api/services/jobs_api.py). No network: requests go to httpx.MockTransport.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import api.services.jobs_api as jobs_api
+from api.services.jobs_api import SearchCache, search_cache
+
+
+RAW_JOB = {
+    "job_id": "ext_1",
+    "job_title": "Backend Engineer",
+    "employer_name": "Acme",
+    "job_city": "Austin",
+    "job_state": "TX",
+    "job_description": "Python and PostgreSQL services.",
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the pooled client to a mock transport and record each request."""
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": [{**RAW_JOB, "job_title": f"Backend Engineer {len(requests)}"}]})
+
+    def client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+    monkeypatch.setattr(jobs_api, "_get_client", client)
+    return requests
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jobs_api.time, "time", lambda: now[0])
+    return now
+
+
+class TestPooledClient:
+
+    @pytest.mark.unit
+    def test_client_reused_within_event_loop(self):
+        async def grab_twice():
+            first, second = jobs_api._get_client(), jobs_api._get_client()
+            await jobs_api.close_client()
+            return first, second
+
+        first, second = asyncio.run(grab_twice())
+        assert first is second
+
+    @pytest.mark.unit
+    def test_client_rebuilt_for_new_event_loop(self, monkeypatch):
+        monkeypatch.setattr(jobs_api, "_client", None)
+
+        async def grab():
+            return jobs_api._get_client()
+
+        assert asyncio.run(grab()) is not asyncio.run(grab())
+
+    @pytest.mark.unit
+    def test_client_from_closed_loop_is_closed(self, monkeypatch):
+        monkeypatch.setattr(jobs_api, "_client", None)
+
+        async def grab():
+            return jobs_api._get_client()
+
+        async def regrab():
+            client = jobs_api._get_client()
+            await asyncio.gather(*jobs_api._retiring)
+            await jobs_api.close_client()
+            return client
+
+        old = asyncio.run(grab())
+        assert asyncio.run(regrab()) is not old
+        assert old.is_closed
+
+    @pytest.mark.unit
+    def test_request_shape(self, upstream):
+        jobs = asyncio.run(jobs_api.search_jsearch("python", "Austin", True, 2, api_key="secret"))
+        [req] = upstream
+        assert req.headers["X-RapidAPI-Key"] == "secret"
+        assert req.url.params["query"] == "python in Austin"
+        assert req.url.params["page"] == "2"
+        assert req.url.params["remote_jobs_only"] == "true"
+        assert jobs[0]["id"] == "ext_1"
+
+
+class TestSearchCache:
+
+    @pytest.mark.unit
+    def test_repeat_query_served_from_cache(self, upstream, clock):
+        first = asyncio.run(jobs_api.search_jsearch("Python", api_key="k"))
+        second = asyncio.run(jobs_api.search_jsearch(" python ", api_key="k"))
+        assert len(upstream) == 1
+        assert first == second
+        assert search_cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_fresh_skips_cache_and_refreshes_it(self, upstream, clock):
+        asyncio.run(jobs_api.search_jsearch("python"))
+        fresh = asyncio.run(jobs_api.search_jsearch("python", fresh=True))
+        assert len(upstream) == 2
+        assert fresh[0]["title"] == "Backend Engineer 2"
+        assert asyncio.run(jobs_api.search_jsearch("python"))[0]["title"] == "Backend Engineer 2"
+        assert len(upstream) == 2
+
+    @pytest.mark.unit
+    def test_key_includes_page_and_filters(self, upstream, clock):
+        asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        asyncio.run(jobs_api.search_jsearch("python", page=2, api_key="k"))
+        asyncio.run(jobs_api.search_jsearch("python", remote_only=True, api_key="k"))
+        asyncio.run(jobs_api.search_jsearch("python", location="Austin", api_key="k"))
+        assert len(upstream) == 4
+
+    @pytest.mark.unit
+    def test_stale_entry_served_while_revalidating(self, upstream, clock):
+        asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        clock[0] += search_cache.ttl + 1
+
+        async def stale_then_settle():
+            jobs = await jobs_api.search_jsearch("python", api_key="k")
+            await asyncio.gather(*jobs_api._refreshing)
+            return jobs
+
+        stale = asyncio.run(stale_then_settle())
+        assert stale[0]["title"] == "Backend Engineer 1"
+        assert len(upstream) == 2
+        refreshed = asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        assert refreshed[0]["title"] == "Backend Engineer 2"
+        assert search_cache.stats()["refreshes"] == 1
+
+    @pytest.mark.unit
+    def test_expired_entry_refetched(self, upstream, clock):
+        asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        clock[0] += search_cache.ttl + search_cache.stale + 1
+        jobs = asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        assert jobs[0]["title"] == "Backend Engineer 2"
+        assert search_cache.stats()["misses"] == 2
+
+    @pytest.mark.unit
+    def test_errors_not_cached(self, monkeypatch):
+        calls = []
+
+        def handle(request):
+            calls.append(request)
+            return httpx.Response(403) if len(calls) == 1 else httpx.Response(200, json={"data": [RAW_JOB]})
+
+        monkeypatch.setattr(jobs_api, "_get_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+        with pytest.raises(ValueError, match="RapidAPI key"):
+            asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        assert len(asyncio.run(jobs_api.search_jsearch("python", api_key="k"))) == 1
+
+    @pytest.mark.unit
+    def test_lru_bound(self):
+        cache = SearchCache(ttl=60, stale=0, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, [])
+        assert cache.get("a") == (None, False)
+        assert cache.stats()["size"] == 2
+
+    @pytest.mark.unit
+    def test_disabled_with_zero_ttl(self, upstream, monkeypatch):
+        monkeypatch.setattr(search_cache, "ttl", 0)
+        asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        assert len(upstream) == 2
+
+
+def _job(job_id, title="Engineer", company="Acme", location="Austin, TX", skills=()):
+    return {"id": job_id, "title": title, "company": company, "location": location, "required_skills": list(skills)}
+
+
+class TestMultiPage:
+
+    @pytest.mark.unit
+    def test_dedupe_by_id_and_posting(self):
+        jobs = [
+            _job("a"),
+            _job("a", title="Other"),                          # same id
+            _job("b", title=" engineer ", company="ACME"),     # same posting, new id
+            _job("c", title="Engineer", company="Globex"),
+        ]
+        assert [j["id"] for j in jobs_api.dedupe_jobs(jobs)] == ["a", "c"]
+
+    @pytest.mark.unit
+    def test_pages_fetched_concurrently_and_merged(self, monkeypatch):
+        active, peak, pages_seen = [0], [0], []
+
+        async def fake_search(query, location, remote_only, page, api_key=""):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            pages_seen.append(page)
+            return [_job(f"p{page}", title=f"Role {page}"), _job("dup", title="Shared")]
+
+        monkeypatch.setattr(jobs_api, "search_jsearch", fake_search)
+        monkeypatch.setattr(jobs_api, "_PAGE_CONCURRENCY", 2)
+        jobs = asyncio.run(jobs_api.search_jsearch_pages("python", start_page=3, pages=4))
+        assert sorted(pages_seen) == [3, 4, 5, 6]
+        assert peak[0] == 2
+        assert [j["id"] for j in jobs] == ["p3", "dup", "p4", "p5", "p6"]
+
+    @pytest.mark.unit
+    def test_failed_page_skipped_unless_all_fail(self, monkeypatch):
+        async def flaky(query, location, remote_only, page, api_key=""):
+            if page == 2:
+                raise httpx.ConnectError("boom")
+            return [_job(f"p{page}", title=f"Role {page}")]
+
+        monkeypatch.setattr(jobs_api, "search_jsearch", flaky)
+        assert len(asyncio.run(jobs_api.search_jsearch_pages("python", pages=3))) == 2
+
+        async def broken(query, location, remote_only, page, api_key=""):
+            raise ValueError("Invalid or expired RapidAPI key.")
+
+        monkeypatch.setattr(jobs_api, "search_jsearch", broken)
+        with pytest.raises(ValueError):
+            asyncio.run(jobs_api.search_jsearch_pages("python", pages=3))
+
+    @pytest.mark.unit
+    def test_pages_capped(self, monkeypatch):
+        seen = []
+
+        async def fake_search(query, location, remote_only, page, api_key=""):
+            seen.append(page)
+            return []
+
+        monkeypatch.setattr(jobs_api, "search_jsearch", fake_search)
+        asyncio.run(jobs_api.search_jsearch_pages("python", pages=50))
+        assert len(seen) == jobs_api.MAX_PAGES
+
+
+class TestHedging:
+
+    @pytest.fixture
+    def slow_first(self, monkeypatch):
+        """Upstream whose first request stalls; later ones answer at once."""
+        calls = []
+
+        async def handle(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(1)
+            return httpx.Response(200, json={"data": [{**RAW_JOB, "job_title": f"Engineer {len(calls)}"}]})
+
+        monkeypatch.setattr(jobs_api, "_get_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handle)))
+        monkeypatch.setattr(jobs_api, "latency", jobs_api._LatencyTracker())
+        monkeypatch.setattr(jobs_api, "_HEDGE_FLOOR_MS", 0)
+        return calls
+
+    @pytest.mark.unit
+    def test_no_hedge_while_warming_up(self):
+        assert jobs_api._LatencyTracker().hedge_after() is None
+
+    @pytest.mark.unit
+    def test_hedge_after_p95(self, monkeypatch):
+        monkeypatch.setattr(jobs_api, "_HEDGE_FLOOR_MS", 0)
+        tracker = jobs_api._LatencyTracker()
+        for ms in range(1, 101):
+            tracker.observe(ms / 1000)
+        assert tracker.hedge_after() == pytest.approx(0.096)
+
+    @pytest.mark.unit
+    def test_slow_request_hedged(self, slow_first):
+        for _ in range(jobs_api._HEDGE_MIN_SAMPLES):
+            jobs_api.latency.observe(0.01)
+        jobs = asyncio.run(asyncio.wait_for(jobs_api.search_jsearch("python", api_key="k"), timeout=0.5))
+        assert jobs[0]["title"] == "Engineer 2"
+        assert jobs_api.latency.stats()["hedge_wins"] == 1
+        # The cancelled primary still counts, at its elapsed time when cancelled
+        assert jobs_api.latency.stats()["samples"] == jobs_api._HEDGE_MIN_SAMPLES + 2
+
+    @pytest.mark.unit
+    def test_disabled(self, slow_first, monkeypatch):
+        monkeypatch.setattr(jobs_api, "_HEDGE", False)
+        for _ in range(jobs_api._HEDGE_MIN_SAMPLES):
+            jobs_api.latency.observe(0.01)
+        jobs = asyncio.run(jobs_api.search_jsearch("python", api_key="k"))
+        assert jobs[0]["title"] == "Engineer 1"
+        assert len(slow_first) == 1
+
+
+class TestSearchRoute:
+
+    @pytest.mark.integration
+    def test_merged_results_ranked_for_seeker(self, client, monkeypatch):
+        from tests.conftest import auth_header, create_seeker_with_profile
+
+        async def fake_pages(query, location, remote_only, start_page, pages, api_key=""):
+            assert (start_page, pages) == (1, 3)
+            return [
+                _job("low", title="Chef", skills=["Cooking"]),
+                _job("high", title="Frontend Developer", skills=["React", "TypeScript"]),
+            ]
+
+        monkeypatch.setattr("api.core.config.RAPIDAPI_KEY", "k")
+        monkeypatch.setattr(jobs_api, "search_jsearch_pages", fake_pages)
+        token, _ = create_seeker_with_profile(client)
+        resp = client.get("/api/jobs/search?query=react&pages=3", headers=auth_header(token))
+        assert resp.status_code == 200, resp.text
+        data = resp.json()
+        assert [j["id"] for j in data["jobs"]] == ["high", "low"]
+        assert data["next_page"] == 4
+
+    @pytest.mark.integration
+    def test_pages_bounded_by_max_pages(self, client):
+        resp = client.get(f"/api/jobs/search?query=react&pages={jobs_api.MAX_PAGES + 1}")
+        assert resp.status_code == 422
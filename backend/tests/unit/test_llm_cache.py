@@ -0,0 +1,132 @@
+"""
+Unit tests for api/services/llm_cache.py and its use in _call_llm.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import api.services.llm as llm
+from api.services.llm_cache import LLMCache, fingerprint, llm_cache
+
+
+class CountingProvider(llm._Provider):
+    name = "fake-test"
+    default_model = "fake-model"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def complete(self, system, user, json_mode):
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    p = CountingProvider()
+    monkeypatch.setattr(llm, "_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_provider", p)
+    return p
+
+
+class TestFingerprint:
+
+    @pytest.mark.unit
+    def test_stable_for_same_inputs(self):
+        assert fingerprint("openai", "m", "sys", "user", True) == fingerprint("openai", "m", "sys", "user", True)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("changed", [
+        ("anthropic", "m", "sys", "user", True),
+        ("openai", "m2", "sys", "user", True),
+        ("openai", "m", "sys v2", "user", True),
+        ("openai", "m", "sys", "user!", True),
+        ("openai", "m", "sys", "user", False),
+    ])
+    def test_any_component_changes_key(self, changed):
+        assert fingerprint("openai", "m", "sys", "user", True) != fingerprint(*changed)
+
+
+class TestLLMCache:
+
+    @pytest.mark.unit
+    def test_ttl_expiry(self, monkeypatch):
+        cache = LLMCache(ttl=10, max_entries=10)
+        clock = [1000.0]
+        monkeypatch.setattr("api.services.llm_cache.time.time", lambda: clock[0])
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        clock[0] += 11
+        assert cache.get("k") is None
+
+    @pytest.mark.unit
+    def test_lru_bound(self):
+        cache = LLMCache(ttl=60, max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_db_tier_backfills_memory(self, mock_supabase):
+        writer = LLMCache(ttl=60, max_entries=10, use_db=True)
+        writer.set("llm_x", "persisted", "openai", "m")
+        reader = LLMCache(ttl=60, max_entries=10, use_db=True)
+        assert reader.get("llm_x") == "persisted"
+        assert reader.stats()["db_hits"] == 1
+        assert reader.get("llm_x") == "persisted"
+        assert reader.stats()["memory_hits"] == 1
+
+    @pytest.mark.unit
+    def test_async_db_tier_runs_off_the_event_loop(self, monkeypatch):
+        cache = LLMCache(ttl=60, max_entries=10, use_db=True)
+        threads = []
+        monkeypatch.setattr(cache, "_db_get", lambda key: threads.append(threading.get_ident()) or "from-db")
+        monkeypatch.setattr(cache, "_db_set", lambda *args: threads.append(threading.get_ident()))
+
+        async def main():
+            loop_thread = threading.get_ident()
+            await cache.aset("llm_y", "v")
+            cache.clear()
+            return loop_thread, await cache.aget("llm_y")
+
+        loop_thread, value = asyncio.run(main())
+        assert value == "from-db"
+        assert len(threads) == 2 and loop_thread not in threads
+
+
+class TestCallLLMCaching:
+
+    @pytest.mark.unit
+    def test_repeat_call_served_from_cache(self, provider):
+        first = asyncio.run(llm._call_llm("sys", "same prompt", json_mode=True))
+        second = asyncio.run(llm._call_llm("sys", "same prompt", json_mode=True))
+        assert first == second == "reply 1"
+        assert provider.calls == 1
+        stats = llm.cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    @pytest.mark.unit
+    def test_bypass_per_call(self, provider):
+        asyncio.run(llm._call_llm("sys", "p"))
+        assert asyncio.run(llm._call_llm("sys", "p", use_cache=False)) == "reply 2"
+        assert provider.calls == 2
+
+    @pytest.mark.unit
+    def test_cover_letters_uncached_by_default(self, provider):
+        asyncio.run(llm.generate_cover_letter("r", "j"))
+        asyncio.run(llm.generate_cover_letter("r", "j"))
+        assert provider.calls == 2
+
+    @pytest.mark.unit
+    def test_disabled_when_ttl_zero(self, provider, monkeypatch):
+        monkeypatch.setattr(llm_cache, "ttl", 0)
+        asyncio.run(llm._call_llm("sys", "p"))
+        asyncio.run(llm._call_llm("sys", "p"))
+        assert provider.calls == 2
@@ -0,0 +1,252 @@
+"""
+Unit tests for api/services/llm.py
+
+Covers the provider abstraction, pooled client reuse, and the coroutine
+public surface. No network calls — providers are replaced with fakes.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import api.services.llm as llm
+
+
+class FakeProvider(llm._Provider):
+    name = "fake-test"
+    default_model = "fake-model"
+
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+        self.calls = []
+
+    async def complete(self, system, user, json_mode):
+        self.calls.append((system, user, json_mode))
+        return self.reply
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    def install(reply):
+        provider = FakeProvider(reply)
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", provider)
+        return provider
+    return install
+
+
+class TestProviderClients:
+
+    @pytest.mark.unit
+    def test_client_reused_within_event_loop(self, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        provider = llm._OpenAIProvider()
+
+        async def grab_twice():
+            first = provider.client()
+            second = provider.client()
+            await provider.aclose()
+            return first, second
+
+        first, second = asyncio.run(grab_twice())
+        assert first is second
+
+    @pytest.mark.unit
+    def test_client_rebuilt_for_new_event_loop(self, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        provider = llm._AnthropicProvider()
+
+        async def grab():
+            return provider.client()
+
+        assert asyncio.run(grab()) is not asyncio.run(grab())
+
+    @pytest.mark.unit
+    def test_replaced_client_is_closed(self):
+        closed = []
+
+        class Client:
+            async def close(self):
+                closed.append(self)
+
+        class Provider(llm._Provider):
+            def _new_client(self):
+                return Client()
+
+        provider = Provider()
+
+        async def grab():
+            client = provider.client()
+            await asyncio.sleep(0)  # let a scheduled close run
+            return client
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert closed == [first]
+        assert second is not first
+
+    @pytest.mark.unit
+    def test_provider_selection(self, monkeypatch):
+        monkeypatch.setattr(llm, "_provider", None)
+        monkeypatch.setattr(llm, "_PROVIDER", "anthropic")
+        assert isinstance(llm._get_provider(), llm._AnthropicProvider)
+
+    @pytest.mark.unit
+    def test_missing_api_key_raises(self, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        with pytest.raises(RuntimeError, match="LLM_API_KEY"):
+            asyncio.run(llm._call_llm("sys", "user"))
+
+
+class TestPublicCoroutines:
+
+    @pytest.mark.unit
+    def test_analyze_match_fills_defaults(self, fake_provider):
+        provider = fake_provider('```json\n{"overall_score": 72, "strengths": ["Python"]}\n```')
+        result = asyncio.run(llm.analyze_match("resume", "jd"))
+        assert result["overall_score"] == 72
+        assert result["strengths"] == ["Python"]
+        assert result["gaps"] == []
+        assert result["cover_letter_score"] is None
+        assert provider.calls[0][2] is True
+
+    @pytest.mark.unit
+    def test_cover_letter_coroutines(self, fake_provider):
+        provider = fake_provider("Dear hiring manager")
+        assert asyncio.run(llm.generate_cover_letter("r", "j")) == "Dear hiring manager"
+        assert asyncio.run(llm.improve_cover_letter("r", "j", "old")) == "Dear hiring manager"
+        assert "EXISTING COVER LETTER" in provider.calls[1][1]
+
+    @pytest.mark.unit
+    def test_concurrent_calls_share_provider(self, fake_provider):
+        provider = fake_provider("ok")
+
+        async def burst():
+            return await asyncio.gather(*(llm.generate_cover_letter("r", f"j{i}") for i in range(50)))
+
+        assert asyncio.run(burst()) == ["ok"] * 50
+        assert len(provider.calls) == 50
+
+    @pytest.mark.unit
+    def test_blog_enrich_is_coroutine(self, fake_provider):
+        from api.services.blog_ai import enrich_post
+        fake_provider('{"excerpt": "Short.", "seo_title": "T", "related_skills": ["SQL"]}')
+        result = asyncio.run(enrich_post("Title", "Some body text here", "career-playbook"))
+        assert result["excerpt"] == "Short."
+        assert result["related_skills"] == ["SQL"]
+        assert result["reading_time_min"] == 1
+
+
+class TestStreaming:
+
+    @pytest.mark.unit
+    def test_closing_stream_closes_upstream(self, monkeypatch):
+        closed = []
+
+        class StreamingProvider(llm._Provider):
+            name = "fake-stream"
+
+            async def stream(self, system, user):
+                try:
+                    for i in range(100):
+                        yield f"tok{i} "
+                finally:
+                    closed.append(True)
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", StreamingProvider())
+
+        async def read_two():
+            gen = llm.stream_cover_letter("r", "j")
+            first = [await gen.__anext__(), await gen.__anext__()]
+            await gen.aclose()
+            return first
+
+        assert asyncio.run(read_two()) == ["tok0 ", "tok1 "]
+        assert closed == [True]
+
+    @pytest.mark.unit
+    def test_default_stream_falls_back_to_complete(self, fake_provider):
+        fake_provider("whole letter")
+
+        async def collect():
+            return [d async for d in llm.stream_cover_letter("r", "j", "old letter")]
+
+        assert asyncio.run(collect()) == ["whole letter"]
+
+
+class TestFakeProvider:
+
+    @pytest.fixture
+    def fake(self, monkeypatch):
+        monkeypatch.setattr(llm, "_API_KEY", "")
+        monkeypatch.setattr(llm, "_PROVIDER", "fake")
+        monkeypatch.setattr(llm, "_provider", None)
+        monkeypatch.setattr(llm, "_RETRY_BASE", 0)
+
+        def install(**kwargs):
+            provider = llm._FakeProvider(**{"latency_ms": 0, "ttft_ms": 0, "token_ms": 0, "seed": 7, **kwargs})
+            monkeypatch.setattr(llm, "_provider", provider)
+            return provider
+        return install
+
+    @pytest.mark.unit
+    def test_selected_without_api_key(self, fake):
+        assert llm.is_configured()
+        assert isinstance(llm._get_provider(), llm._FakeProvider)
+
+    @pytest.mark.unit
+    def test_analysis_is_schema_valid(self, fake):
+        fake()
+        result = asyncio.run(llm.analyze_match(
+            "SKILLS\nPython, React, SQL", "Requirements: Python, React, Kubernetes", "Dear team"))
+        assert set(result["keyword_matches"]) == {"Python", "React"}
+        assert result["keyword_misses"] == ["Kubernetes"]
+        assert 0 <= result["overall_score"] <= 100
+        assert result["cover_letter_score"] is not None
+
+    @pytest.mark.unit
+    def test_blog_replies_are_schema_valid(self, fake):
+        from api.services.blog_ai import enrich_post, generate_draft, suggest_topics
+        fake()
+        enriched = asyncio.run(enrich_post("Learning Docker", "Docker and AWS tips.", "career-playbook"))
+        assert enriched["seo_title"] == "Learning Docker"
+        assert "Docker" in enriched["related_skills"]
+        topics = asyncio.run(suggest_topics([{"title": "Dev", "required_skills": ["Go"]}]))
+        assert topics["suggestions"][0]["target_skills"] == ["Go"]
+        assert asyncio.run(generate_draft("Remote Work", "remote-work")).startswith("## Remote Work")
+
+    @pytest.mark.unit
+    def test_same_seed_same_latencies(self):
+        a = llm._FakeProvider(latency_ms=500, sigma=0.5, seed=42)
+        b = llm._FakeProvider(latency_ms=500, sigma=0.5, seed=42)
+        assert [a._delay(500) for _ in range(5)] == [b._delay(500) for _ in range(5)]
+
+    @pytest.mark.unit
+    def test_injected_429_is_retried(self, fake):
+        provider = fake(error_rate=1.0, errors="429")
+        with pytest.raises(llm.FakeProviderError) as exc:
+            asyncio.run(llm.generate_cover_letter("r", "j"))
+        assert exc.value.status_code == 429
+        from api.services.llm_telemetry import telemetry
+        assert telemetry.summary()["generate"]["retries"] == llm._MAX_RETRIES
+
+    @pytest.mark.unit
+    def test_injected_malformed_json(self, fake):
+        fake(error_rate=1.0, errors="malformed")
+        raw = asyncio.run(llm._call_llm(llm._ANALYZE_SYSTEM, "RESUME:\nPython\n\nJOB DESCRIPTION:\nPython", json_mode=True))
+        with pytest.raises(ValueError):
+            json.loads(raw)
+
+    @pytest.mark.unit
+    def test_streams_word_by_word(self, fake):
+        fake()
+
+        async def collect():
+            return [d async for d in llm.stream_cover_letter("r", "JD mentions React")]
+
+        deltas = asyncio.run(collect())
+        assert len(deltas) > 10
+        assert "".join(deltas).startswith("Dear Hiring Manager")
@@ -0,0 +1,194 @@
+"""
+Unit tests for api/services/llm_telemetry.py and the per-call recording
+in _call_llm / _stream_llm.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import api.services.llm as llm
+from api.services.llm_telemetry import LLMCall, LLMTelemetry, price_per_mtok, telemetry
+
+
+class TransientError(Exception):
+    status_code = 503
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+class Throttled(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": headers})()
+
+
+class UsageProvider(llm._Provider):
+    name = "openai"
+    default_model = "gpt-4o-mini"
+
+    def __init__(self, failures=()):
+        super().__init__()
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def complete_with_usage(self, system, user, json_mode):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "reply", (1000, 200)
+
+    async def stream(self, system, user):
+        for word in ["Dear ", "hiring ", "manager."]:
+            yield word
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    p = UsageProvider()
+    monkeypatch.setattr(llm, "_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_provider", p)
+    monkeypatch.setattr(llm, "_RETRY_BASE", 0)
+    return p
+
+
+class TestLLMTelemetry:
+
+    @pytest.mark.unit
+    def test_percentiles_over_window(self):
+        t = LLMTelemetry(window=100, log_path="")
+        for ms in range(1, 101):
+            t.record(LLMCall("analyze", "openai", "gpt-4o-mini", latency_ms=float(ms)))
+        latency = t.summary()["analyze"]["latency_ms"]
+        assert latency["p50"] == pytest.approx(50, abs=1)
+        assert latency["p95"] == pytest.approx(95, abs=1)
+        assert latency["p99"] == pytest.approx(99, abs=1)
+
+    @pytest.mark.unit
+    def test_window_bounds_samples_but_not_totals(self):
+        t = LLMTelemetry(window=10, log_path="")
+        for _ in range(25):
+            t.record(LLMCall("enrich", "openai", "gpt-4o-mini", latency_ms=5))
+        s = t.summary()["enrich"]
+        assert s["window"] == 10
+        assert s["calls"] == 25
+
+    @pytest.mark.unit
+    def test_cost_from_price_table(self):
+        call = LLMCall("generate", "openai", "gpt-4o-mini", latency_ms=1, input_tokens=1_000_000, output_tokens=1_000_000)
+        assert call.cost_usd == pytest.approx(0.75)
+        assert price_per_mtok("gpt-4o-2024-08-06") == (2.50, 10.00)
+        assert price_per_mtok("unknown-model") == (0.0, 0.0)
+
+    @pytest.mark.unit
+    def test_cache_hits_excluded_from_latency(self):
+        t = LLMTelemetry(log_path="")
+        t.record(LLMCall("analyze", "openai", "m", latency_ms=900))
+        t.record(LLMCall("analyze", "openai", "m", latency_ms=0.1, cache_hit=True))
+        s = t.summary()["analyze"]
+        assert s["cache_hit_rate"] == 0.5
+        assert s["latency_ms"]["p50"] == 900
+
+    @pytest.mark.unit
+    def test_json_lines_log(self, tmp_path):
+        path = tmp_path / "llm.jsonl"
+        t = LLMTelemetry(log_path=str(path))
+        t.record(LLMCall("draft", "anthropic", "claude-3-5-haiku-20241022", latency_ms=12.5, input_tokens=10))
+        t.record(LLMCall("draft", "anthropic", "claude-3-5-haiku-20241022", latency_ms=8.0, error="ValueError"))
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["latency_ms"] for r in lines] == [12.5, 8.0]
+        assert lines[1]["error"] == "ValueError"
+
+    @pytest.mark.unit
+    def test_log_written_off_the_event_loop(self, tmp_path, monkeypatch):
+        import threading
+        t = LLMTelemetry(log_path=str(tmp_path / "llm.jsonl"))
+        writers = []
+        append = t._append_log
+        monkeypatch.setattr(t, "_append_log", lambda call: (writers.append(threading.get_ident()), append(call)))
+
+        async def main():
+            t.record(LLMCall("draft", "openai", "m", latency_ms=1))
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())  # waits for the default executor on exit
+        assert writers and writers[0] != loop_thread
+        assert len((tmp_path / "llm.jsonl").read_text().splitlines()) == 1
+
+
+class TestCallRecording:
+
+    @pytest.mark.unit
+    def test_records_usage_and_prompt_type(self, provider):
+        asyncio.run(llm.analyze_match("resume", "jd"))
+        s = telemetry.summary()["analyze"]
+        assert s["calls"] == 1
+        assert s["input_tokens"] == 1000
+        assert s["output_tokens"] == 200
+        assert s["cost_usd"] > 0
+
+    @pytest.mark.unit
+    def test_cache_hit_recorded(self, provider):
+        asyncio.run(llm._call_llm("sys", "p", prompt_type="enrich"))
+        asyncio.run(llm._call_llm("sys", "p", prompt_type="enrich"))
+        s = telemetry.summary()["enrich"]
+        assert (s["calls"], s["cache_hits"], s["input_tokens"]) == (2, 1, 1000)
+
+    @pytest.mark.unit
+    def test_transient_errors_retried_and_counted(self, provider):
+        provider.failures = [TransientError(), TransientError()]
+        assert asyncio.run(llm._call_llm("sys", "p", prompt_type="suggest")) == "reply"
+        assert provider.calls == 3
+        assert telemetry.summary()["suggest"]["retries"] == 2
+
+    @pytest.mark.unit
+    def test_each_retry_is_admitted(self, provider, reset_llm_admission):
+        provider.failures = [TransientError(), TransientError()]
+        asyncio.run(llm._call_llm("sys", "p", use_cache=False))
+        assert reset_llm_admission.stats()["admitted"] == 3
+
+    @pytest.mark.unit
+    def test_retry_after_replaces_backoff(self, provider, monkeypatch):
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr(llm.asyncio, "sleep", fake_sleep)
+        provider.failures = [Throttled({"retry-after": "3"}), Throttled({"retry-after-ms": "250"})]
+        assert asyncio.run(llm._call_llm("sys", "p", prompt_type="suggest")) == "reply"
+        assert slept == [3.0, 0.25]
+
+    @pytest.mark.unit
+    def test_long_retry_after_is_not_waited_out(self, provider, monkeypatch):
+        monkeypatch.setattr(llm, "_MAX_RETRY_AFTER", 5)
+        provider.failures = [Throttled({"retry-after": "60"})]
+        with pytest.raises(Throttled):
+            asyncio.run(llm._call_llm("sys", "p", prompt_type="suggest"))
+        assert provider.calls == 1
+
+    @pytest.mark.unit
+    def test_non_retryable_error_recorded(self, provider):
+        provider.failures = [BadRequest("nope")]
+        with pytest.raises(BadRequest):
+            asyncio.run(llm._call_llm("sys", "p", prompt_type="draft"))
+        assert provider.calls == 1
+        s = telemetry.summary()["draft"]
+        assert (s["errors"], s["retries"]) == (1, 0)
+
+    @pytest.mark.unit
+    def test_stream_records_time_to_first_token(self, provider):
+        async def collect():
+            return [d async for d in llm.stream_cover_letter("r", "j")]
+
+        asyncio.run(collect())
+        [call] = telemetry.recent()
+        assert call["streamed"] is True
+        assert call["prompt_type"] == "generate"
+        assert call["ttft_ms"] is not None
+        assert call["output_tokens"] > 0
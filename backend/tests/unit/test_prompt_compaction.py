@@ -0,0 +1,158 @@
+"""
+Unit tests for api/services/prompt_compaction.py
+"""
+
+import asyncio
+
+import pytest
+
+import api.services.llm as llm
+from api.services.prompt_compaction import compact, compaction_stats, count_tokens
+
+BOILERPLATE_JD = """Senior Backend Engineer
+Acme Corp - Remote
+
+About Us
+Acme is a fast-growing company on a mission to revolutionize widgets. We value curiosity and ownership.
+
+What you'll do:
+- Design and build scalable APIs in Python
+- Own services end to end
+- Design and build scalable APIs in Python
+
+Requirements:
+- 5+ years of Python experience
+- Experience with PostgreSQL and Redis
+
+Nice to have
+- Kubernetes
+
+Benefits
+- Medical, dental and vision insurance
+- 401(k) matching
+- Unlimited PTO
+
+Acme is an equal opportunity employer. All qualified applicants will receive consideration without regard to race, color, religion, sex.
+"""
+
+
+class TestCompact:
+
+    @pytest.mark.unit
+    def test_strips_boilerplate_and_duplicates(self):
+        result = compact(BOILERPLATE_JD, budget=1000)
+        assert "401(k)" not in result.text
+        assert "equal opportunity" not in result.text
+        assert "Benefits" not in result.text
+        assert result.text.count("Design and build scalable APIs") == 1
+        assert "5+ years of Python experience" in result.text
+        assert result.tokens_saved > 0
+
+    @pytest.mark.unit
+    def test_healthcare_requirements_are_not_boilerplate(self):
+        jd = "\n".join([
+            "Medical Billing Specialist",
+            "Requirements:",
+            "- Health insurance claims processing experience",
+            "- Medical and dental billing (ICD-10, CDT)",
+            "- Knowledge of dental and vision insurance plans and eligibility rules",
+            "- Medical, dental and vision insurance",
+        ])
+        result = compact(jd, budget=1000)
+        assert "Health insurance claims processing" in result.text
+        assert "Medical and dental billing" in result.text
+        assert "dental and vision insurance plans and eligibility" in result.text
+        assert "- Medical, dental and vision insurance" not in result.text
+
+    @pytest.mark.unit
+    def test_tight_budget_keeps_requirements_over_company_pitch(self):
+        result = compact(BOILERPLATE_JD, budget=60)
+        assert result.tokens_after <= 60
+        assert "Requirements:" in result.text
+        assert "5+ years of Python experience" in result.text
+        assert "revolutionize widgets" not in result.text
+        # Survivors keep their original order
+        assert result.text.index("What you'll do:") < result.text.index("Requirements:")
+
+    @pytest.mark.unit
+    def test_blind_slicing_would_drop_requirements(self):
+        padded = BOILERPLATE_JD.replace(
+            "About Us\n", "About Us\n" + "We love building great products together. " * 120 + "\n"
+        )
+        assert "Requirements:" not in padded[:4000]
+        result = compact(padded, budget=1000)
+        assert "Requirements:" in result.text
+        assert result.tokens_after <= 1000
+
+    @pytest.mark.unit
+    def test_resume_prioritises_skills_and_experience(self):
+        resume = "\n".join([
+            "Jane Doe",
+            "Skills:", "Python, SQL, AWS",
+            "Interests:", *[f"Hobby number {i} with a longish description" for i in range(40)],
+            "Experience:", "- Data Engineer at Acme (2019-2024)",
+        ])
+        result = compact(resume, budget=40, kind="resume")
+        assert "Python, SQL, AWS" in result.text
+        assert "Data Engineer at Acme" in result.text
+        assert "Hobby number 39" not in result.text
+
+    @pytest.mark.unit
+    def test_letter_keeps_order_and_paragraphs(self):
+        letter = "Dear team,\n\nI am excited to apply.\n\nBest,\nJane"
+        assert compact(letter, budget=100, kind="letter").text == letter
+
+    @pytest.mark.unit
+    def test_unstructured_text_is_truncated_to_budget(self):
+        result = compact("word " * 5000, budget=50)
+        assert 0 < result.tokens_after <= 50
+
+    @pytest.mark.unit
+    def test_records_tokens_saved(self):
+        before = compaction_stats()
+        result = compact(BOILERPLATE_JD, budget=1000)
+        after = compaction_stats()
+        assert after["calls"] == before["calls"] + 1
+        assert after["tokens_saved"] - before["tokens_saved"] == result.tokens_saved
+        assert count_tokens("") == 0
+
+
+class TestMatcherPrompts:
+
+    @pytest.mark.unit
+    def test_analyze_prompt_uses_compacted_inputs(self, monkeypatch):
+        sent = []
+
+        class CapturingProvider(llm._Provider):
+            name = "capture"
+
+            async def complete(self, system, user, json_mode):
+                sent.append(user)
+                return "{}"
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", CapturingProvider())
+        asyncio.run(llm.analyze_match("Skills:\nPython", BOILERPLATE_JD, use_cache=False))
+        assert "JOB DESCRIPTION:" in sent[0]
+        assert "equal opportunity" not in sent[0]
+        assert "Requirements:" in sent[0]
+
+    @pytest.mark.unit
+    def test_prompt_compacted_once_and_savings_recorded(self, monkeypatch):
+        from api.services.llm_telemetry import telemetry
+
+        class EchoProvider(llm._Provider):
+            name = "echo"
+
+            async def complete(self, system, user, json_mode):
+                return "{}"
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", EchoProvider())
+        prompt = llm.analyze_prompt("Skills:\nPython", BOILERPLATE_JD)
+        calls = compaction_stats()["calls"]
+        assert asyncio.run(llm.cached_analysis("Skills:\nPython", BOILERPLATE_JD, prompt=prompt)) is None
+        asyncio.run(llm.analyze_match("Skills:\nPython", BOILERPLATE_JD, prompt=prompt))
+        assert compaction_stats()["calls"] == calls
+        assert prompt.tokens_saved > 0
+        assert telemetry.summary()["analyze"]["tokens_saved"] == prompt.tokens_saved
@@ -0,0 +1,107 @@
+"""
+Unit tests for api/services/pubsub.py.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from api.services.pubsub import PubSub
+
+
+class LoopbackBackend:
+    """Stands in for Redis: every publish is heard by every connected hub."""
+
+    def __init__(self):
+        self.hubs = []
+        self.published = []
+
+    def connect(self, hub):
+        self.hubs.append(hub)
+        hub.backend = self
+        return hub
+
+    async def publish(self, channel, envelope):
+        self.published.append(channel)
+        for hub in self.hubs:
+            hub._on_remote(channel, envelope)
+
+    async def listen(self, deliver):
+        await asyncio.Event().wait()
+
+    async def close(self):
+        pass
+
+
+class TestPubSub:
+
+    @pytest.mark.unit
+    def test_delivers_to_channel_subscribers_only(self):
+        async def scenario():
+            hub = PubSub()
+            a1, a2, b = hub.subscribe("user:a"), hub.subscribe("user:a"), hub.subscribe("user:b")
+            await hub.publish("user:a", {"type": "message"})
+            return await a1.get(0.1), await a2.get(0.1), await b.get(0.01)
+
+        a1, a2, b = asyncio.run(scenario())
+        assert a1 == a2 == {"type": "message"}
+        assert b is None
+
+    @pytest.mark.unit
+    def test_unsubscribe_drops_empty_channel(self):
+        async def scenario():
+            hub = PubSub()
+            sub = hub.subscribe("user:a")
+            sub.close()
+            return hub.stats()
+
+        assert asyncio.run(scenario())["channels"] == 0
+
+    @pytest.mark.unit
+    def test_slow_subscriber_overflows(self):
+        async def scenario():
+            hub = PubSub(queue_size=2)
+            sub = hub.subscribe("user:a")
+            for i in range(3):
+                await hub.publish("user:a", {"n": i})
+            return sub
+
+        sub = asyncio.run(scenario())
+        assert sub.overflowed
+        assert sub.queue.qsize() == 2
+
+    @pytest.mark.unit
+    def test_publish_from_another_event_loop(self):
+        hub = PubSub()
+        received = []
+
+        async def consumer(ready: threading.Event):
+            sub = hub.subscribe("user:a")
+            ready.set()
+            received.append(await sub.get(2))
+
+        ready = threading.Event()
+        t = threading.Thread(target=lambda: asyncio.run(consumer(ready)))
+        t.start()
+        ready.wait(2)
+        asyncio.run(hub.publish("user:a", {"type": "typing"}))
+        t.join(3)
+        assert received == [{"type": "typing"}]
+
+    @pytest.mark.unit
+    def test_backend_fans_out_across_instances_without_echo(self):
+        async def scenario():
+            backend = LoopbackBackend()
+            here, there = backend.connect(PubSub()), backend.connect(PubSub())
+            local, remote = here.subscribe("user:a"), there.subscribe("user:a")
+            await here.publish("user:a", {"type": "message"})
+            events = [await local.get(0.1), await local.get(0.01), await remote.get(0.1)]
+            await here.close()
+            await there.close()
+            return events, here.stats(), there.stats()
+
+        (first, echo, remote), here, there = asyncio.run(scenario())
+        assert first == remote == {"type": "message"}
+        assert echo is None
+        assert (here["remote"], there["remote"]) == (0, 1)
@@ -0,0 +1,123 @@
+"""
+Unit tests for api/services/rate_limit.py
+"""
+
+import asyncio
+
+import pytest
+
+from api.services.rate_limit import AdmissionController, RateLimited, TokenBucket, estimate_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+
+    @pytest.mark.unit
+    def test_refills_at_per_minute_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock)  # 1 token per second
+        bucket.take(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0)
+        clock.now = 0.5
+        assert bucket.wait_time(1) == pytest.approx(0.5)
+        clock.now = 1.0
+        assert bucket.wait_time(1) == 0
+
+    @pytest.mark.unit
+    def test_oversized_request_is_clamped_to_capacity(self):
+        bucket = TokenBucket(100, clock=FakeClock())
+        assert bucket.wait_time(10_000) == 0
+
+    @pytest.mark.unit
+    def test_estimate_tokens(self):
+        assert estimate_tokens("a" * 400, "b" * 400, output_tokens=100) == 300
+
+
+class TestAdmissionController:
+
+    @pytest.mark.unit
+    def test_admits_immediately_under_quota(self):
+        ctl = AdmissionController(rpm=100, tpm=100_000)
+
+        async def main():
+            for _ in range(5):
+                await ctl.acquire(100, "u1")
+
+        asyncio.run(main())
+        stats = ctl.stats()
+        assert stats["admitted"] == 5
+        assert stats["queued"] == 0
+
+    @pytest.mark.unit
+    def test_sheds_upfront_when_projected_wait_exceeds_deadline(self):
+        ctl = AdmissionController(rpm=1, tpm=100_000, queue_timeout=5)
+
+        async def main():
+            await ctl.acquire(10, "u1")
+            await ctl.acquire(10, "u1")
+
+        with pytest.raises(RateLimited) as exc:
+            asyncio.run(main())
+        assert exc.value.retry_after >= 5
+        assert ctl.stats()["rejected"] == 1
+
+    @pytest.mark.unit
+    def test_sheds_when_queue_is_full(self):
+        ctl = AdmissionController(rpm=600, tpm=1_000_000, max_queue=0)
+
+        async def main():
+            for _ in range(601):
+                await ctl.acquire(1, "u1")
+
+        with pytest.raises(RateLimited):
+            asyncio.run(main())
+
+    @pytest.mark.unit
+    def test_queued_users_are_served_round_robin(self):
+        # 1200 RPM: one request every 50ms once the initial burst is spent
+        ctl = AdmissionController(rpm=1200, tpm=10_000_000, queue_timeout=5)
+        order = []
+
+        async def call(user, tag):
+            await ctl.acquire(1, user)
+            order.append(tag)
+
+        async def main():
+            ctl.requests.take(ctl.requests.capacity)
+            heavy = [call("heavy", f"h{i}") for i in range(4)]
+            light = [call("light", "l0")]
+            await asyncio.gather(*heavy, *light)
+
+        asyncio.run(main())
+        # The light user is served second, not after the heavy user's whole burst
+        assert order[:2] == ["h0", "l0"]
+        stats = ctl.stats()
+        assert stats["queued"] == 5
+        assert stats["max_depth"] == 5
+        assert stats["queue_depth"] == 0
+        assert stats["wait_p95_s"] > 0
+
+    @pytest.mark.unit
+    def test_cancelled_waiter_leaves_queue(self):
+        ctl = AdmissionController(rpm=60, tpm=1_000_000, queue_timeout=5)
+
+        async def main():
+            ctl.requests.take(ctl.requests.capacity)
+            waiter = asyncio.ensure_future(ctl.acquire(1, "u1"))
+            await asyncio.sleep(0.01)
+            assert ctl.stats()["queue_depth"] == 1
+            waiter.cancel()
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        stats = ctl.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["queued_users"] == 0
+        assert stats["admitted"] == 0
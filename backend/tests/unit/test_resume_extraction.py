@@ -0,0 +1,85 @@
+"""
+Unit tests for PDF text extraction in api/services/ai.py
+
+Covers the page cap, the early-terminating fast path and scanned-PDF
+detection.
+"""
+
+import pytest
+
+import api.services.ai as ai_mod
+
+
+class FakePage:
+    def __init__(self, text, calls):
+        self._text = text
+        self._calls = calls
+
+    def extract_text(self):
+        self._calls.append(self._text)
+        return self._text
+
+
+def _install_fake_reader(monkeypatch, page_texts):
+    """Patch PdfReader so every reader instance serves ``page_texts``."""
+    calls: list[str] = []
+
+    class FakeReader:
+        def __init__(self, stream):
+            self.pages = [FakePage(t, calls) for t in page_texts]
+
+    monkeypatch.setattr(ai_mod.PyPDF2, "PdfReader", FakeReader)
+    return calls
+
+
+FULL_FIRST_PAGE = (
+    "Jane Doe\njane@example.com\n"
+    "Skills\nPython, React\n"
+    "Experience\nEngineer at Acme | 2019 - 2023\n"
+    "Education\nB.S. Computer Science 2018"
+)
+
+
+class TestPdfExtraction:
+
+    @pytest.mark.unit
+    def test_fast_path_stops_after_core_sections(self, monkeypatch):
+        calls = _install_fake_reader(monkeypatch, [FULL_FIRST_PAGE, "Publications", "More"])
+        text = ai_mod._extract_text("resume.pdf", b"%PDF")
+        assert "Education" in text
+        assert "Publications" not in text
+        assert len(calls) == 1
+
+    @pytest.mark.unit
+    def test_sections_split_across_pages(self, monkeypatch):
+        pages = ["Jane Doe\njane@example.com\nSkills\nPython", "Experience\nDev at Acme\nEducation\nMIT", "Tail"]
+        calls = _install_fake_reader(monkeypatch, pages)
+        text = ai_mod._extract_text("resume.pdf", b"%PDF")
+        assert "MIT" in text
+        assert "Tail" not in text
+        assert len(calls) == 2
+
+    @pytest.mark.unit
+    def test_page_limit_caps_extraction(self, monkeypatch):
+        pages = [f"page {i}" for i in range(10)]
+        _install_fake_reader(monkeypatch, pages)
+        text = ai_mod._extract_text("resume.pdf", b"%PDF", max_pages=3)
+        assert text.splitlines() == ["page 0", "page 1", "page 2"]
+
+    @pytest.mark.unit
+    def test_single_reader_preserves_page_order(self, monkeypatch):
+        pages = [f"page {i}" for i in range(9)]
+        calls = _install_fake_reader(monkeypatch, pages)
+        text = ai_mod._extract_text("resume.pdf", b"%PDF", max_pages=9)
+        assert text.splitlines() == pages
+        assert calls == pages  # each page parsed once
+
+    @pytest.mark.unit
+    def test_scanned_pdf_is_abandoned_early(self, monkeypatch):
+        calls = _install_fake_reader(monkeypatch, ["", "", "", "", ""])
+        assert ai_mod._extract_text("scan.pdf", b"%PDF") == ""
+        assert len(calls) == ai_mod._PDF_SCAN_PROBE_PAGES
+
+    @pytest.mark.unit
+    def test_corrupt_pdf_returns_empty(self, monkeypatch):
+        assert ai_mod._extract_text("broken.pdf", b"not a pdf") == ""
@@ -0,0 +1,162 @@
+"""
+Unit tests for api/services/singleflight.py and the coalesced call sites
+(_call_llm in llm.py, search_jsearch in jobs_api.py).
+"""
+
+import asyncio
+
+import pytest
+
+import api.services.jobs_api as jobs_api
+import api.services.llm as llm
+from api.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+
+    @pytest.mark.unit
+    def test_concurrent_calls_share_one_execution(self):
+        sf = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(*(sf.do("k", work) for _ in range(20)))
+
+        assert asyncio.run(main()) == ["result"] * 20
+        assert len(runs) == 1
+        assert sf.stats()["coalesced"] == 19
+        assert sf.in_flight() == 0
+
+    @pytest.mark.unit
+    def test_different_keys_run_separately(self):
+        sf = SingleFlight()
+
+        async def main():
+            return await asyncio.gather(sf.do("a", _const("A")), sf.do("b", _const("B")))
+
+        assert asyncio.run(main()) == ["A", "B"]
+
+    @pytest.mark.unit
+    def test_errors_propagate_to_every_waiter(self):
+        sf = SingleFlight()
+
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        async def main():
+            return await asyncio.gather(*(sf.do("k", boom) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert sf.in_flight() == 0
+
+    @pytest.mark.unit
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        sf = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            a = asyncio.ensure_future(sf.do("k", slow))
+            b = asyncio.ensure_future(sf.do("k", slow))
+            await asyncio.sleep(0.01)
+            a.cancel()
+            return await b, a.cancelled()
+
+        assert asyncio.run(main()) == ("done", True)
+
+    @pytest.mark.unit
+    def test_last_waiter_leaving_cancels_call(self):
+        sf = SingleFlight()
+        state = {"cancelled": False}
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        async def main():
+            t = asyncio.ensure_future(sf.do("k", slow))
+            await asyncio.sleep(0.01)
+            t.cancel()
+            await asyncio.sleep(0.01)
+            # A fresh caller starts a new flight rather than joining the cancelled one
+            return await sf.do("k", _const("fresh"))
+
+        assert asyncio.run(main()) == "fresh"
+        assert state["cancelled"] is True
+
+    @pytest.mark.unit
+    def test_reentrant_call_does_not_deadlock(self):
+        sf = SingleFlight()
+
+        async def outer():
+            return await sf.do("k", _const("inner"))
+
+        async def main():
+            return await asyncio.wait_for(sf.do("k", outer), timeout=1)
+
+        assert asyncio.run(main()) == "inner"
+
+
+def _const(value):
+    async def fn():
+        return value
+    return fn
+
+
+class TestCoalescedCallSites:
+
+    @pytest.mark.unit
+    def test_identical_llm_calls_coalesce(self, monkeypatch):
+        class SlowProvider(llm._Provider):
+            name = "slow"
+            calls = 0
+
+            async def complete(self, system, user, json_mode):
+                SlowProvider.calls += 1
+                await asyncio.sleep(0.02)
+                return "shared"
+
+        monkeypatch.setattr(llm, "_API_KEY", "test-key")
+        monkeypatch.setattr(llm, "_provider", SlowProvider())
+        monkeypatch.setattr(llm.llm_cache, "ttl", 0)  # isolate coalescing from caching
+
+        async def main():
+            return await asyncio.gather(*(llm._call_llm("sys", "same jd") for _ in range(10)))
+
+        assert asyncio.run(main()) == ["shared"] * 10
+        assert SlowProvider.calls == 1
+
+    @pytest.mark.unit
+    def test_identical_jsearch_queries_coalesce(self, monkeypatch):
+        calls = []
+
+        async def fake_fetch(query, location, remote_only, page, num_pages, api_key):
+            calls.append(query)
+            await asyncio.sleep(0.02)
+            return [{"id": "j1", "title": "Engineer"}]
+
+        monkeypatch.setattr(jobs_api, "_fetch_jsearch", fake_fetch)
+
+        async def main():
+            return await asyncio.gather(
+                jobs_api.search_jsearch("Software Engineer", api_key="k"),
+                jobs_api.search_jsearch("  software   engineer ", api_key="k"),
+            )
+
+        first, second = asyncio.run(main())
+        assert len(calls) == 1
+        assert first == second
+        first[0]["match_score"] = 90
+        assert "match_score" not in second[0]
@@ -0,0 +1,106 @@
+"""
+Unit tests for api/services/skills.py and its use in jobs_api._extract_skills.
+"""
+
+import time
+
+import pytest
+
+from api.services.jobs_api import _extract_skills, _transform_job
+from api.services.skills import _CASE_SENSITIVE, SKILL_ALIASES, SKILL_TAXONOMY, find_skills
+
+
+class TestFindSkills:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", [
+        "A good team player with genuine interest in learning",
+        "Rustic charm; javascripting is not a word",
+        "Let's go to market together",
+        "YAML configuration and HTMLish templates",
+    ])
+    def test_no_substring_false_positives(self, text):
+        assert find_skills(text) == []
+
+    @pytest.mark.unit
+    def test_everyday_words_only_match_as_written(self):
+        assert find_skills("hiring, mentoring, branding, budgeting, express, spring, sketch, node, ml") == []
+        assert find_skills("Node, ML, Express, Mentoring") == ["Node.js", "Machine Learning", "Mentoring", "Express"]
+        assert find_skills("Hiring Manager at American Express", prose=True) == []
+
+    @pytest.mark.unit
+    def test_word_boundaries_and_symbols(self):
+        assert find_skills("Java and JavaScript, C#, .NET, CI/CD, Node.js") == [
+            "JavaScript", "Node.js", "Java", "C#", ".NET", "CI/CD",
+        ]
+
+    @pytest.mark.unit
+    def test_aliases_map_to_canonical(self):
+        assert find_skills("vue, tailwind, html5 and css, golang, k8s, postgres") == [
+            "Vue.js", "HTML/CSS", "Tailwind CSS", "Go", "Kubernetes", "PostgreSQL",
+        ]
+
+    @pytest.mark.unit
+    def test_longest_form_wins(self):
+        assert find_skills("GitHub Actions") == ["GitHub"]
+        assert find_skills("Machine Learning (ML)") == ["Machine Learning"]
+
+    @pytest.mark.unit
+    def test_by_position(self):
+        assert find_skills("Redis, then Python, then React", by_position=True) == ["Redis", "Python", "React"]
+
+    @pytest.mark.unit
+    def test_every_skill_and_alias_detected(self):
+        for skill in SKILL_TAXONOMY:
+            assert find_skills(f"Experience with {skill}.") == [skill], skill
+        for alias, canonical in SKILL_ALIASES.items():
+            form = _CASE_SENSITIVE.get(alias, alias)
+            assert canonical in find_skills(f"Experience with {form}."), alias
+
+
+class TestExternalJobSkills:
+
+    @pytest.mark.unit
+    def test_reads_qualifications_and_description(self):
+        raw = {
+            "job_highlights": {"Qualifications": ["5+ years of Python", "Good communication"]},
+            "job_description": "You'll build React apps on AWS. We value interest in REST.",
+        }
+        assert _extract_skills(raw) == ["Python", "React", "AWS"]
+
+    @pytest.mark.unit
+    def test_no_false_positives_from_description_prose(self):
+        raw = {
+            "job_highlights": {"Qualifications": ["High school diploma", "Able to lift 50 lbs"]},
+            "job_description": (
+                "We're hiring a Warehouse Associate to join our growing team this spring. "
+                "You'll pack express orders, sketch out weekly schedules with your lead, and help "
+                "with budgeting and branding for our retail displays. Mentoring new hires is part "
+                "of the role, and every distribution node in our network relies on you.\n"
+                "Hiring Manager: Dana Lee. Spring 2026 start. Perks include an American Express "
+                "corporate card and a 500 ml water bottle."
+            ),
+        }
+        assert _extract_skills(raw) == []
+
+    @pytest.mark.unit
+    def test_everyday_word_skills_count_when_listed(self):
+        raw = {
+            "job_highlights": {"Qualifications": ["3+ years with Express and Spring Boot", "Mentoring"]},
+            "job_description": "Hiring for our Node team. Sketch is not used here.",
+        }
+        assert _extract_skills(raw) == ["Express", "Spring", "Mentoring", "Node.js"]
+
+    @pytest.mark.unit
+    def test_capped_at_ten(self):
+        raw = {"job_description": ", ".join(SKILL_TAXONOMY)}
+        assert _extract_skills(raw) == SKILL_TAXONOMY[:10]
+
+    @pytest.mark.unit
+    def test_transform_ten_pages_is_fast(self):
+        description = ("We build scalable services with Python, Django and PostgreSQL on AWS. " * 60)
+        raws = [{"job_id": str(i), "job_description": description} for i in range(100)]
+        start = time.perf_counter()
+        jobs = [_transform_job(r) for r in raws]
+        assert time.perf_counter() - start < 0.5
+        assert jobs[0]["required_skills"] == ["Python", "Django", "PostgreSQL", "AWS"]
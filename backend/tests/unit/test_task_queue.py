@@ -0,0 +1,175 @@
+"""
+Unit tests for api/services/task_queue.py
+
+Runs against the in-memory Supabase fake, whose claim_tasks RPC mirrors
+the SQL function in 007_tasks.sql.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.services import task_queue
+from api.services.rate_limit import RateLimited
+
+
+@pytest.fixture
+def kinds(monkeypatch):
+    """Register throwaway handlers for the duration of a test."""
+    registry = dict(task_queue._HANDLERS)
+    monkeypatch.setattr(task_queue, "_HANDLERS", registry)
+    calls = []
+
+    @task_queue.handler("test.echo")
+    async def echo(payload):
+        calls.append(payload)
+        return {"echo": payload["value"]}
+
+    @task_queue.handler("test.flaky")
+    async def flaky(payload):
+        calls.append(payload)
+        raise ValueError("temporary upstream error")
+
+    @task_queue.handler("test.broken")
+    async def broken(payload):
+        calls.append(payload)
+        raise task_queue.PermanentTaskError("bad payload")
+
+    return calls
+
+
+def _make_due(mock_supabase, task_id):
+    mock_supabase.store["tasks"][task_id]["run_after"] = datetime.now(timezone.utc).isoformat()
+
+
+class TestTaskQueue:
+
+    @pytest.mark.unit
+    def test_enqueue_and_run(self, mock_supabase, kinds):
+        task = task_queue.enqueue("test.echo", {"value": 42}, owner_id="u1")
+        assert task["status"] == "queued"
+        assert asyncio.run(task_queue.run_once("w1")) == 1
+        done = task_queue.get_task(task["id"])
+        assert done["status"] == "succeeded"
+        assert done["result"] == {"echo": 42}
+        assert done["attempts"] == 1
+        assert done["locked_by"] is None
+        # Nothing left to claim
+        assert asyncio.run(task_queue.run_once("w1")) == 0
+
+    @pytest.mark.unit
+    def test_unknown_kind_is_rejected(self, kinds):
+        with pytest.raises(ValueError):
+            task_queue.enqueue("test.nope", {})
+
+    @pytest.mark.unit
+    def test_failures_back_off_then_dead_letter(self, mock_supabase, kinds):
+        task = task_queue.enqueue("test.flaky", {}, max_attempts=2)
+        asyncio.run(task_queue.run_once("w1"))
+        retry = task_queue.get_task(task["id"])
+        assert retry["status"] == "queued"
+        assert retry["last_error"] == "temporary upstream error"
+        assert datetime.fromisoformat(retry["run_after"]) > datetime.now(timezone.utc)
+        # Not due yet, so it is not claimed again immediately
+        assert asyncio.run(task_queue.run_once("w1")) == 0
+
+        _make_due(mock_supabase, task["id"])
+        asyncio.run(task_queue.run_once("w1"))
+        assert task_queue.get_task(task["id"])["status"] == "dead"
+        assert len(kinds) == 2
+
+    @pytest.mark.unit
+    def test_permanent_errors_dead_letter_immediately(self, kinds):
+        task = task_queue.enqueue("test.broken", {})
+        asyncio.run(task_queue.run_once("w1"))
+        row = task_queue.get_task(task["id"])
+        assert row["status"] == "dead"
+        assert row["attempts"] == 1
+
+    @pytest.mark.unit
+    def test_rate_limited_retry_uses_retry_after(self, kinds):
+        task = {"attempts": 1}
+        assert task_queue._retry_delay(task, RateLimited(17)) == 17
+        assert task_queue._retry_delay({"attempts": 3}, ValueError()) == task_queue.RETRY_BASE * 4
+
+    @pytest.mark.unit
+    def test_rate_limited_retry_keeps_its_attempt(self, mock_supabase, kinds):
+        @task_queue.handler("test.shed")
+        async def shed(payload):
+            raise RateLimited(1)
+
+        task = task_queue.enqueue("test.shed", {}, max_attempts=1)
+        for _ in range(3):
+            _make_due(mock_supabase, task["id"])
+            asyncio.run(task_queue.run_once("w1"))
+        row = task_queue.get_task(task["id"])
+        assert row["status"] == "queued"
+        assert row["attempts"] == 0
+
+    @pytest.mark.unit
+    def test_outcome_not_written_after_lease_lost(self, mock_supabase, kinds):
+        from api.core.database import claim_tasks
+        task = task_queue.enqueue("test.echo", {"value": 1})
+        stale = claim_tasks("w1", 1, 300)[0]
+        # w1's lease expired and w2 reclaimed the task while w1 was still running
+        past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        mock_supabase.store["tasks"][task["id"]]["locked_until"] = past
+        assert len(claim_tasks("w2", 1, 300)) == 1
+        assert asyncio.run(task_queue.run_task(stale)) == {}
+        row = task_queue.get_task(task["id"])
+        assert (row["status"], row["locked_by"]) == ("running", "w2")
+
+    @pytest.mark.unit
+    def test_expired_lease_is_reclaimed(self, mock_supabase, kinds):
+        from api.core.database import claim_tasks
+        task = task_queue.enqueue("test.echo", {"value": 1})
+        assert len(claim_tasks("crashed-worker", 1, 300)) == 1
+        # Leased to a live worker: invisible to others
+        assert claim_tasks("w2", 1, 300) == []
+
+        past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        mock_supabase.store["tasks"][task["id"]]["locked_until"] = past
+        assert asyncio.run(task_queue.run_once("w2")) == 1
+        row = task_queue.get_task(task["id"])
+        assert row["status"] == "succeeded"
+        assert row["attempts"] == 2
+
+    @pytest.mark.unit
+    def test_expired_lease_on_final_attempt_is_dead_lettered(self, mock_supabase, kinds):
+        from api.core.database import claim_tasks
+        task = task_queue.enqueue("test.echo", {"value": 1}, max_attempts=1)
+        claim_tasks("crashed-worker", 1, 300)
+        past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        mock_supabase.store["tasks"][task["id"]]["locked_until"] = past
+        assert asyncio.run(task_queue.run_once("w2")) == 0
+        assert task_queue.get_task(task["id"])["status"] == "dead"
+
+    @pytest.mark.unit
+    def test_slow_handler_times_out_inside_lease(self, monkeypatch, kinds):
+        @task_queue.handler("test.slow")
+        async def slow(payload):
+            await asyncio.sleep(5)
+
+        task = task_queue.enqueue("test.slow", {}, max_attempts=1)
+        asyncio.run(task_queue.run_once("w1", visibility_timeout=0.05))
+        row = task_queue.get_task(task["id"])
+        assert row["status"] == "dead"
+        assert "visibility timeout" in row["last_error"]
+
+    @pytest.mark.unit
+    def test_worker_runs_until_stopped(self, kinds):
+        ids = [task_queue.enqueue("test.echo", {"value": i})["id"] for i in range(5)]
+
+        async def main():
+            stop = asyncio.Event()
+            worker = asyncio.ensure_future(task_queue.run_worker("w1", concurrency=2, poll_interval=0.01, stop=stop))
+            for _ in range(100):
+                if all(task_queue.get_task(i)["status"] == "succeeded" for i in ids):
+                    break
+                await asyncio.sleep(0.01)
+            stop.set()
+            await asyncio.wait_for(worker, timeout=1)
+
+        asyncio.run(main())
+        assert [task_queue.get_task(i)["status"] for i in ids] == ["succeeded"] * 5
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Job Ingestion — pulls JSearch postings into the local jobs table
+================================================================
+Usage:
+  python -m tools.ingest_jobs                          # one pass over JOB_INGEST_CONFIG (or defaults)
+  python -m tools.ingest_jobs --every 60               # repeat every 60 minutes
+  python -m tools.ingest_jobs -q "python developer" -l "Austin, TX" --pages 3
+
+Needs RAPIDAPI_KEY. Unchanged postings are not rewritten, and postings
+not seen for JOB_INGEST_TTL_HOURS are closed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def _run(args) -> None:
+    from api.services.job_ingest import IngestQuery, ingest, load_queries
+    from api.services.jobs_api import close_client
+
+    api_key = os.environ.get("RAPIDAPI_KEY", "").strip()
+    if not api_key:
+        sys.exit("RAPIDAPI_KEY is not set.")
+    if args.query:
+        queries = [IngestQuery(q, args.location, args.remote_only, args.pages) for q in args.query]
+    else:
+        queries = load_queries(args.config) if args.config else load_queries()
+
+    try:
+        while True:
+            stats = await ingest(queries, api_key)
+            print(json.dumps(stats))
+            if not args.every:
+                return
+            await asyncio.sleep(args.every * 60)
+    finally:
+        await close_client()
+
+
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(prog="ingest_jobs", description="Ingest JSearch postings into the jobs table")
+    parser.add_argument("--query", "-q", action="append", help="Search query (repeatable); overrides the config")
+    parser.add_argument("--location", "-l", default="", help="Location for --query")
+    parser.add_argument("--remote-only", action="store_true", help="Remote postings only, for --query")
+    parser.add_argument("--pages", type=int, default=1, help="Pages per --query")
+    parser.add_argument("--config", help="JSON list of {query, location, remote_only, pages}")
+    parser.add_argument("--every", type=float, default=0, help="Repeat every N minutes (default: run once)")
+    try:
+        asyncio.run(_run(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ Usage:
 """
 
 import argparse
+import asyncio
 import os
 import re
 import sys
@@ -161,7 +162,7 @@ def cmd_enrich(args):
 
     from api.services.blog_ai import enrich_post
     print("Enriching with AI...")
-    result = enrich_post(meta.get("title", ""), body, meta.get("category", "career-playbook"))
+    result = asyncio.run(enrich_post(meta.get("title", ""), body, meta.get("category", "career-playbook")))
 
     meta["excerpt"] = result["excerpt"]
     meta["seo_title"] = result["seo_title"]
@@ -291,7 +292,7 @@ def cmd_suggest(args):
     jobs = get_active_jobs()
     print(f"Found {len(jobs)} active jobs. Generating suggestions...\n")
 
-    result = suggest_topics(jobs)
+    result = asyncio.run(suggest_topics(jobs))
     suggestions = result.get("suggestions", [])
 
     for i, s in enumerate(suggestions, 1):
@@ -347,7 +348,7 @@ def cmd_draft(args):
     from api.services.blog_ai import generate_draft, compute_reading_time
 
     print(f"Generating draft: \"{title}\"...")
-    body = generate_draft(title, category)
+    body = asyncio.run(generate_draft(title, category))
     slug = slugify(title)
 
     CONTENT_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Task Worker — runs queued matcher and blog AI tasks
+===================================================
+Usage:
+  python -m tools.worker                      # run until SIGINT/SIGTERM
+  python -m tools.worker --concurrency 8      # more parallel LLM calls
+  python -m tools.worker --once               # drain due tasks and exit (cron)
+
+Run as many workers as you like: tasks are claimed with SKIP LOCKED, so
+each task goes to exactly one worker. Size --concurrency to the provider
+quota (LLM_RPM/LLM_TPM) rather than to web traffic.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def _run(args) -> None:
+    from api.services import task_handlers  # noqa: F401 — registers handlers
+    from api.services import task_queue
+    from api.services.llm import close_clients
+
+    worker_id = args.worker_id or task_queue.default_worker_id()
+    try:
+        if args.once:
+            total = 0
+            while ran := await task_queue.run_once(worker_id, args.concurrency, args.visibility_timeout):
+                total += ran
+            print(f"✓ Ran {total} task(s)")
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows
+                pass
+        print(f"Worker {worker_id} started (concurrency={args.concurrency})")
+        await task_queue.run_worker(
+            worker_id,
+            concurrency=args.concurrency,
+            poll_interval=args.poll_interval,
+            visibility_timeout=args.visibility_timeout,
+            stop=stop,
+        )
+        print("Worker stopped; in-flight tasks finished.")
+    finally:
+        await close_clients()
+
+
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+    from api.services.task_queue import VISIBILITY_TIMEOUT
+
+    parser = argparse.ArgumentParser(prog="worker", description="Run background AI tasks")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Tasks run in parallel")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between idle polls")
+    parser.add_argument("--visibility-timeout", type=int, default=VISIBILITY_TIMEOUT,
+                        help="Seconds a claimed task stays leased to this worker")
+    parser.add_argument("--worker-id", help="Identifier recorded on claimed tasks")
+    parser.add_argument("--once", action="store_true", help="Drain due tasks, then exit")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()